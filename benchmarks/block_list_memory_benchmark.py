@@ -0,0 +1,93 @@
+"""Peak-memory benchmark for loading a large ``block_list.json``.
+
+Writes a synthetic MinerU document (bounding boxes, spans and discarded
+headers on every page, merge connections across page breaks) and loads it
+with the whole-file ``json.load`` approach and with the page-at-a-time
+streaming loader, reporting ``tracemalloc`` peaks and wall time.
+
+    PYTHONPATH=src python benchmarks/block_list_memory_benchmark.py --pages 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from rag_chunker.infrastructure.io import read_json
+from rag_chunker.use_cases.services.block_loader_service import (
+    _apply_merge_connections,
+    _block_from_item,
+    _load_blocks_from_block_list,
+)
+
+
+def _write_document(path: Path, pages: int, blocks_per_page: int) -> None:
+    def block(page: int, idx: int) -> dict:
+        return {
+            "type": "text",
+            "text": f"Paragraph {idx} of page {page}: students submit the application before the deadline. " * 3,
+            "page_idx": page,
+            "block_position": f"{page}-{idx}",
+            "id": f"{page:05d}-{idx:03d}",
+            "bbox": [72.0 + idx, 90.5, 523.25, 118.75 + idx],
+            "lines": [
+                {"bbox": [72.0, 90.5 + n, 523.25, 100.0 + n], "spans": [{"type": "text", "score": 0.99}]}
+                for n in range(4)
+            ],
+        }
+
+    data = []
+    for page in range(pages):
+        header = {"type": "header", "text": "Official call", "is_discarded": True, "page_idx": page}
+        items = [{**header, "block_position": f"{page}-h"}]
+        items.extend(block(page, idx) for idx in range(blocks_per_page))
+        data.append(items)
+    merges = [
+        {"id": f"m{page}", "type": "merge", "blocks": [f"{page}-{blocks_per_page - 1}", f"{page + 1}-0"]}
+        for page in range(0, pages - 1, 3)
+    ]
+    path.write_text(json.dumps({"pdfData": data, "mergeConnections": merges}), encoding="utf-8")
+
+
+def _load_whole(path: Path) -> list:
+    payload = read_json(path)
+    raw_blocks = [block for page in payload["pdfData"] for item in page if (block := _block_from_item(item))]
+    return _apply_merge_connections(raw_blocks, payload.get("mergeConnections") or [])
+
+
+def _measure(loader, path: Path) -> tuple[list, float, float]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    blocks = loader(path)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return blocks, peak / 2**20, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--blocks-per-page", type=int, default=12)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "block_list.json"
+        _write_document(path, args.pages, args.blocks_per_page)
+        size_mb = path.stat().st_size / 2**20
+        whole_blocks, whole_peak, whole_seconds = _measure(_load_whole, path)
+        stream_blocks, stream_peak, stream_seconds = _measure(_load_blocks_from_block_list, path)
+    assert whole_blocks == stream_blocks
+    print(f"file: {size_mb:.1f} MiB, {len(stream_blocks)} blocks after merges")
+    print(f"{'loader':>10} {'peak MiB':>10} {'seconds':>9}")
+    print(f"{'json.load':>10} {whole_peak:>10.1f} {whole_seconds:>9.2f}")
+    print(f"{'streaming':>10} {stream_peak:>10.1f} {stream_seconds:>9.2f}")
+    print(f"peak reduction: {whole_peak / stream_peak:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Micro-benchmark for the fused ``clean_text`` against the pre-fusion reference.
+
+Builds synthetic MinerU-like blocks (prose, inline LaTeX, HTML tables, bookmark
+noise), checks both cleaners agree on every block, and reports the time per
+block. The reference implementation is the frozen copy in
+``tests/cleaning_reference.py``.
+
+    PYTHONPATH=src python benchmarks/clean_text_benchmark.py --blocks 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import timeit
+from pathlib import Path
+
+from rag_chunker.use_cases.cleaning import clean_text
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "tests"))
+from cleaning_reference import clean_text as reference_clean_text  # noqa: E402
+
+FRAGMENTS = (
+    "Students must submit the online application before the deadline stated in the call.",
+    "The scholarship is confirmed for students with at least $66\\%$ of the required credits.",
+    "The ISEE value must be $\\leq 23.000$ euro and the ISPE $\\leq \\frac{1}{2}$ of the threshold.",
+    "Errore. Il segnalibro non è definito.",
+    "<table><tr><td>Year</td><td>Credits</td></tr><tr><td>2nd</td><td>25</td></tr></table>",
+    "Tom &amp; Jerry receive the 1st2024 instalment.",
+    "![figure](images/page_3.png)",
+    "----",
+    "# Art. 5 - Requirements",
+)
+
+
+def _blocks(count: int, rng: random.Random) -> list[str]:
+    return ["\n".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 12))) for _ in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--blocks", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    blocks = _blocks(args.blocks, random.Random(17))
+    for block in blocks:
+        assert clean_text(block) == reference_clean_text(block), block
+    reference = min(timeit.repeat(lambda: [reference_clean_text(b) for b in blocks], number=1, repeat=args.repeat))
+    fused = min(timeit.repeat(lambda: [clean_text(b) for b in blocks], number=1, repeat=args.repeat))
+    per_block = 1_000_000 / len(blocks)
+    print(f"{'mode':>10} {'us/block':>10}")
+    print(f"{'reference':>10} {reference * per_block:>10.1f}")
+    print(f"{'fused':>10} {fused * per_block:>10.1f}")
+    print(f"speedup: {reference / fused:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
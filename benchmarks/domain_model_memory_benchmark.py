@@ -0,0 +1,110 @@
+"""Memory held by the domain models of one large document.
+
+Generates a synthetic document with ``synthetic_corpus.py`` (1000 pages by
+default) in each MinerU source format, loads, cleans and segments it, and keeps
+every stage alive while measuring. Reports the ``tracemalloc`` growth of the
+held blocks and segments and the bytes of the model objects alone (instances,
+their ``__dict__`` if any, page-ref and heading-path lists, and distinct
+``PageRef`` objects; strings excluded). Run it on two commits to compare.
+
+    PYTHONPATH=src python benchmarks/domain_model_memory_benchmark.py --pages 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Any, Iterable
+
+from synthetic_corpus import CorpusSpec, generate_corpus
+
+from rag_chunker.infrastructure.io import choose_source
+from rag_chunker.pipeline import PipelineConfig, _clean_blocks, _merge_document_segments
+from rag_chunker.use_cases.chunking import build_segments, configure_tokenizer
+from rag_chunker.use_cases.services.block_loader_service import load_canonical_blocks
+
+FORMATS = ("block_list", "content_list")
+
+
+def _object_bytes(obj: Any) -> int:
+    size = sys.getsizeof(obj)
+    instance_dict = getattr(obj, "__dict__", None)
+    if instance_dict is not None:
+        size += sys.getsizeof(instance_dict)
+    return size
+
+
+def _model_bytes(models: Iterable[Any]) -> tuple[int, int]:
+    """Bytes of models, their page-ref/heading-path lists and distinct page refs, plus the page-ref count."""
+    seen: set[int] = set()
+    total = 0
+    page_refs = 0
+    for model in models:
+        for obj in (model, model.page_refs, getattr(model, "heading_path", None)):
+            if obj is None or id(obj) in seen:
+                continue
+            seen.add(id(obj))
+            total += _object_bytes(obj)
+        for ref in model.page_refs:
+            if id(ref) not in seen:
+                seen.add(id(ref))
+                total += _object_bytes(ref)
+                page_refs += 1
+    return total, page_refs
+
+
+def _measure(folder: Path, config: PipelineConfig) -> dict[str, Any]:
+    gc.collect()
+    tracemalloc.start()
+    started = tracemalloc.get_traced_memory()[0]
+    blocks = load_canonical_blocks(choose_source(folder))[0]
+    cleaned = _clean_blocks(blocks)
+    segments = build_segments(cleaned)
+    merged = _merge_document_segments(segments, config)
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - started
+    tracemalloc.stop()
+    model_bytes, page_refs = _model_bytes([*blocks, *cleaned, *segments, *merged])
+    return {
+        "blocks": len(blocks),
+        "segments": len(segments) + len(merged),
+        "page_refs": page_refs,
+        "held_mib": held / 2**20,
+        "model_mib": model_bytes / 2**20,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=1000)
+    parser.add_argument("--tokenizer", type=str, default="regex")
+    args = parser.parse_args()
+
+    configure_tokenizer(args.tokenizer)
+    print(f"{'format':>13} {'blocks':>7} {'segments':>9} {'page refs':>10} {'held MiB':>9} {'models MiB':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for source_format in FORMATS:
+            # About 12 blocks per page, as in the streaming loader benchmark.
+            spec = CorpusSpec(
+                documents=1,
+                pages=args.pages,
+                articles=max(args.pages * 2, 1),
+                sections=max(args.pages // 50, 1),
+                toc_pages=max(args.pages // 100, 1),
+                source_format=source_format,
+            )
+            folder = generate_corpus(Path(tmp) / source_format, spec)[0]
+            config = PipelineConfig(input_dir=folder.parent, output_dir=Path(tmp) / "out", tokenizer_name=args.tokenizer)
+            row = _measure(folder, config)
+            print(
+                f"{source_format:>13} {row['blocks']:>7} {row['segments']:>9} {row['page_refs']:>10} "
+                f"{row['held_mib']:>9.1f} {row['model_mib']:>11.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Throughput benchmark for the JSON codecs behind artifact I/O.
+
+Writes a synthetic ``chunks.jsonl`` with ``write_jsonl`` and decodes it line
+by line with each installed codec (stdlib ``json``, ``orjson``, ``msgspec``).
+Rows are generated and decoded as a stream so a 1M-row file fits in memory.
+
+    PYTHONPATH=src python benchmarks/json_codec_benchmark.py --rows 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from rag_chunker.infrastructure.io import JSON_CODEC_ENV, get_json_codec, write_jsonl
+
+WORDS = "students submit the application for the scholarship before the deadline università tassa".split()
+
+
+def _rows(count: int):
+    for idx in range(count):
+        text = " ".join(WORDS[(idx + offset) % len(WORDS)] for offset in range(60))
+        yield {
+            "chunk_id": f"{idx:016x}",
+            "doc_id": f"{idx // 40:016x}",
+            "text": text,
+            "token_count": 80 + idx % 400,
+            "page_refs": [{"page_idx": idx // 12, "block_id": f"b{idx}", "block_position": f"{idx // 12}-{idx % 12}"}],
+            "metadata": {"section": "ART. 5", "article": "5", "heading_path": ["Call", "ART. 5"], "language": "it"},
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    codecs = []
+    for name in ("json", "orjson", "msgspec"):
+        try:
+            codecs.append(get_json_codec(name))
+        except ValueError:
+            print(f"{name}: not installed, skipped")
+
+    print(f"{'codec':>8} {'write s':>9} {'read s':>8} {'MiB':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for codec in codecs:
+            path = Path(tmp) / f"chunks-{codec.name}.jsonl"
+            get_json_codec.cache_clear()
+            # write_jsonl resolves the codec from the environment, as the pipeline does.
+            os.environ[JSON_CODEC_ENV] = codec.name
+            started = time.perf_counter()
+            write_jsonl(path, _rows(args.rows))
+            write_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            rows = 0
+            with path.open("rb") as handle:
+                for line in handle:
+                    codec.loads(line)
+                    rows += 1
+            read_seconds = time.perf_counter() - started
+            assert rows == args.rows
+            size = path.stat().st_size / 2**20
+            path.unlink()
+            print(f"{codec.name:>8} {write_seconds:>9.2f} {read_seconds:>8.2f} {size:>7.1f}")
+    os.environ.pop(JSON_CODEC_ENV, None)
+    get_json_codec.cache_clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Bytes written and read per run for the full and compact output profiles.
+
+Runs the pipeline once per profile over the same corpus, then reads each
+``chunks.jsonl`` back through the reader API (compact rows are joined with
+``documents.jsonl``; ``+augmented`` also derives ``augmented_text``).
+
+    PYTHONPATH=src python benchmarks/output_profile_benchmark.py --input-dir data/mineru --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from rag_chunker.pipeline import PipelineConfig, run_pipeline
+from rag_chunker.use_cases.chunk_reader import OUTPUT_PROFILES, iter_chunks
+
+
+def _read_seconds(artifacts_dir: Path, *, augmented_text: bool, repeat: int) -> tuple[float, int]:
+    best = float("inf")
+    rows = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = sum(1 for _ in iter_chunks(artifacts_dir, augmented_text=augmented_text))
+        best = min(best, time.perf_counter() - started)
+    return best, rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--input-dir", type=Path, required=True, help="Path to MinerU output root directory")
+    parser.add_argument("--repeat", type=int, default=3, help="Read passes per profile; the fastest is reported")
+    parser.add_argument("--tokenizer", type=str, default="regex")
+    args = parser.parse_args()
+
+    print(f"{'profile':>18} {'chunks KiB':>11} {'docs KiB':>9} {'read s':>8} {'rows':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in OUTPUT_PROFILES:
+            output_dir = Path(tmp) / profile
+            run_pipeline(
+                PipelineConfig(
+                    input_dir=args.input_dir,
+                    output_dir=output_dir,
+                    incremental=False,
+                    tokenizer_name=args.tokenizer,
+                    output_profile=profile,
+                )
+            )
+            chunks_kib = (output_dir / "chunks.jsonl").stat().st_size / 1024
+            docs_kib = (output_dir / "documents.jsonl").stat().st_size / 1024
+            variants = [(profile, False)] + ([(f"{profile}+augmented", True)] if profile == "compact" else [])
+            for label, augmented_text in variants:
+                seconds, rows = _read_seconds(output_dir, augmented_text=augmented_text, repeat=args.repeat)
+                print(f"{label:>18} {chunks_kib:>11.1f} {docs_kib:>9.1f} {seconds:>8.3f} {rows:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Micro-benchmark for suffix/prefix overlap detection.
+
+Compares the shared ``max_suffix_prefix_overlap`` routine with the previous
+descending-slice implementation on prose-like chunk pairs and on repetitive
+text, at the pipeline (320) and gate (240) scan windows plus larger ones.
+
+    PYTHONPATH=src python benchmarks/overlap_benchmark.py --windows 240 320 2048 8192
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+
+from rag_chunker.use_cases.overlap import max_suffix_prefix_overlap
+
+WORDS = (
+    "students must submit complete documentation before the stated deadline the scholarship office "
+    "publishes rankings for housing tuition fee waivers and meal services in each academic year"
+).split()
+
+
+def descending_slice_overlap(left: str, right: str, scan_chars: int) -> int:
+    left_tail = left[-scan_chars:]
+    right_head = right[:scan_chars]
+    max_len = min(len(left_tail), len(right_head))
+    for overlap in range(max_len, 0, -1):
+        if left_tail[-overlap:] == right_head[:overlap]:
+            return overlap
+    return 0
+
+
+def _prose_pairs(window: int, count: int, rng: random.Random) -> list[tuple[str, str]]:
+    def text() -> str:
+        words: list[str] = []
+        length = 0
+        while length < window * 2:
+            word = rng.choice(WORDS)
+            words.append(word)
+            length += len(word) + 1
+        return " ".join(words)
+
+    pairs = []
+    for _ in range(count):
+        left, right = text(), text()
+        if rng.random() < 0.5:
+            # Consecutive chunks produced with token overlap share a short boundary.
+            right = left[-rng.randint(1, min(200, window)) :] + right
+        pairs.append((left, right))
+    return pairs
+
+
+def _repetitive_pairs(window: int) -> list[tuple[str, str]]:
+    return [
+        ("a" * window + "b", "a" * window),
+        ("ab" * window + "a", "ab" * window),
+        ("| --- " * window, "| --- " * window + "|"),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--windows", type=int, nargs="+", default=[240, 320, 2048, 8192])
+    parser.add_argument("--pairs", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(13)
+    print(f"{'window':>7} {'corpus':>10} {'baseline ms':>12} {'shared ms':>10} {'speedup':>8}")
+    for window in args.windows:
+        for label, pairs in (("prose", _prose_pairs(window, args.pairs, rng)), ("repetitive", _repetitive_pairs(window))):
+            for left, right in pairs:
+                expected = descending_slice_overlap(left, right, window)
+                assert max_suffix_prefix_overlap(left, right, window) == expected
+            baseline = min(
+                timeit.repeat(lambda: [descending_slice_overlap(l, r, window) for l, r in pairs], number=1, repeat=args.repeat)
+            )
+            shared = min(
+                timeit.repeat(lambda: [max_suffix_prefix_overlap(l, r, window) for l, r in pairs], number=1, repeat=args.repeat)
+            )
+            print(f"{window:>7} {label:>10} {baseline * 1000:>12.2f} {shared * 1000:>10.2f} {baseline / shared:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
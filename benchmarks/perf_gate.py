@@ -0,0 +1,61 @@
+"""Run the scenario benchmarks and feed them to the performance regression gate.
+
+Runs the scenarios of ``pipeline_scenarios.py`` on the corpus described by the
+baseline (or takes ``--results``) and hands the results to
+``rag_chunker.interfaces.perf_gate_cli``; every other argument, such as
+``--fail-on-threshold`` or ``--scenario-tolerance``, is passed through to it.
+Baselines are machine-specific: record one with ``--update-baseline`` on the
+machine that runs the gate. A missing baseline is an error, never a pass.
+
+    PYTHONPATH=src python benchmarks/perf_gate.py --fail-on-threshold
+    PYTHONPATH=src python benchmarks/perf_gate.py --update-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from pipeline_scenarios import print_results, run_scenarios
+from synthetic_corpus import CorpusSpec
+
+from rag_chunker.infrastructure.io import read_json, write_json
+from rag_chunker.interfaces import perf_gate_cli
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines" / "perf_baseline.json"
+BASELINE_SPEC = CorpusSpec(documents=40)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--results", type=Path, default=None, help="Gate an existing results JSON instead of running")
+    parser.add_argument("--results-output", type=Path, default=Path("artifacts/perf_results.json"))
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per scenario; the fastest is reported")
+    parser.add_argument("--update-baseline", action="store_true", help="Run the scenarios and store them as the baseline")
+    args, gate_args = parser.parse_known_args()
+
+    if args.update_baseline:
+        results = run_scenarios(BASELINE_SPEC, repeat=args.repeat)
+        print_results(results, None)
+        write_json(args.baseline, results)
+        print(f"Baseline written: {args.baseline}")
+        return
+    if not args.baseline.is_file():
+        parser.error(f"baseline file not found: {args.baseline}; record one with --update-baseline")
+
+    baseline = read_json(args.baseline)
+    results_path = args.results
+    if results_path is None:
+        spec = CorpusSpec(**baseline["corpus"]) if baseline.get("corpus") else BASELINE_SPEC
+        results = run_scenarios(spec, tokenizer=baseline.get("tokenizer", "regex"), repeat=args.repeat)
+        write_json(args.results_output, results)
+        results_path = args.results_output
+    else:
+        results = read_json(results_path)
+    print_results(results, baseline)
+    perf_gate_cli.main(["--results", str(results_path), "--baseline", str(args.baseline), *gate_args])
+
+
+if __name__ == "__main__":
+    main()
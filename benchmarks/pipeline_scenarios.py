@@ -0,0 +1,265 @@
+"""Scenario benchmarks over a synthetic MinerU corpus, with JSON results for comparing commits.
+
+Generates a corpus with ``synthetic_corpus.py`` (or uses ``--input-dir``) and
+runs each scenario in a fresh process, so the reported peak RSS belongs to that
+scenario alone. Every scenario reports the best of ``--repeat`` timed runs as
+docs/sec and chunks/sec (``clean_text`` reports blocks, ``split_text_by_tokens``
+the pieces it returns). ``--compare`` prints the change against an earlier
+results file.
+
+    PYTHONPATH=src python benchmarks/pipeline_scenarios.py --documents 40 --output bench.json
+    PYTHONPATH=src python benchmarks/pipeline_scenarios.py --documents 40 --compare bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from synthetic_corpus import CorpusSpec, add_spec_arguments, generate_corpus, spec_from_args
+
+SCENARIOS = ("clean_text", "split_text_by_tokens", "process_document_folder", "incremental_reuse", "evaluation")
+RESULTS_VERSION = 1
+
+
+def _peak_rss_mib() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+def _best_of(repeat: int, run: Callable[[], int]) -> tuple[float, int]:
+    best = float("inf")
+    produced = 0
+    for _ in range(max(repeat, 1)):
+        started = time.perf_counter()
+        produced = run()
+        best = min(best, time.perf_counter() - started)
+    return best, produced
+
+
+def _config(input_dir: Path, output_dir: Path, tokenizer: str, **overrides: Any):
+    from rag_chunker.pipeline import PipelineConfig
+
+    return PipelineConfig(input_dir=input_dir, output_dir=output_dir, tokenizer_name=tokenizer, **overrides)
+
+
+def _raw_block_texts(folders: list[Path]) -> list[str]:
+    from rag_chunker.infrastructure.io import choose_source
+    from rag_chunker.use_cases.services.block_loader_service import load_canonical_blocks
+
+    return [block.text for folder in folders for block in load_canonical_blocks(choose_source(folder))[0]]
+
+
+def _scenario_clean_text(input_dir: Path, work_dir: Path, tokenizer: str, repeat: int) -> tuple[float, int, int]:
+    from rag_chunker.infrastructure.io import discover_document_folders
+    from rag_chunker.use_cases.cleaning import clean_text
+
+    folders = discover_document_folders(input_dir)
+    texts = _raw_block_texts(folders)
+
+    def run() -> int:
+        for text in texts:
+            clean_text(text)
+        return len(texts)
+
+    seconds, blocks = _best_of(repeat, run)
+    return seconds, len(folders), blocks
+
+
+def _scenario_split_text_by_tokens(input_dir: Path, work_dir: Path, tokenizer: str, repeat: int) -> tuple[float, int, int]:
+    from rag_chunker.infrastructure.io import choose_source, discover_document_folders
+    from rag_chunker.pipeline import _clean_blocks
+    from rag_chunker.use_cases.chunking import build_segments, configure_tokenizer, split_text_by_tokens
+    from rag_chunker.use_cases.services.block_loader_service import load_canonical_blocks
+
+    configure_tokenizer(tokenizer)
+    folders = discover_document_folders(input_dir)
+    texts = [
+        segment.text
+        for folder in folders
+        for segment in build_segments(_clean_blocks(load_canonical_blocks(choose_source(folder))[0]))
+    ]
+
+    def run() -> int:
+        return sum(len(split_text_by_tokens(text, target_tokens=420, max_tokens=480, overlap_tokens=30)) for text in texts)
+
+    seconds, pieces = _best_of(repeat, run)
+    return seconds, len(folders), pieces
+
+
+def _scenario_process_document_folder(
+    input_dir: Path, work_dir: Path, tokenizer: str, repeat: int
+) -> tuple[float, int, int]:
+    from rag_chunker.infrastructure.io import discover_document_folders
+    from rag_chunker.pipeline import _process_document_folder
+    from rag_chunker.use_cases.chunking import configure_tokenizer
+
+    configure_tokenizer(tokenizer)
+    folders = discover_document_folders(input_dir)
+    config = _config(input_dir, work_dir / "artifacts", tokenizer, incremental=False)
+
+    def run() -> int:
+        return sum(len(_process_document_folder(folder, config)[1]) for folder in folders)
+
+    seconds, chunks = _best_of(repeat, run)
+    return seconds, len(folders), chunks
+
+
+def _scenario_incremental_reuse(input_dir: Path, work_dir: Path, tokenizer: str, repeat: int) -> tuple[float, int, int]:
+    from rag_chunker.pipeline import run_pipeline
+
+    config = _config(input_dir, work_dir / "artifacts", tokenizer)
+    documents = run_pipeline(config)["documents"]
+
+    def run() -> int:
+        manifest = run_pipeline(config)
+        assert manifest["incremental"]["processed_documents"] == 0
+        return manifest["chunks"]
+
+    seconds, chunks = _best_of(repeat, run)
+    return seconds, documents, chunks
+
+
+def _scenario_evaluation(input_dir: Path, work_dir: Path, tokenizer: str, repeat: int) -> tuple[float, int, int]:
+    from rag_chunker import EvalConfig, run_evaluation
+    from rag_chunker.pipeline import run_pipeline
+
+    artifacts = work_dir / "artifacts"
+    manifest = run_pipeline(_config(input_dir, artifacts, tokenizer, incremental=False))
+    eval_config = EvalConfig(
+        artifacts_dir=artifacts,
+        output_json=work_dir / "eval_report.json",
+        output_md=work_dir / "eval_report.md",
+    )
+
+    def run() -> int:
+        run_evaluation(eval_config)
+        return manifest["chunks"]
+
+    seconds, chunks = _best_of(repeat, run)
+    return seconds, manifest["documents"], chunks
+
+
+def run_scenario(name: str, input_dir: Path, tokenizer: str, repeat: int) -> dict[str, Any]:
+    """Run one scenario in the current process and return its result row."""
+    runner = globals()[f"_scenario_{name}"]
+    with tempfile.TemporaryDirectory() as tmp:
+        seconds, documents, produced = runner(input_dir, Path(tmp), tokenizer, repeat)
+    return {
+        "seconds": round(seconds, 4),
+        "documents": documents,
+        "chunks": produced,
+        "docs_per_sec": round(documents / seconds, 2) if seconds else None,
+        "chunks_per_sec": round(produced / seconds, 2) if seconds else None,
+        "peak_rss_mib": _peak_rss_mib(),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).resolve().parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def print_results(results: dict[str, Any], baseline: dict[str, Any] | None) -> None:
+    header = f"{'scenario':>24} {'seconds':>9} {'docs/s':>9} {'chunks/s':>10} {'RSS MiB':>8}"
+    print(header + (f" {'vs base':>8}" if baseline else ""))
+    for name, row in results["scenarios"].items():
+        line = (
+            f"{name:>24} {row['seconds']:>9.3f} {row['docs_per_sec'] or 0:>9.1f} "
+            f"{row['chunks_per_sec'] or 0:>10.1f} {row['peak_rss_mib']:>8.1f}"
+        )
+        base = (baseline or {}).get("scenarios", {}).get(name)
+        if base and base.get("seconds"):
+            line += f" {row['seconds'] / base['seconds']:>7.2f}x"
+        print(line)
+
+
+def run_scenarios(
+    spec: CorpusSpec,
+    *,
+    input_dir: Path | None = None,
+    scenarios: list[str] | None = None,
+    tokenizer: str = "regex",
+    repeat: int = 3,
+) -> dict[str, Any]:
+    """Run ``scenarios`` (default: all) over ``input_dir`` or a corpus generated from ``spec``."""
+    rows: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = input_dir
+        if corpus_dir is None:
+            corpus_dir = Path(tmp) / "corpus"
+            generate_corpus(corpus_dir, spec)
+        # A fresh interpreter per scenario keeps peak RSS and warm caches from leaking between scenarios.
+        context = multiprocessing.get_context("spawn")
+        for name in scenarios or SCENARIOS:
+            with context.Pool(1) as pool:
+                rows[name] = pool.apply(run_scenario, (name, corpus_dir, tokenizer, repeat))
+    return {
+        "version": RESULTS_VERSION,
+        "commit": _git_commit(),
+        "created_at_utc": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "tokenizer": tokenizer,
+        "corpus": None if input_dir else asdict(spec),
+        "input_dir": str(input_dir) if input_dir else None,
+        "scenarios": rows,
+    }
+
+
+def add_run_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--input-dir", type=Path, default=None, help="Existing corpus; a synthetic one is generated if omitted")
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="Scenario to run; repeat for several (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per scenario; the fastest is reported")
+    parser.add_argument("--tokenizer", type=str, default="regex")
+    add_spec_arguments(parser)
+
+
+def results_from_args(args: argparse.Namespace) -> dict[str, Any]:
+    return run_scenarios(
+        spec_from_args(args),
+        input_dir=args.input_dir,
+        scenarios=args.scenario,
+        tokenizer=args.tokenizer,
+        repeat=args.repeat,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_run_arguments(parser)
+    parser.add_argument("--output", type=Path, default=None, help="Write the results as JSON")
+    parser.add_argument("--compare", type=Path, default=None, help="Earlier results JSON to compare against")
+    args = parser.parse_args()
+    baseline = json.loads(args.compare.read_text(encoding="utf-8")) if args.compare else None
+
+    results = results_from_args(args)
+    print_results(results, baseline)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"Results: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
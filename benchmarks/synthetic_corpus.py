@@ -0,0 +1,247 @@
+"""Deterministic synthetic MinerU corpus generator.
+
+Writes one folder per document in the layout MinerU produces: ``block_list.json``
+(pages of typed blocks plus ``mergeConnections`` for tables split across pages),
+``<name>_content_list.json`` or ``<name>.md``. Page count, table density, the
+article/section structure and table-of-contents pages are configurable, and the
+same arguments always produce the same bytes.
+
+    PYTHONPATH=src python benchmarks/synthetic_corpus.py --output-dir /tmp/corpus --documents 50 --pages 24
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+SOURCE_FORMATS = ("block_list", "content_list", "md", "mixed")
+WORDS = (
+    "students must submit complete documentation before the stated deadline the scholarship office publishes "
+    "rankings for housing tuition fee waivers and meal services in each academic year applicants declare income "
+    "and merit requirements through the online portal gli studenti devono presentare la domanda entro il termine "
+    "previsto dal bando per la borsa di studio il servizio abitativo e le riduzioni delle tasse universitarie"
+).split()
+HEADER = "Regional Agency for the Right to University Study"
+FOOTER = "Page {page} of {pages}"
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """Shape of a synthetic corpus; every document derives its content from ``seed`` and its index."""
+
+    documents: int = 20
+    pages: int = 12
+    articles: int = 12
+    sections: int = 3
+    subarticles: int = 2
+    paragraphs: int = 3
+    table_density: float = 0.25
+    toc_pages: int = 1
+    source_format: str = "mixed"
+    seed: int = 13
+
+
+def _sentence(rng: random.Random, low: int = 8, high: int = 28) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(low, high))]
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraph(rng: random.Random) -> str:
+    return " ".join(_sentence(rng) for _ in range(rng.randint(2, 6)))
+
+
+def _table(rng: random.Random, rows: int) -> str:
+    cells = "".join(
+        f"<tr><td>Band {idx + 1}</td><td>{rng.randint(0, 30_000)} EUR</td><td>{rng.choice(WORDS)}</td></tr>"
+        for idx in range(rows)
+    )
+    return f"<table><tr><td>ISEE band</td><td>Amount</td><td>Notes</td></tr>{cells}</table>"
+
+
+def _logical_blocks(spec: CorpusSpec, rng: random.Random, title: str) -> list[dict[str, Any]]:
+    """Document body as ``{"type", "text", "level"}`` dicts, before pagination."""
+    blocks: list[dict[str, Any]] = [
+        {"type": "title", "text": title, "level": 1},
+        {"type": "text", "text": f"A.Y. 2025/26 call for applications. {_paragraph(rng)}"},
+    ]
+    headings: list[tuple[str, int]] = []
+    body: list[dict[str, Any]] = []
+    per_section = max(1, -(-spec.articles // max(spec.sections, 1)))
+    for article in range(1, spec.articles + 1):
+        if spec.sections and (article - 1) % per_section == 0:
+            section = f"SECTION {(article - 1) // per_section + 1} - {_sentence(rng, 2, 5).rstrip('.').upper()}"
+            body.append({"type": "title", "text": section, "level": 1})
+            headings.append((section, 0))
+        heading = f"ART. {article} {_sentence(rng, 2, 6).rstrip('.')}"
+        body.append({"type": "title", "text": heading, "level": 2})
+        headings.append((heading, 1))
+        for sub in range(1, spec.subarticles + 1):
+            body.append({"type": "text", "text": f"{article}.{sub} {_paragraph(rng)}"})
+        for _ in range(spec.paragraphs):
+            body.append({"type": "text", "text": _paragraph(rng)})
+            if rng.random() < spec.table_density:
+                body.append({"type": "table_body", "text": _table(rng, rng.randint(3, 12))})
+    if spec.toc_pages:
+        toc_lines = [f"{text} {idx + 3}" for idx, (text, _) in enumerate(headings)]
+        blocks.append({"type": "title", "text": "Table of contents", "level": 1, "toc": True})
+        per_page = max(1, -(-len(toc_lines) // spec.toc_pages))
+        for start in range(0, len(toc_lines), per_page):
+            blocks.append({"type": "text", "text": "\n".join(toc_lines[start : start + per_page]), "toc": True})
+    return blocks + body
+
+
+def _paginate(blocks: list[dict[str, Any]], pages: int) -> list[list[dict[str, Any]]]:
+    """Spread blocks over ``pages`` pages; table-of-contents blocks get the first pages to themselves."""
+    toc = [block for block in blocks if block.get("toc")]
+    body = [block for block in blocks if not block.get("toc")]
+    front = [body.pop(0), body.pop(0)] if len(body) >= 2 else []
+    result: list[list[dict[str, Any]]] = [front]
+    if toc:
+        result.extend([[block] for block in toc if block["type"] == "text"])
+        result[1].insert(0, toc[0])
+    remaining = max(pages - len(result), 1)
+    per_page = max(1, -(-len(body) // remaining))
+    for start in range(0, len(body), per_page):
+        result.append(body[start : start + per_page])
+    return [page for page in result if page]
+
+
+def _block_list_payload(pages: list[list[dict[str, Any]]], rng: random.Random) -> dict[str, Any]:
+    pdf_data: list[list[dict[str, Any]]] = []
+    merges: list[dict[str, Any]] = []
+    for page_idx, page in enumerate(pages):
+        items: list[dict[str, Any]] = [
+            {"type": "header", "text": HEADER, "is_discarded": True, "page_idx": page_idx, "block_position": f"{page_idx}-0"}
+        ]
+        for block in page:
+            position = f"{page_idx}-{len(items)}"
+            item: dict[str, Any] = {
+                "type": block["type"],
+                "page_idx": page_idx,
+                "block_position": position,
+                "id": f"b{page_idx}-{len(items)}",
+            }
+            item["table_body" if block["type"] == "table_body" else "text"] = block["text"]
+            if block["type"] == "title":
+                item["level"] = block["level"]
+            items.append(item)
+        footer = FOOTER.format(page=page_idx + 1, pages=len(pages))
+        items.append({"type": "footer", "text": footer, "is_discarded": True, "page_idx": page_idx})
+        pdf_data.append(items)
+
+    # Split the last table of some pages across the page break, as MinerU does for long tables.
+    for page_idx in range(len(pdf_data) - 1):
+        tables = [item for item in pdf_data[page_idx] if item["type"] == "table_body"]
+        if not tables or rng.random() >= 0.5:
+            continue
+        head = tables[-1]
+        rows = head["table_body"].split("</tr>")
+        if len(rows) < 4:
+            continue
+        cut = len(rows) // 2
+        head["table_body"] = "</tr>".join(rows[:cut]) + "</tr></table>"
+        tail_position = f"{page_idx + 1}-{len(pdf_data[page_idx + 1]) - 1}"
+        tail = {
+            "type": "table_body",
+            "table_body": "<table>" + "</tr>".join(rows[cut:]),
+            "page_idx": page_idx + 1,
+            "block_position": tail_position,
+            "id": head["id"],
+        }
+        pdf_data[page_idx + 1].insert(1, tail)
+        merges.append({"id": head["id"], "blocks": [head["block_position"], tail_position], "type": "merge"})
+    return {"pdfData": pdf_data, "mergeConnections": merges}
+
+
+def _content_list_payload(pages: list[list[dict[str, Any]]]) -> list[dict[str, Any]]:
+    items: list[dict[str, Any]] = []
+    for page_idx, page in enumerate(pages):
+        for block in page:
+            if block["type"] == "table_body":
+                items.append({"type": "table", "table_body": block["text"], "table_caption": [], "page_idx": page_idx})
+            elif block["type"] == "title":
+                items.append({"type": "text", "text": block["text"], "text_level": block["level"], "page_idx": page_idx})
+            else:
+                items.append({"type": "text", "text": block["text"], "page_idx": page_idx})
+    return items
+
+
+def _markdown(pages: list[list[dict[str, Any]]]) -> str:
+    parts: list[str] = []
+    for page in pages:
+        for block in page:
+            if block["type"] == "title":
+                parts.append("#" * block["level"] + " " + block["text"])
+            else:
+                parts.append(block["text"])
+    return "\n\n".join(parts) + "\n"
+
+
+def document_format(spec: CorpusSpec, index: int) -> str:
+    if spec.source_format != "mixed":
+        return spec.source_format
+    return SOURCE_FORMATS[index % 3]
+
+
+def generate_corpus(root: Path, spec: CorpusSpec) -> list[Path]:
+    """Write ``spec.documents`` document folders under ``root`` and return them in order."""
+    if spec.source_format not in SOURCE_FORMATS:
+        raise ValueError(f"Unsupported source format {spec.source_format!r}; expected one of {', '.join(SOURCE_FORMATS)}")
+    folders: list[Path] = []
+    for index in range(spec.documents):
+        rng = random.Random(spec.seed * 1_000_003 + index)
+        name = f"Bando{index:04d}"
+        folder = root / f"{name}.pdf-{spec.seed:08x}-{index:04x}-4000-8000-{index:012x}"
+        folder.mkdir(parents=True, exist_ok=True)
+        pages = _paginate(_logical_blocks(spec, rng, f"Call for applications {index} - benefits and services"), spec.pages)
+        fmt = document_format(spec, index)
+        if fmt == "block_list":
+            payload: Any = _block_list_payload(pages, rng)
+            (folder / "block_list.json").write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        elif fmt == "content_list":
+            payload = _content_list_payload(pages)
+            (folder / f"{name}_content_list.json").write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        else:
+            (folder / f"{name}.md").write_text(_markdown(pages), encoding="utf-8")
+        folders.append(folder)
+    return folders
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = CorpusSpec()
+    parser.add_argument("--documents", type=int, default=defaults.documents)
+    parser.add_argument("--pages", type=int, default=defaults.pages, help="Pages per document")
+    parser.add_argument("--articles", type=int, default=defaults.articles, help="Articles per document")
+    parser.add_argument("--sections", type=int, default=defaults.sections, help="Sections grouping the articles")
+    parser.add_argument("--subarticles", type=int, default=defaults.subarticles, help="Numbered clauses per article")
+    parser.add_argument("--paragraphs", type=int, default=defaults.paragraphs, help="Plain paragraphs per article")
+    parser.add_argument(
+        "--table-density",
+        type=float,
+        default=defaults.table_density,
+        help="Probability of an HTML table after each paragraph",
+    )
+    parser.add_argument("--toc-pages", type=int, default=defaults.toc_pages, help="Table-of-contents pages (0 for none)")
+    parser.add_argument("--source-format", choices=SOURCE_FORMATS, default=defaults.source_format)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def spec_from_args(args: argparse.Namespace) -> CorpusSpec:
+    return CorpusSpec(**{key: getattr(args, key) for key in asdict(CorpusSpec())})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output-dir", type=Path, required=True)
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+    folders = generate_corpus(args.output_dir, spec_from_args(args))
+    print(f"Wrote {len(folders)} documents to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Micro-benchmark for batched token counting.
+
+Counts the segments of synthetic documents one string at a time and with
+``ChunkingService.count_tokens_many`` (one batched encode per document), with
+the token-count cache disabled so only tokenizer time is measured. Without a
+``--tokenizer-json`` file a small BPE tokenizer is trained locally, so the
+benchmark runs offline.
+
+    PYTHONPATH=src python benchmarks/tokenizer_batch_benchmark.py --documents 20 --segments 80
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import timeit
+
+from rag_chunker.use_cases.services.chunking_service import ChunkingService
+
+WORDS = (
+    "students must submit complete documentation before the stated deadline the scholarship office "
+    "publishes rankings for housing tuition fee waivers and meal services in each academic year "
+    "articolo requisiti di merito e reddito per la borsa di studio"
+).split()
+
+
+def _documents(count: int, segments: int, rng: random.Random) -> list[list[str]]:
+    return [
+        [" ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 400))) + "." for _ in range(segments)]
+        for _ in range(count)
+    ]
+
+
+def _load_tokenizer(path: str | None, documents: list[list[str]]):
+    from tokenizers import Tokenizer, models, pre_tokenizers, trainers
+
+    if path:
+        return Tokenizer.from_file(path)
+    tokenizer = Tokenizer(models.BPE())
+    tokenizer.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+    corpus = [text for document in documents[:4] for text in document]
+    tokenizer.train_from_iterator(corpus, trainer=trainers.BpeTrainer(vocab_size=2000, show_progress=False))
+    return tokenizer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--segments", type=int, default=80, help="Segments per document")
+    parser.add_argument("--tokenizer-json", default=None, help="Hugging Face tokenizer.json to benchmark")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    documents = _documents(args.documents, args.segments, random.Random(17))
+    tokenizer = _load_tokenizer(args.tokenizer_json, documents)
+    ChunkingService._load_tokenizer = staticmethod(lambda: tokenizer)
+    service = ChunkingService(token_cache_size=0)
+
+    for document in documents:
+        assert service.count_tokens_many(document) == [service.count_tokens(text) for text in document]
+    single = min(
+        timeit.repeat(
+            lambda: [[service.count_tokens(text) for text in document] for document in documents],
+            number=1,
+            repeat=args.repeat,
+        )
+    )
+    batched = min(
+        timeit.repeat(lambda: [service.count_tokens_many(document) for document in documents], number=1, repeat=args.repeat)
+    )
+    per_doc = 1000 / len(documents)
+    print(f"{'mode':>8} {'ms/document':>12}")
+    print(f"{'single':>8} {single * per_doc:>12.2f}")
+    print(f"{'batched':>8} {batched * per_doc:>12.2f}")
+    print(f"speedup: {single / batched:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
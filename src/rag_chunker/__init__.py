@@ -1,19 +1,29 @@
 """MinerU-aware deterministic RAG chunking pipeline."""
 
 from .pipeline import run_pipeline
+from .sweep import run_sweep
 from .use_cases.evaluator import run_evaluation
 from .use_cases.augment import build_augmented_text
+from .use_cases.chunk_reader import iter_chunks, load_chunks, load_documents
 from .use_cases.chunking import build_segments, count_tokens, split_text_by_tokens
 from .domain.models import CanonicalBlock, PageRef, Segment
 from .use_cases.metadata import extract_year, update_structure_state, extract_brief_description, extract_document_name
 from .use_cases.cleaning import clean_text, flatten_html_table, normalize_inline_math
 from .use_cases.deepeval_gates import DeepEvalGateConfig, run_deepeval_gates
+from .use_cases.perf_gate import run_perf_gate
 from .config.eval_config import EvalConfig
+from .config.perf_gate_config import PerfGateConfig
+from .config.sweep_config import SweepConfig
+from .config.chunk_profile import ChunkProfile
 
 __all__ = [
     "run_pipeline",
+    "run_sweep",
     "run_evaluation",
     "build_augmented_text",
+    "iter_chunks",
+    "load_chunks",
+    "load_documents",
     "build_segments",
     "count_tokens",
     "split_text_by_tokens",
@@ -29,5 +39,9 @@ __all__ = [
     "normalize_inline_math",
     "DeepEvalGateConfig",
     "run_deepeval_gates",
+    "run_perf_gate",
     "EvalConfig",
+    "PerfGateConfig",
+    "SweepConfig",
+    "ChunkProfile",
 ]
@@ -1,5 +1,8 @@
+from .chunk_profile import ChunkProfile
 from .deepeval_gate_config import DeepEvalGateConfig
 from .eval_config import EvalConfig
+from .perf_gate_config import PerfGateConfig
 from .pipeline_config import PipelineConfig
+from .sweep_config import SweepConfig
 
-__all__ = ["DeepEvalGateConfig", "EvalConfig", "PipelineConfig"]
+__all__ = ["ChunkProfile", "DeepEvalGateConfig", "EvalConfig", "PerfGateConfig", "PipelineConfig", "SweepConfig"]
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass
+class ChunkProfile:
+    """One chunk artifact set to emit from a shared parse of the corpus.
+
+    Fields left as ``None`` inherit the value from the base ``PipelineConfig``.
+    Artifacts are written to ``<output_dir>/<name>/``.
+    """
+
+    name: str
+    tokenizer_name: str | None = None
+    target_tokens: int | None = None
+    max_tokens: int | None = None
+    overlap_tokens: int | None = None
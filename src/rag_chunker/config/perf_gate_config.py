@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+@dataclass
+class PerfGateConfig:
+    """Tolerances for comparing benchmark scenario results against a stored baseline.
+
+    Throughput may drop and peak RSS may grow by the given percentages
+    relative to the baseline. ``scenario_tolerances`` overrides the
+    throughput tolerance for noisy scenarios.
+    """
+
+    results_path: Path
+    baseline_path: Path
+    output_json: Path
+    max_throughput_drop_pct: float = 30.0
+    max_peak_rss_growth_pct: float = 25.0
+    throughput_metrics: tuple[str, ...] = ("docs_per_sec", "chunks_per_sec")
+    scenario_tolerances: dict[str, float] = field(default_factory=dict)
+    require_matching_corpus: bool = True
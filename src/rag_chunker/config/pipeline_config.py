@@ -26,4 +26,17 @@ class PipelineConfig:
     dedupe_chunks: bool = True
     incremental: bool = True
     fail_fast: bool = False
+    workers: int = 1
+    streaming_output: bool = False
+    hash_scope: str = "folder"
+    stage_cache: bool = True
+    clean_cache: bool = True
+    clean_cache_max_entries: int = 100_000
     tokenizer_name: str = "Cohere/Cohere-embed-multilingual-v3.0"
+    tokenizer_cache_dir: Path | None = None
+    columnar_format: str | None = None
+    output_profile: str = "full"
+    instrument: bool = False
+    instrument_memory: bool = False
+    cprofile: bool = False
+    cprofile_docs: tuple[str, ...] = ()
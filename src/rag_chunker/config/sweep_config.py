@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .pipeline_config import PipelineConfig
+
+
+@dataclass
+class SweepConfig:
+    """Configuration for a parameter sweep over :class:`PipelineConfig` variants.
+
+    Each variant is a mapping of ``PipelineConfig`` field overrides applied to
+    ``base``. An optional ``"name"`` key names the variant's output folder under
+    ``output_dir``; otherwise a name is derived from the overrides.
+    """
+
+    base: PipelineConfig
+    variants: list[dict[str, Any]] = field(default_factory=list)
+    output_dir: Path = Path("artifacts/sweep")
+    small_chunk_threshold: int = 20
+    moderate_chunk_threshold: int = 50
+    max_small_chunk_pct: float = 12.0
+    max_article_mixed_pct: float = 5.0
@@ -1,3 +1,3 @@
-from .models import CanonicalBlock, PageRef, Segment, SourceChoice
+from .models import CanonicalBlock, PageRef, Segment, SourceChoice, page_ref_for_page
 
-__all__ = ["CanonicalBlock", "PageRef", "Segment", "SourceChoice"]
\ No newline at end of file
+__all__ = ["CanonicalBlock", "PageRef", "Segment", "SourceChoice", "page_ref_for_page"]
\ No newline at end of file
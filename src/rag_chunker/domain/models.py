@@ -1,17 +1,28 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 
+# Blocks, page refs and segments are created per block of every document, so they
+# are slotted (no per-instance __dict__) and frozen; stages build new instances
+# instead of mutating them, which also lets page-ref lists be shared safely.
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class PageRef:
     page_idx: int
     block_id: str | None = None
     block_position: str | None = None
 
 
-@dataclass
+@lru_cache(maxsize=None)
+def page_ref_for_page(page_idx: int) -> PageRef:
+    """Shared ``PageRef`` for a page without block identity (content_list sources)."""
+    return PageRef(page_idx=page_idx)
+
+
+@dataclass(frozen=True, slots=True)
 class CanonicalBlock:
     text: str
     block_type: str
@@ -20,7 +31,7 @@ class CanonicalBlock:
     source_hint: str | None = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Segment:
     text: str
     page_refs: list[PageRef]
@@ -38,4 +49,3 @@ class SourceChoice:
     content_path: Path | None = None
     md_path: Path | None = None
     fallback_reason: str | None = None
-
@@ -1,3 +1,21 @@
-from .io import choose_source, discover_document_folders, read_json, read_text, write_json, write_jsonl
+from .io import (
+    choose_source,
+    discover_document_folders,
+    get_json_codec,
+    read_json,
+    read_jsonl,
+    read_text,
+    write_json,
+    write_jsonl,
+)
 
-__all__ = ["choose_source", "discover_document_folders", "read_json", "read_text", "write_json", "write_jsonl"]
\ No newline at end of file
+__all__ = [
+    "choose_source",
+    "discover_document_folders",
+    "get_json_codec",
+    "read_json",
+    "read_jsonl",
+    "read_text",
+    "write_json",
+    "write_jsonl",
+]
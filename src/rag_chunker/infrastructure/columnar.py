@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any, Callable
+
+from .io import decode_json
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+COLUMNAR_FILENAMES = {"parquet": "chunks.parquet", "arrow": "chunks.arrow"}
+# Metadata keys flattened into top-level columns; other keys stay in chunks.jsonl only.
+METADATA_COLUMNS = ("name", "year", "brief_description", "section", "article", "subarticle", "language_hint")
+COLUMNAR_BATCH_ROWS = 8192
+
+
+def require_pyarrow(columnar_format: str) -> Any:
+    """Validate ``columnar_format`` and return the ``pyarrow`` module."""
+    if columnar_format not in COLUMNAR_FORMATS:
+        expected = ", ".join(COLUMNAR_FORMATS)
+        raise ValueError(f"Unsupported columnar format {columnar_format!r}; expected one of {expected}")
+    try:
+        import pyarrow
+    except ImportError as exc:
+        raise RuntimeError("Columnar output needs pyarrow; install it with `pip install .[columnar]`") from exc
+    return pyarrow
+
+
+def chunk_schema(pa: Any) -> Any:
+    """Arrow schema of the columnar chunk table.
+
+    Strings repeated across the rows of a document are dictionary-encoded so
+    they are stored once per batch and decoded once per distinct value.
+    """
+    repeated = pa.dictionary(pa.int32(), pa.string())
+    page_ref = pa.struct(
+        [
+            pa.field("page_idx", pa.int32()),
+            pa.field("block_id", pa.string()),
+            pa.field("block_position", pa.string()),
+        ]
+    )
+    return pa.schema(
+        [
+            pa.field("chunk_id", pa.string(), nullable=False),
+            pa.field("doc_id", repeated, nullable=False),
+            pa.field("chunk_index", pa.int32(), nullable=False),
+            pa.field("text", pa.string(), nullable=False),
+            pa.field("augmented_text", pa.string()),
+            pa.field("token_count", pa.int32(), nullable=False),
+            pa.field("char_count", pa.int32()),
+            pa.field("source_path", repeated),
+            pa.field("source_file", repeated),
+            pa.field("page_start", pa.int32()),
+            pa.field("page_end", pa.int32()),
+            pa.field("page_refs", pa.list_(page_ref)),
+            *(pa.field(key, repeated) for key in METADATA_COLUMNS),
+            pa.field("heading_path", pa.list_(pa.string())),
+        ]
+    )
+
+
+def _optional_str(value: Any) -> str | None:
+    return None if value is None else str(value)
+
+
+def _columns(rows: list[dict[str, Any]]) -> dict[str, list[Any]]:
+    columns: dict[str, list[Any]] = {
+        key: [row.get(key) for row in rows]
+        for key in (
+            "chunk_id",
+            "doc_id",
+            "chunk_index",
+            "text",
+            "augmented_text",
+            "token_count",
+            "char_count",
+            "source_path",
+            "source_file",
+            "page_start",
+            "page_end",
+        )
+    }
+    columns["page_refs"] = [
+        [
+            {
+                "page_idx": ref.get("page_idx") if isinstance(ref.get("page_idx"), int) else None,
+                "block_id": _optional_str(ref.get("block_id")),
+                "block_position": _optional_str(ref.get("block_position")),
+            }
+            for ref in row.get("page_refs") or []
+        ]
+        for row in rows
+    ]
+    metadata = [row.get("metadata") or {} for row in rows]
+    for key in METADATA_COLUMNS:
+        columns[key] = [_optional_str(item.get(key)) for item in metadata]
+    columns["heading_path"] = [[str(part) for part in item.get("heading_path") or []] for item in metadata]
+    return columns
+
+
+def write_columnar_chunks(
+    chunks_path: Path,
+    output_dir: Path,
+    columnar_format: str,
+    *,
+    batch_rows: int = COLUMNAR_BATCH_ROWS,
+    expand_row: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    """Convert ``chunks.jsonl`` into ``chunks.parquet`` or ``chunks.arrow`` next to it.
+
+    Rows are decoded and converted ``batch_rows`` at a time. Parquet row
+    groups are streamed to disk; the Arrow IPC file is written as one table
+    whose dictionaries are unified across batches, since the IPC file format
+    cannot replace a dictionary between batches. ``expand_row`` restores
+    document-level fields of compact rows before conversion. Returns the
+    manifest entry.
+    """
+    pa = require_pyarrow(columnar_format)
+    schema = chunk_schema(pa)
+    target = output_dir / COLUMNAR_FILENAMES[columnar_format]
+    temp_path = output_dir / f".{target.name}.{os.getpid()}.partial"
+
+    def batches():
+        rows: list[dict[str, Any]] = []
+        with chunks_path.open("rb") as handle:
+            for line in handle:
+                if not line.strip():
+                    continue
+                row = decode_json(line)
+                rows.append(expand_row(row) if expand_row is not None else row)
+                if len(rows) >= batch_rows:
+                    yield pa.RecordBatch.from_pydict(_columns(rows), schema=schema)
+                    rows = []
+        if rows:
+            yield pa.RecordBatch.from_pydict(_columns(rows), schema=schema)
+
+    row_count = 0
+    try:
+        if columnar_format == "parquet":
+            import pyarrow.parquet as pq
+
+            with pq.ParquetWriter(str(temp_path), schema, compression="zstd") as writer:
+                for batch in batches():
+                    writer.write_table(pa.Table.from_batches([batch], schema=schema))
+                    row_count += batch.num_rows
+        else:
+            table = pa.Table.from_batches(list(batches()), schema=schema).unify_dictionaries()
+            row_count = table.num_rows
+            with pa.OSFile(str(temp_path), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+                writer.write_table(table)
+        os.replace(temp_path, target)
+    finally:
+        temp_path.unlink(missing_ok=True)
+    return {"format": columnar_format, "path": target.name, "rows": row_count}
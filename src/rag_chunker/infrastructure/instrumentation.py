@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import math
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Any, ContextManager, Iterator
+
+RUN_SCOPE = "run"
+SLOWEST_DOCUMENTS = 10
+
+_ACTIVE_RECORDER: ContextVar[StageRecorder | None] = ContextVar("rag_chunker_stage_recorder", default=None)
+# Shared no-op span returned while no recorder is active; nullcontext is reusable.
+_NULL_SPAN = nullcontext()
+
+
+class StageRecorder:
+    """Accumulates wall time, CPU time and tracemalloc peak per stage and per document.
+
+    Spans opened inside :meth:`document` are attributed to that document;
+    other spans are attributed to the run. Repeated spans of one stage add up
+    their times and keep the largest peak. Peaks are measured above the
+    traced memory at span start and only when ``track_memory`` is set, since
+    tracing allocations slows Python down considerably.
+    """
+
+    def __init__(self, *, track_memory: bool = False) -> None:
+        self.track_memory = track_memory
+        self.documents: dict[str, dict[str, dict[str, float]]] = {}
+        self.run_stages: dict[str, dict[str, float]] = {}
+        self._current: dict[str, dict[str, float]] = self.run_stages
+        # Open spans as [peak_seen, current_at_start], innermost last.
+        self._open_peaks: list[list[int]] = []
+
+    @contextmanager
+    def document(self, doc_id: str) -> Iterator[None]:
+        previous = self._current
+        self._current = self.documents.setdefault(doc_id, {})
+        try:
+            yield
+        finally:
+            self._current = previous
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        target = self._current
+        track_memory = self.track_memory and tracemalloc.is_tracing()
+        if track_memory:
+            self._fold_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            self._open_peaks.append([current, current])
+        wall_started = time.perf_counter()
+        cpu_started = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_started
+            cpu = time.process_time() - cpu_started
+            peak = 0
+            if track_memory:
+                self._fold_peak()
+                peak_seen, current_at_start = self._open_peaks.pop()
+                if self._open_peaks:
+                    self._open_peaks[-1][0] = max(self._open_peaks[-1][0], peak_seen)
+                peak = max(peak_seen - current_at_start, 0)
+            entry = target.setdefault(name, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "peak_kib": 0.0})
+            entry["calls"] += 1
+            entry["wall_s"] += wall
+            entry["cpu_s"] += cpu
+            entry["peak_kib"] = max(entry["peak_kib"], peak / 1024)
+
+    def _fold_peak(self) -> None:
+        # reset_peak() is global, so push the peak seen so far into every open span before resetting it.
+        peak = tracemalloc.get_traced_memory()[1]
+        for open_peak in self._open_peaks:
+            open_peak[0] = max(open_peak[0], peak)
+        tracemalloc.reset_peak()
+
+    def add_document(self, doc_id: str, stages: dict[str, dict[str, float]]) -> None:
+        """Merge stage totals recorded for ``doc_id`` elsewhere, e.g. in a worker process."""
+        target = self.documents.setdefault(doc_id, {})
+        for name, values in stages.items():
+            entry = target.setdefault(name, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "peak_kib": 0.0})
+            entry["calls"] += values.get("calls", 0)
+            entry["wall_s"] += values.get("wall_s", 0.0)
+            entry["cpu_s"] += values.get("cpu_s", 0.0)
+            entry["peak_kib"] = max(entry["peak_kib"], values.get("peak_kib", 0.0))
+
+    def summary(self, *, slowest: int = SLOWEST_DOCUMENTS) -> dict[str, Any]:
+        """Per-stage p50/p95/max over documents, run-level stage totals and the slowest documents."""
+        samples: dict[str, list[dict[str, float]]] = {}
+        for stages in self.documents.values():
+            for name, values in stages.items():
+                samples.setdefault(name, []).append(values)
+        stage_summary = {
+            name: {
+                "documents": len(values),
+                "wall_s": _distribution([item["wall_s"] for item in values], total=True),
+                "cpu_s": _distribution([item["cpu_s"] for item in values], total=True),
+                **({"peak_kib": _distribution([item["peak_kib"] for item in values])} if self.track_memory else {}),
+            }
+            for name, values in samples.items()
+        }
+        totals = sorted(
+            ((sum(item["wall_s"] for item in stages.values()), doc_id) for doc_id, stages in self.documents.items()),
+            key=lambda pair: (-pair[0], pair[1]),
+        )
+        return {
+            "memory": self.track_memory,
+            "stages": stage_summary,
+            RUN_SCOPE: {name: _rounded(values) for name, values in self.run_stages.items()},
+            "slowest_documents": [
+                {
+                    "doc_id": doc_id,
+                    "wall_s": round(wall, 4),
+                    "stages": {name: round(values["wall_s"], 4) for name, values in self.documents[doc_id].items()},
+                }
+                for wall, doc_id in totals[: max(slowest, 0)]
+            ],
+        }
+
+
+def _nearest_rank(ordered: list[float], fraction: float) -> float:
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def _distribution(values: list[float], *, total: bool = False) -> dict[str, float]:
+    ordered = sorted(values)
+    summary = {
+        "p50": round(_nearest_rank(ordered, 0.5), 4),
+        "p95": round(_nearest_rank(ordered, 0.95), 4),
+        "max": round(ordered[-1], 4),
+    }
+    if total:
+        summary["total"] = round(sum(values), 4)
+    return summary
+
+
+def _rounded(values: dict[str, float]) -> dict[str, float]:
+    return {key: value if key == "calls" else round(value, 4) for key, value in values.items()}
+
+
+def active_recorder() -> StageRecorder | None:
+    return _ACTIVE_RECORDER.get()
+
+
+@contextmanager
+def recording(recorder: StageRecorder | None) -> Iterator[StageRecorder | None]:
+    """Make ``recorder`` the target of :func:`stage` spans in this context.
+
+    Starts tracemalloc for memory-tracking recorders when it is not already
+    tracing, and stops it again on exit.
+    """
+    started_tracing = recorder is not None and recorder.track_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    token = _ACTIVE_RECORDER.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _ACTIVE_RECORDER.reset(token)
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def document_scope(doc_id: str) -> ContextManager[None]:
+    """Attribute spans opened in this block to ``doc_id`` on the active recorder."""
+    recorder = _ACTIVE_RECORDER.get()
+    if recorder is None:
+        return _NULL_SPAN
+    return recorder.document(doc_id)
+
+
+def stage(name: str) -> ContextManager[None]:
+    """Time ``name`` on the active recorder; a shared no-op when instrumentation is off."""
+    recorder = _ACTIVE_RECORDER.get()
+    if recorder is None:
+        return _NULL_SPAN
+    return recorder.span(name)
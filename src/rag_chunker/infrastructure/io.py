@@ -1,10 +1,20 @@
 from __future__ import annotations
 
 import json
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, TextIO
 
 from ..domain.models import SourceChoice
 
+# One of "auto" (default: orjson, then msgspec, then the standard library), "orjson", "msgspec" or "json".
+JSON_CODEC_ENV = "RAG_CHUNKER_JSON_CODEC"
+STREAM_READ_CHARS = 1 << 16
+_JSON_WS_RE = re.compile(r"[ \t\n\r]*")
+
 
 def discover_document_folders(input_dir: Path) -> list[Path]:
     if not input_dir.exists():
@@ -46,9 +56,230 @@ def choose_source(folder: Path, source_priority: str = "block_first") -> SourceC
     )
 
 
+@dataclass(frozen=True)
+class JsonCodec:
+    """JSON encode/decode functions used for every artifact read and write.
+
+    ``dumps`` returns one line of UTF-8 bytes without a trailing newline and
+    ``dumps_pretty`` two-space indented bytes. Fast codecs fall back to the
+    standard library for input they reject (``NaN`` literals, integers beyond
+    64 bits, non-string keys), so reads return the same values whatever the
+    codec. Written bytes are not codec-independent: orjson and msgspec omit
+    spaces after separators, write ``1e16`` and turn non-finite floats into
+    ``null``, while the standard library writes ``", "``, ``1e+16`` and
+    ``NaN``. The codec name is therefore part of the incremental processing
+    signature, so reused shards always match the codec of the run.
+    """
+
+    name: str
+    loads: Callable[[str | bytes], Any]
+    dumps: Callable[[Any], bytes]
+    dumps_pretty: Callable[[Any], bytes]
+
+
+def _stdlib_codec() -> JsonCodec:
+    return JsonCodec(
+        name="json",
+        loads=json.loads,
+        dumps=lambda value: json.dumps(value, ensure_ascii=False).encode("utf-8"),
+        dumps_pretty=lambda value: json.dumps(value, ensure_ascii=False, indent=2).encode("utf-8"),
+    )
+
+
+def _orjson_codec() -> JsonCodec:
+    import orjson
+
+    fallback = _stdlib_codec()
+
+    def loads(data: str | bytes) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+
+    def dumps(value: Any) -> bytes:
+        try:
+            return orjson.dumps(value)
+        except TypeError:
+            return fallback.dumps(value)
+
+    def dumps_pretty(value: Any) -> bytes:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_INDENT_2)
+        except TypeError:
+            return fallback.dumps_pretty(value)
+
+    return JsonCodec(name="orjson", loads=loads, dumps=dumps, dumps_pretty=dumps_pretty)
+
+
+def _msgspec_codec() -> JsonCodec:
+    import msgspec
+
+    fallback = _stdlib_codec()
+    decoder = msgspec.json.Decoder()
+    encoder = msgspec.json.Encoder()
+
+    def loads(data: str | bytes) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError:
+            return json.loads(data)
+
+    def dumps(value: Any) -> bytes:
+        try:
+            return encoder.encode(value)
+        except (TypeError, msgspec.EncodeError):
+            return fallback.dumps(value)
+
+    return JsonCodec(
+        name="msgspec",
+        loads=loads,
+        dumps=dumps,
+        dumps_pretty=lambda value: msgspec.json.format(dumps(value), indent=2),
+    )
+
+
+_CODEC_FACTORIES: dict[str, Callable[[], JsonCodec]] = {
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+    "json": _stdlib_codec,
+}
+
+
+@lru_cache(maxsize=None)
+def get_json_codec(name: str | None = None) -> JsonCodec:
+    """Return the codec named by ``name`` or :data:`JSON_CODEC_ENV`, defaulting to the fastest installed."""
+    requested = (name or os.environ.get(JSON_CODEC_ENV) or "auto").strip().lower()
+    if requested == "auto":
+        for factory in _CODEC_FACTORIES.values():
+            try:
+                return factory()
+            except ImportError:
+                continue
+    if requested not in _CODEC_FACTORIES:
+        raise ValueError(f"Unknown JSON codec {requested!r}; expected one of auto, {', '.join(_CODEC_FACTORIES)}")
+    try:
+        return _CODEC_FACTORIES[requested]()
+    except ImportError as exc:
+        raise ValueError(f"JSON codec {requested!r} is not installed") from exc
+
+
+def encode_json_line(row: Any) -> bytes:
+    return get_json_codec().dumps(row) + b"\n"
+
+
+def decode_json(data: str | bytes) -> Any:
+    return get_json_codec().loads(data)
+
+
 def read_json(path: Path) -> dict | list:
+    return get_json_codec().loads(path.read_bytes())
+
+
+def read_jsonl(path: Path) -> list[dict]:
+    """Decode every non-blank line of ``path``; a missing file reads as no rows."""
+    if not path.exists():
+        return []
+    loads = get_json_codec().loads
+    with path.open("rb") as handle:
+        return [loads(line) for line in handle if line.strip()]
+
+
+class _JsonStream:
+    """Buffered cursor over a JSON text stream, decoding one value at a time with ``raw_decode``."""
+
+    def __init__(self, handle: TextIO, chunk_chars: int) -> None:
+        self._handle = handle
+        self._chunk_chars = chunk_chars
+        self._decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+
+    def _fill(self, size: int) -> bool:
+        data = self._handle.read(size)
+        if not data:
+            return False
+        # Drop the consumed prefix so the buffer only ever holds the value being decoded.
+        self.buffer = self.buffer[self.pos :] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, or ``""`` at end of input."""
+        while True:
+            self.pos = _JSON_WS_RE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill(self._chunk_chars):
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting {char!r}", self.buffer, self.pos)
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Probably truncated by the buffer boundary; grow geometrically so long values stay linear.
+                if not self._fill(max(self._chunk_chars, len(self.buffer))):
+                    raise
+                continue
+            # A number or literal ending exactly at the boundary may continue in the next chunk.
+            if end == len(self.buffer) and self._fill(self._chunk_chars):
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_object(path: Path, stream_key: str, *, chunk_chars: int = STREAM_READ_CHARS) -> Iterator[tuple[str, Any]]:
+    """Yield the top-level members of a JSON object file without loading the whole document.
+
+    Members are yielded as ``(key, value)`` in file order, except that when
+    ``stream_key`` holds an array its elements are yielded one at a time as
+    ``(stream_key, element)``. A document that is not an object yields
+    nothing; malformed JSON raises ``json.JSONDecodeError`` like ``json.load``.
+    """
     with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+        stream = _JsonStream(handle, chunk_chars)
+        if stream.peek() != "{":
+            stream.value()
+            if stream.peek():
+                raise json.JSONDecodeError("Extra data", stream.buffer, stream.pos)
+            return
+        stream.pos += 1
+        if stream.peek() == "}":
+            stream.pos += 1
+        else:
+            while True:
+                if stream.peek() != '"':
+                    raise json.JSONDecodeError(
+                        "Expecting property name enclosed in double quotes", stream.buffer, stream.pos
+                    )
+                key = stream.value()
+                stream.expect(":")
+                if key == stream_key and stream.peek() == "[":
+                    stream.pos += 1
+                    if stream.peek() == "]":
+                        stream.pos += 1
+                    else:
+                        while True:
+                            yield key, stream.value()
+                            if stream.peek() != ",":
+                                stream.expect("]")
+                                break
+                            stream.pos += 1
+                else:
+                    yield key, stream.value()
+                if stream.peek() != ",":
+                    stream.expect("}")
+                    break
+                stream.pos += 1
+        if stream.peek():
+            raise json.JSONDecodeError("Extra data", stream.buffer, stream.pos)
 
 
 def read_text(path: Path) -> str:
@@ -57,13 +288,13 @@ def read_text(path: Path) -> str:
 
 def write_json(path: Path, payload: dict | list) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as handle:
-        json.dump(payload, handle, ensure_ascii=False, indent=2)
+    path.write_bytes(get_json_codec().dumps_pretty(payload))
 
 
-def write_jsonl(path: Path, rows: list[dict]) -> None:
+def write_jsonl(path: Path, rows: Iterable[dict]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as handle:
+    dumps = get_json_codec().dumps
+    with path.open("wb") as handle:
         for row in rows:
-            handle.write(json.dumps(row, ensure_ascii=False) + "\n")
+            handle.write(dumps(row) + b"\n")
 
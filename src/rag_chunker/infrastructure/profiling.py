@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import cProfile
+import pstats
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any, ContextManager, Iterator
+
+PSTATS_FILENAME = "cprofile.pstats"
+COLLAPSED_FILENAME = "cprofile_stacks.txt"
+# Paths deeper than this are cut off; recursion is already cut where a function reappears on its own path.
+MAX_STACK_DEPTH = 64
+# Paths accounting for less time than this are dropped, which also bounds the walk over shared callees.
+MIN_PATH_SECONDS = 1e-5
+
+_ACTIVE_PROFILER: ContextVar[DocumentProfiler | None] = ContextVar("rag_chunker_document_profiler", default=None)
+_NULL_SCOPE = nullcontext()
+
+FunctionKey = tuple[str, int, str]
+
+
+class DocumentProfiler:
+    """cProfile over document processing, optionally limited to selected documents.
+
+    ``documents`` holds doc ids or folder-name glob patterns; when empty every
+    document is profiled. The profiler only runs inside :meth:`document`
+    scopes, so reuse, writing and manifest bookkeeping stay out of the stats.
+    """
+
+    def __init__(self, documents: tuple[str, ...] | list[str] = ()) -> None:
+        self.patterns = tuple(documents)
+        self.profile = cProfile.Profile()
+        self.profiled_documents: list[str] = []
+        self._depth = 0
+
+    def wants(self, doc_id: str, folder_name: str) -> bool:
+        if not self.patterns:
+            return True
+        return any(pattern == doc_id or fnmatchcase(folder_name, pattern) for pattern in self.patterns)
+
+    @contextmanager
+    def document(self, doc_id: str, folder_name: str) -> Iterator[None]:
+        if self._depth or not self.wants(doc_id, folder_name):
+            yield
+            return
+        self.profiled_documents.append(doc_id)
+        self._depth += 1
+        self.profile.enable()
+        try:
+            yield
+        finally:
+            self.profile.disable()
+            self._depth -= 1
+
+    def write(self, output_dir: Path) -> dict[str, Any]:
+        """Write the pstats dump and collapsed stacks to ``output_dir`` and describe them."""
+        output_dir.mkdir(parents=True, exist_ok=True)
+        pstats_path = output_dir / PSTATS_FILENAME
+        collapsed_path = output_dir / COLLAPSED_FILENAME
+        self.profile.dump_stats(str(pstats_path))
+        lines = collapsed_stacks(pstats.Stats(self.profile).stats)
+        collapsed_path.write_text("".join(f"{stack} {value}\n" for stack, value in lines), encoding="utf-8")
+        return {
+            "pstats": str(pstats_path.resolve()),
+            "collapsed_stacks": str(collapsed_path.resolve()),
+            "documents": list(self.patterns),
+            "profiled_documents": len(self.profiled_documents),
+        }
+
+
+def _label(func: FunctionKey) -> str:
+    filename, line, name = func
+    if filename == "~":
+        # Built-ins are recorded as ("~", 0, "<built-in method ...>").
+        return name.replace(";", ",")
+    return f"{pstats.func_strip_path(func)[0]}:{line}({name})".replace(";", ",").replace(" ", "_")
+
+
+def collapsed_stacks(stats: dict[FunctionKey, Any]) -> list[tuple[str, int]]:
+    """Flamegraph ``stack value`` lines (microseconds of own time) derived from cProfile call edges.
+
+    cProfile records caller/callee edges rather than full stacks, so each
+    function's own time is spread over the paths that reach it in proportion
+    to the time each incoming edge accounts for, as flameprof does. Paths are
+    exact for call trees and approximate where a function is shared by
+    callers with different argument sizes.
+    """
+    callees: dict[FunctionKey, list[tuple[FunctionKey, float]]] = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            if caller in stats and caller != func:
+                callees.setdefault(caller, []).append((func, edge[3]))
+    roots = [func for func, row in stats.items() if not any(caller in stats and caller != func for caller in row[4])]
+
+    totals: dict[str, float] = {}
+
+    def walk(func: FunctionKey, path: tuple[FunctionKey, ...], share: float) -> None:
+        _, _, own, cumulative, _ = stats[func]
+        stack = path + (func,)
+        key = ";".join(_label(item) for item in stack)
+        totals[key] = totals.get(key, 0.0) + own * share
+        if len(stack) >= MAX_STACK_DEPTH or cumulative <= 0:
+            return
+        for callee, edge_cumulative in callees.get(func, ()):
+            if callee in stack:
+                continue
+            callee_cumulative = stats[callee][3]
+            if callee_cumulative > 0 and share * edge_cumulative >= MIN_PATH_SECONDS:
+                walk(callee, stack, share * edge_cumulative / callee_cumulative)
+
+    for root in sorted(roots):
+        walk(root, (), 1.0)
+    lines = [(stack, round(seconds * 1_000_000)) for stack, seconds in totals.items()]
+    return sorted(line for line in lines if line[1] > 0)
+
+
+def active_profiler() -> DocumentProfiler | None:
+    return _ACTIVE_PROFILER.get()
+
+
+@contextmanager
+def profiling(profiler: DocumentProfiler | None) -> Iterator[DocumentProfiler | None]:
+    """Make ``profiler`` the target of :func:`profile_document` scopes in this context."""
+    token = _ACTIVE_PROFILER.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _ACTIVE_PROFILER.reset(token)
+
+
+def profile_document(doc_id: str, folder_name: str) -> ContextManager[None]:
+    """Profile this block if the active profiler selects the document; a shared no-op otherwise."""
+    profiler = _ACTIVE_PROFILER.get()
+    if profiler is None:
+        return _NULL_SCOPE
+    return profiler.document(doc_id, folder_name)
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+from typing import Any
+
+DEFAULT_TOKENIZER_NAME = "Cohere/Cohere-embed-multilingual-v3.0"
+# Explicit tokenizer.json to use regardless of the configured name.
+TOKENIZER_FILE_ENV = "RAG_CHUNKER_TOKENIZER_FILE"
+# Directory holding one ``<name>/tokenizer.json`` per Hub tokenizer, filled on first download.
+TOKENIZER_CACHE_ENV = "RAG_CHUNKER_TOKENIZER_CACHE"
+# Any of these set to a truthy value disables Hub downloads.
+OFFLINE_ENVS = ("RAG_CHUNKER_OFFLINE", "HF_HUB_OFFLINE")
+_CACHE_NAME_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def is_offline() -> bool:
+    return any(os.environ.get(name, "").strip().lower() in {"1", "true", "yes", "on"} for name in OFFLINE_ENVS)
+
+
+def tokenizer_cache_dir(cache_dir: Path | str | None = None) -> Path | None:
+    if cache_dir is not None:
+        return Path(cache_dir)
+    configured = os.environ.get(TOKENIZER_CACHE_ENV)
+    return Path(configured) if configured else None
+
+
+def cached_tokenizer_path(name: str, cache_dir: Path) -> Path:
+    return cache_dir / _CACHE_NAME_RE.sub("--", name) / "tokenizer.json"
+
+
+def local_tokenizer_file(name: str, cache_dir: Path | str | None = None) -> Path | None:
+    """Return the first local ``tokenizer.json`` that satisfies ``name``, if any.
+
+    Checked in order: :data:`TOKENIZER_FILE_ENV`, ``name`` as a file or as a
+    directory containing ``tokenizer.json``, then the artifact cache directory.
+    """
+    candidates: list[Path] = []
+    explicit = os.environ.get(TOKENIZER_FILE_ENV)
+    if explicit:
+        candidates.append(Path(explicit))
+    as_path = Path(name).expanduser()
+    candidates.extend([as_path, as_path / "tokenizer.json"])
+    resolved_cache = tokenizer_cache_dir(cache_dir)
+    if resolved_cache is not None:
+        candidates.append(cached_tokenizer_path(name, resolved_cache))
+    for candidate in candidates:
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def load_hf_tokenizer(name: str, *, cache_dir: Path | str | None = None) -> Any | None:
+    """Load a Hugging Face tokenizer from local files, falling back to the Hub.
+
+    Returns ``None`` when ``tokenizers`` is missing, or when no local file
+    exists and downloads are disabled. A tokenizer fetched from the Hub is
+    written to the cache directory so later runs and workers load it offline.
+    """
+    try:
+        from tokenizers import Tokenizer
+    except ImportError:
+        return None
+
+    local_file = local_tokenizer_file(name, cache_dir)
+    if local_file is not None:
+        return Tokenizer.from_file(str(local_file))
+    if is_offline():
+        return None
+
+    tokenizer = Tokenizer.from_pretrained(name)
+    resolved_cache = tokenizer_cache_dir(cache_dir)
+    if resolved_cache is not None:
+        target = cached_tokenizer_path(name, resolved_cache)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = target.with_name(f".tokenizer.json.{os.getpid()}.partial")
+        tokenizer.save(str(temp_path))
+        os.replace(temp_path, target)
+    return tokenizer
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from .tokenizer_loader import load_hf_tokenizer
+
+# Encoding used when a bare tokenizer name cannot be loaded from Hugging Face.
+FALLBACK_TIKTOKEN_ENCODING = "cl100k_base"
+REGEX_TOKENIZER_SPEC = "regex"
+
+TokenizerFactory = Callable[[str, Path | None], Any]
+
+
+@dataclass(frozen=True)
+class LoadedTokenizer:
+    """A tokenizer backend plus the identity recorded in cache signatures.
+
+    ``backend`` is ``None`` for the regex estimator. ``error`` records why a
+    bare name fell back to it, one ``<scheme>: <exception>`` entry per backend tried.
+    """
+
+    backend: Any | None
+    identity: str
+    error: str | None = None
+
+
+def _load_hf(name: str, cache_dir: Path | None) -> Any:
+    tokenizer = load_hf_tokenizer(name, cache_dir=cache_dir)
+    if tokenizer is None:
+        raise ValueError(f"Hugging Face tokenizer {name!r} is not available locally and downloads are disabled")
+    return tokenizer
+
+
+def _load_tiktoken(name: str, _cache_dir: Path | None) -> Any:
+    import tiktoken
+
+    return tiktoken.get_encoding(name)
+
+
+def _for_counting(backend: Any) -> Any:
+    """Turn off padding and truncation that a tokenizer.json may enable.
+
+    Hub tokenizers often ship with padding on, which pads every ``encode_batch``
+    result to the longest text, and truncation caps counts at ``max_length``;
+    either would make token budgets disagree with the text.
+    """
+    if hasattr(backend, "no_padding") and getattr(backend, "padding", None) is not None:
+        backend.no_padding()
+    if hasattr(backend, "no_truncation") and getattr(backend, "truncation", None) is not None:
+        backend.no_truncation()
+    return backend
+
+
+def identify_tokenizer(backend: Any | None, name: str | None = None) -> str:
+    """Return a stable identity for ``backend``, tied to its vocabulary where possible."""
+    if backend is None:
+        return REGEX_TOKENIZER_SPEC
+    if hasattr(backend, "encode_ordinary"):
+        return f"tiktoken:{getattr(backend, 'name', name)}"
+    if hasattr(backend, "to_str"):
+        digest = hashlib.sha1(backend.to_str().encode("utf-8")).hexdigest()[:16]
+        return f"hf:{name or 'tokenizer'}#{digest}"
+    return f"{type(backend).__name__}:{name or ''}"
+
+
+class TokenizerRegistry:
+    """Resolves tokenizer specs to loaded tokenizers, caching each one per process.
+
+    Specs are ``hf:<hub name or tokenizer.json path>``, ``tiktoken:<encoding>``
+    or ``regex``. A bare name keeps the historical chain: Hugging Face, then
+    tiktoken ``cl100k_base``, then the regex estimator. Explicit specs raise
+    ``ValueError`` when they cannot be loaded instead of falling back, so a
+    run never silently counts with a different tokenizer than requested.
+    """
+
+    def __init__(self) -> None:
+        self._factories: dict[str, TokenizerFactory] = {"hf": _load_hf, "tiktoken": _load_tiktoken}
+        self._loaded: dict[tuple[str, str | None], LoadedTokenizer] = {}
+
+    def register(self, scheme: str, factory: TokenizerFactory) -> None:
+        self._factories[scheme] = factory
+
+    def resolve(self, spec: str, cache_dir: Path | None = None) -> LoadedTokenizer:
+        key = (spec, str(cache_dir) if cache_dir is not None else None)
+        loaded = self._loaded.get(key)
+        if loaded is None:
+            loaded = self._load(spec, cache_dir)
+            self._loaded[key] = loaded
+        return loaded
+
+    def clear(self) -> None:
+        self._loaded.clear()
+
+    def _load(self, spec: str, cache_dir: Path | None) -> LoadedTokenizer:
+        if spec == REGEX_TOKENIZER_SPEC:
+            return LoadedTokenizer(backend=None, identity=REGEX_TOKENIZER_SPEC)
+        scheme, sep, name = spec.partition(":")
+        if sep and scheme in self._factories:
+            if not name:
+                raise ValueError(f"Tokenizer spec {spec!r} is missing a name")
+            try:
+                backend = _for_counting(self._factories[scheme](name, cache_dir))
+            except ValueError:
+                raise
+            except Exception as exc:
+                raise ValueError(f"Could not load tokenizer {spec!r}: {exc}") from exc
+            return LoadedTokenizer(backend=backend, identity=identify_tokenizer(backend, name))
+
+        errors: list[str] = []
+        for scheme, name in (("hf", spec), ("tiktoken", FALLBACK_TIKTOKEN_ENCODING)):
+            try:
+                backend = _for_counting(self._factories[scheme](name, cache_dir))
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                errors.append(f"{scheme}: {exc}")
+                continue
+            return LoadedTokenizer(backend=backend, identity=identify_tokenizer(backend, name))
+        return LoadedTokenizer(backend=None, identity=REGEX_TOKENIZER_SPEC, error="; ".join(errors))
+
+
+DEFAULT_TOKENIZER_REGISTRY = TokenizerRegistry()
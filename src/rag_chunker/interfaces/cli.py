@@ -3,7 +3,10 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
+from ..config import ChunkProfile
+from ..infrastructure.columnar import COLUMNAR_FORMATS, require_pyarrow
 from ..pipeline import PipelineConfig, run_pipeline
+from ..use_cases.chunk_reader import OUTPUT_PROFILES
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -27,12 +30,117 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--drop-toc", action="store_true", default=True)
     parser.add_argument("--no-incremental", action="store_true", help="Always reprocess all documents")
     parser.add_argument("--fail-fast", action="store_true", help="Stop immediately if a document fails processing")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes for document processing (output is identical to a serial run)",
+    )
+    parser.add_argument(
+        "--stream-output",
+        action="store_true",
+        help="Append each document's rows to disk as it finishes instead of buffering the whole corpus",
+    )
+    parser.add_argument(
+        "--hash-scope",
+        type=str,
+        default="folder",
+        choices=["folder", "source"],
+        help="Files hashed for incremental reuse: the whole folder or only the selected source files",
+    )
+    parser.add_argument(
+        "--no-stage-cache",
+        action="store_true",
+        help="Do not reuse cached cleaned blocks and segments when only chunking parameters changed",
+    )
+    parser.add_argument(
+        "--columnar",
+        choices=COLUMNAR_FORMATS,
+        default=None,
+        help="Also write chunks as chunks.parquet or chunks.arrow with typed columns (needs pyarrow)",
+    )
+    parser.add_argument(
+        "--output-profile",
+        choices=OUTPUT_PROFILES,
+        default="full",
+        help="compact omits augmented_text and document-level metadata from chunk rows; join them from documents.jsonl",
+    )
+    parser.add_argument(
+        "--no-clean-cache",
+        action="store_true",
+        help="Do not reuse cleaned text for blocks already seen in this or earlier runs",
+    )
+    parser.add_argument(
+        "--clean-cache-max-entries",
+        type=int,
+        default=100_000,
+        help="Most recently used cleaned blocks kept in clean_cache.sqlite",
+    )
+    parser.add_argument(
+        "--instrument",
+        action="store_true",
+        help="Record wall and CPU time per stage and document under stage_timings in run_manifest.json",
+    )
+    parser.add_argument(
+        "--instrument-memory",
+        action="store_true",
+        help="Like --instrument, plus the tracemalloc peak per stage (slows processing down)",
+    )
+    parser.add_argument(
+        "--cprofile",
+        action="store_true",
+        help="Run document processing under cProfile; writes cprofile.pstats and cprofile_stacks.txt to --output-dir",
+    )
+    parser.add_argument(
+        "--cprofile-docs",
+        action="append",
+        default=[],
+        metavar="DOC_ID_OR_GLOB",
+        help="Profile only documents with this doc_id or folder-name glob; repeat for several (implies --cprofile)",
+    )
+    parser.add_argument(
+        "--tokenizer",
+        type=str,
+        default="Cohere/Cohere-embed-multilingual-v3.0",
+        help="Tokenizer spec: hf:<name or tokenizer.json path>, tiktoken:<encoding>, regex, or a bare Hugging Face name",
+    )
+    parser.add_argument(
+        "--tokenizer-cache-dir",
+        type=Path,
+        default=None,
+        help="Directory of cached tokenizer.json files; Hub downloads are saved here for offline reuse",
+    )
+    parser.add_argument(
+        "--profile",
+        action="append",
+        default=[],
+        metavar="NAME:TARGET:MAX[:TOKENIZER]",
+        help="Emit an extra chunk set to <output-dir>/NAME from the same parse; repeat for several profiles",
+    )
     return parser
 
 
+def parse_profile(value: str) -> ChunkProfile:
+    # The tokenizer spec comes last so it may itself contain ':' (e.g. hf:org/model).
+    parts = value.split(":", 3)
+    if len(parts) < 3:
+        raise ValueError(f"Invalid --profile value {value!r}; expected NAME:TARGET:MAX[:TOKENIZER]")
+    return ChunkProfile(
+        name=parts[0],
+        target_tokens=int(parts[1]),
+        max_tokens=int(parts[2]),
+        tokenizer_name=parts[3] if len(parts) == 4 else None,
+    )
+
+
 def main() -> None:
     parser = build_parser()
     args = parser.parse_args()
+    if args.columnar:
+        try:
+            require_pyarrow(args.columnar)
+        except RuntimeError as exc:
+            parser.error(str(exc))
     config = PipelineConfig(
         input_dir=args.input_dir,
         output_dir=args.output_dir,
@@ -47,12 +155,38 @@ def main() -> None:
         drop_toc=args.drop_toc,
         incremental=not args.no_incremental,
         fail_fast=args.fail_fast,
+        workers=args.workers,
+        streaming_output=args.stream_output,
+        hash_scope=args.hash_scope,
+        stage_cache=not args.no_stage_cache,
+        clean_cache=not args.no_clean_cache,
+        clean_cache_max_entries=args.clean_cache_max_entries,
+        tokenizer_name=args.tokenizer,
+        tokenizer_cache_dir=args.tokenizer_cache_dir,
+        columnar_format=args.columnar,
+        output_profile=args.output_profile,
+        instrument=args.instrument,
+        instrument_memory=args.instrument_memory,
+        cprofile=args.cprofile,
+        cprofile_docs=tuple(args.cprofile_docs),
     )
+    if args.profile:
+        try:
+            profiles = [parse_profile(value) for value in args.profile]
+        except ValueError as exc:
+            parser.error(str(exc))
+        summary = run_pipeline(config, profiles=profiles)
+        print(f"Documents: {summary['documents']} (parsed {summary['prepared_documents']})")
+        for name, manifest in summary["profiles"].items():
+            print(f"{name}: {manifest['chunks']} chunks, tokenizer {manifest['tokenizer']}, errors {len(manifest['errors'])}")
+        return
     manifest = run_pipeline(config)
     print(f"Processed documents: {manifest['documents']}")
     print(f"Produced chunks: {manifest['chunks']}")
     if manifest["errors"]:
         print(f"Errors: {len(manifest['errors'])}")
+    if "cprofile" in manifest:
+        print(f"Profile: {manifest['cprofile']['pstats']} ({manifest['cprofile']['profiled_documents']} documents)")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from ..config import PerfGateConfig
+from ..use_cases.perf_gate import run_perf_gate
+
+SCENARIO_TOLERANCE_METAVAR = "SCENARIO=PCT"
+
+
+def _scenario_tolerance(value: str) -> tuple[str, float]:
+    name, sep, pct = value.partition("=")
+    if not sep or not name:
+        raise argparse.ArgumentTypeError(f"expected {SCENARIO_TOLERANCE_METAVAR}, got {value!r}")
+    try:
+        return name, float(pct)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"expected {SCENARIO_TOLERANCE_METAVAR}, got {value!r}") from exc
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Check benchmark scenario results against a stored performance baseline.")
+    parser.add_argument("--results", type=Path, default=Path("artifacts/perf_results.json"))
+    parser.add_argument("--baseline", type=Path, default=Path("benchmarks/baselines/perf_baseline.json"))
+    parser.add_argument("--output-json", type=Path, default=Path("artifacts/perf_gate_report.json"))
+    parser.add_argument("--max-throughput-drop-pct", type=float, default=30.0)
+    parser.add_argument("--max-peak-rss-growth-pct", type=float, default=25.0)
+    parser.add_argument(
+        "--scenario-tolerance",
+        type=_scenario_tolerance,
+        action="append",
+        default=[],
+        metavar=SCENARIO_TOLERANCE_METAVAR,
+        help="Throughput drop allowed for one scenario; repeat for several",
+    )
+    parser.add_argument("--fail-on-threshold", action="store_true")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    # A missing baseline must not pass the gate; recording one is an explicit step.
+    for label, path in (("baseline", args.baseline), ("results", args.results)):
+        if not path.is_file():
+            parser.error(f"{label} file not found: {path}")
+    config = PerfGateConfig(
+        results_path=args.results,
+        baseline_path=args.baseline,
+        output_json=args.output_json,
+        max_throughput_drop_pct=args.max_throughput_drop_pct,
+        max_peak_rss_growth_pct=args.max_peak_rss_growth_pct,
+        scenario_tolerances=dict(args.scenario_tolerance),
+    )
+    try:
+        report = run_perf_gate(config)
+    except ValueError as exc:
+        parser.error(str(exc))
+    for check in report["checks"]:
+        if not check["passed"]:
+            print(f"FAILED {check['name']}: {check['actual']} (expected {check['comparison']} {check['expected']})")
+    print(f"Perf gates passed: {report['summary']['gates_passed']}")
+    print(f"JSON report: {config.output_json}")
+    if args.fail_on_threshold and not report["summary"]["gates_passed"]:
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
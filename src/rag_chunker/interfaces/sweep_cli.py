@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import sys
+from dataclasses import fields
+from pathlib import Path
+from typing import Any
+
+from ..config import PipelineConfig, SweepConfig
+from ..sweep import run_sweep
+
+_FIELD_TYPES = {item.name: item.type for item in fields(PipelineConfig)}
+
+
+def _parse_value(field_name: str, raw: str) -> Any:
+    field_type = str(_FIELD_TYPES[field_name])
+    if field_type == "bool":
+        lowered = raw.strip().lower()
+        if lowered not in {"true", "false", "1", "0", "yes", "no"}:
+            raise ValueError(f"{field_name}: expected a boolean, got {raw!r}")
+        return lowered in {"true", "1", "yes"}
+    if field_type == "int":
+        return int(raw)
+    if field_type == "float":
+        return float(raw)
+    return raw
+
+
+def parse_grid(specs: list[str]) -> list[dict[str, Any]]:
+    """Expand ``key=v1,v2`` specs into the cartesian product of overrides."""
+    axes: list[tuple[str, list[Any]]] = []
+    for spec in specs:
+        key, sep, raw_values = spec.partition("=")
+        key = key.strip().replace("-", "_")
+        if not sep or not raw_values:
+            raise ValueError(f"Invalid --grid value {spec!r}; expected key=v1,v2")
+        if key not in _FIELD_TYPES:
+            raise ValueError(f"Unknown PipelineConfig field: {key}")
+        axes.append((key, [_parse_value(key, value) for value in raw_values.split(",")]))
+    if not axes:
+        return []
+    keys = [key for key, _ in axes]
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(values for _, values in axes))]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Compare chunking parameter variants in a single pass over the corpus")
+    parser.add_argument("--input-dir", type=Path, required=True, help="Path to MinerU output root directory")
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path("artifacts/sweep"),
+        help="Directory for per-variant artifacts and the sweep report",
+    )
+    parser.add_argument(
+        "--grid",
+        action="append",
+        default=[],
+        metavar="FIELD=V1,V2",
+        help="PipelineConfig field and values to sweep; repeat to build a cartesian grid",
+    )
+    parser.add_argument("--target-tokens", type=int, default=420)
+    parser.add_argument("--max-tokens", type=int, default=480)
+    parser.add_argument("--overlap-tokens", type=int, default=30)
+    parser.add_argument("--min-viable-chunk-tokens", type=int, default=50)
+    parser.add_argument(
+        "--tokenizer",
+        type=str,
+        default="Cohere/Cohere-embed-multilingual-v3.0",
+        help="Tokenizer spec: hf:<name or tokenizer.json path>, tiktoken:<encoding>, regex, or a bare Hugging Face name",
+    )
+    parser.add_argument("--tokenizer-cache-dir", type=Path, default=None, help="Directory of cached tokenizer.json files")
+    parser.add_argument("--fail-fast", action="store_true", help="Stop immediately if a document fails processing")
+    parser.add_argument(
+        "--fail-on-threshold",
+        action="store_true",
+        help="Exit with code 2 when no variant passes the quality gates",
+    )
+    return parser
+
+
+def main() -> None:
+    parser = build_parser()
+    args = parser.parse_args()
+    try:
+        variants = parse_grid(args.grid)
+    except ValueError as exc:
+        parser.error(str(exc))
+    base = PipelineConfig(
+        input_dir=args.input_dir,
+        output_dir=args.output_dir,
+        target_tokens=args.target_tokens,
+        max_tokens=args.max_tokens,
+        overlap_tokens=args.overlap_tokens,
+        min_viable_chunk_tokens=args.min_viable_chunk_tokens,
+        fail_fast=args.fail_fast,
+        tokenizer_name=args.tokenizer,
+        tokenizer_cache_dir=args.tokenizer_cache_dir,
+    )
+    try:
+        report = run_sweep(SweepConfig(base=base, variants=variants, output_dir=args.output_dir))
+    except ValueError as exc:
+        parser.error(str(exc))
+    for row in report["variants"]:
+        gates = "pass" if row["quality_gates_passed"] else "fail"
+        print(f"{row['name']}: score {row['overall_score']} ({row['overall_status']}), chunks {row['chunks']}, gates {gates}")
+    print(f"Sweep report: {args.output_dir / 'sweep_report.md'}")
+    if args.fail_on_threshold and not any(row["quality_gates_passed"] for row in report["variants"]):
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,20 +2,48 @@ from __future__ import annotations
 
 import hashlib
 import re
+import shutil
 import sys
+import time
+from collections.abc import Iterator
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
+from itertools import islice
+from multiprocessing.util import Finalize
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from .use_cases.augment import build_augmented_text
-from .use_cases.chunking import build_segments, count_tokens, split_text_by_tokens
+from .use_cases.chunk_reader import OUTPUT_PROFILES, compact_chunk_row, expand_chunk_row, load_documents
+from .use_cases.chunking import (
+    build_segments,
+    configure_tokenizer,
+    count_tokens,
+    count_tokens_many,
+    fits_joined,
+    joined_token_bounds,
+    split_text_by_tokens,
+    token_cache_stats,
+    tokenizer_identity,
+    using_tokenizer,
+)
 from .use_cases.cleaning import IMAGE_LINE_RE, clean_text
-from .config import PipelineConfig
-from .infrastructure.io import choose_source, discover_document_folders, read_json, read_text, write_json, write_jsonl
+from .config import ChunkProfile, PipelineConfig
+from .infrastructure.columnar import require_pyarrow, write_columnar_chunks
+from .infrastructure.instrumentation import StageRecorder, active_recorder, document_scope, recording, stage
+from .infrastructure.profiling import DocumentProfiler, active_profiler, profile_document, profiling
+from .infrastructure.io import choose_source, discover_document_folders, get_json_codec, read_json, read_text, write_json
 from .use_cases.metadata import detect_language_hint, extract_brief_description, extract_document_name, extract_year
 from .domain.models import CanonicalBlock, PageRef, Segment, SourceChoice
+from .use_cases.services.artifact_writer_service import ArtifactWriterService
 from .use_cases.services.chunking_service import ChunkingService
-from .use_cases.services.incremental_cache_service import IncrementalCacheService
+from .use_cases.services.clean_text_cache_service import CLEAN_CACHE_FILENAME, CleanTextCacheService
+from .use_cases.services.document_shard_store import DocumentShardStore
+from .use_cases.services.incremental_cache_service import IncrementalCacheService, IncrementalCacheSnapshot
+from .use_cases.services.stage_cache_service import StageCacheService
 from .use_cases.services.global_chunk_dedupe_service import GlobalChunkDedupeService
 from .use_cases.services.tiny_chunk_sweep_service import TinyChunkSweepService
 from .use_cases.services.block_loader_service import load_canonical_blocks
@@ -23,6 +51,7 @@ from .use_cases.services.segment_merge_service import _merge_toc_segments, _merg
 from .use_cases.services.chunk_assembly_service import _chunk_segment_texts, _merge_tiny_chunk_texts, _split_table_rows, _is_table_chunk_text
 from .use_cases.services.structure_resolver_service import _resolve_structure, _resolve_chunk_article
 
+PARALLEL_SUBMIT_WINDOW_PER_WORKER = 4
 UUID_SUFFIX_RE = re.compile(r"-[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.IGNORECASE)
 TOC_KEYWORD_RE = re.compile(r"(?i)\b(summary|sommario|indice|table of contents)\b")
 TOC_ENTRY_RE = re.compile(r"(?i)^(?:#\s*)?(?:art\.?|article|articolo)\s*\d+(?:\.\d+)?\b.*\b\d{1,3}\s*$")
@@ -49,10 +78,13 @@ def _normalized_folder_title(folder_name: str) -> str:
 
 
 
-def _clean_blocks(blocks: list[CanonicalBlock]) -> list[CanonicalBlock]:
+def _clean_blocks(blocks: list[CanonicalBlock], clean_cache: CleanTextCacheService | None = None) -> list[CanonicalBlock]:
+    if clean_cache is not None:
+        texts = clean_cache.clean_many([block.text for block in blocks])
+    else:
+        texts = [clean_text(block.text) for block in blocks]
     cleaned: list[CanonicalBlock] = []
-    for block in blocks:
-        text = clean_text(block.text)
+    for block, text in zip(blocks, texts):
         if not text:
             continue
         cleaned.append(
@@ -87,15 +119,7 @@ def _page_meta(page_refs: list[PageRef]) -> tuple[int | None, int | None, list[d
 
 
 def _dedupe_page_refs(page_refs: list[PageRef]) -> list[PageRef]:
-    seen: set[tuple[int, str | None, str | None]] = set()
-    out: list[PageRef] = []
-    for ref in page_refs:
-        key = (ref.page_idx, ref.block_id, ref.block_position)
-        if key in seen:
-            continue
-        seen.add(key)
-        out.append(ref)
-    return out
+    return list(dict.fromkeys(page_refs))
 
 
 def _same_structure(a, b) -> bool:
@@ -148,6 +172,14 @@ def _merge_small_segments(segments, *, min_tokens: int, max_tokens: int):
     if not segments:
         return []
 
+    def joined_fits(left, right) -> bool:
+        return fits_joined(left.text.rstrip(), right.text.lstrip(), max_tokens)
+
+    def merged_tokens(left, right, merged) -> int:
+        # Only the comparison against min_tokens matters, so a sufficient lower bound avoids re-encoding.
+        lower, _ = joined_token_bounds(count_tokens(left.text.rstrip()), count_tokens(right.text.lstrip()))
+        return lower if lower >= min_tokens else count_tokens(merged.text)
+
     working = list(segments)
     out = []
     idx = 0
@@ -159,28 +191,27 @@ def _merge_small_segments(segments, *, min_tokens: int, max_tokens: int):
             nxt = working[idx + 1]
             if not _compatible_for_small_merge(segment, nxt):
                 break
-            merged_candidate = _merge_two_segments(segment, nxt)
-            if count_tokens(merged_candidate.text) > max_tokens:
+            if not joined_fits(segment, nxt):
                 break
+            merged_candidate = _merge_two_segments(segment, nxt)
+            seg_tokens = merged_tokens(segment, nxt, merged_candidate)
             segment = merged_candidate
             idx += 1
-            seg_tokens = count_tokens(segment.text)
 
         if seg_tokens < min_tokens and idx + 1 < len(working):
             nxt = working[idx + 1]
             line_count = len([line for line in segment.text.splitlines() if line.strip()])
             looks_like_label = line_count <= 2 and len(segment.text) <= 120
             if looks_like_label and _compatible_for_small_merge(segment, nxt):
-                merged_candidate = _prepend_segment_to_next(segment, nxt)
-                if count_tokens(merged_candidate.text) <= max_tokens:
+                if joined_fits(segment, nxt):
+                    merged_candidate = _prepend_segment_to_next(segment, nxt)
+                    seg_tokens = merged_tokens(segment, nxt, merged_candidate)
                     segment = merged_candidate
                     idx += 1
-                    seg_tokens = count_tokens(segment.text)
 
         if out and seg_tokens < min_tokens and _compatible_for_small_merge(out[-1], segment):
-            merged_candidate = _merge_two_segments(out[-1], segment)
-            if count_tokens(merged_candidate.text) <= max_tokens:
-                out[-1] = merged_candidate
+            if joined_fits(out[-1], segment):
+                out[-1] = _merge_two_segments(out[-1], segment)
                 idx += 1
                 continue
 
@@ -426,6 +457,7 @@ def _final_tiny_chunk_sweep(chunk_rows: list[dict[str, Any]], *, max_tokens: int
         max_tokens=max_tokens,
         sweep_tokens=sweep_tokens,
         count_tokens=count_tokens,
+        fits_joined=fits_joined,
         looks_structural_stub=lambda text, token_count: _looks_structural_stub(text, token_count=token_count, threshold=min_viable_chunk_tokens),
         compatible_chunk_structure=lambda row, section, article, subarticle: _compatible_chunk_structure(
             row,
@@ -652,53 +684,303 @@ def _merge_toc_segments(segments: list[Segment], *, max_tokens: int, drop_toc: b
     return [chunk_text for _, chunk_text in fixed_pairs]
 
 
-def _process_document_folder(folder: Path, config: PipelineConfig) -> tuple[dict, list[dict], dict]:
-    choice = choose_source(folder, source_priority=config.source_priority)
-    raw_blocks, source_mode_used = load_canonical_blocks(choice)
-    cleaned_blocks = _clean_blocks(raw_blocks)
+@dataclass
+class _PreparedDocument:
+    """Output of the load/clean/metadata stage for one document folder."""
+
+    source_mode_used: str
+    cleaned_blocks: list[CanonicalBlock]
+    name: str
+    year: str | None
+    brief_description: str
+    language_hint: str | None
+
+
+def _prepare_document(
+    choice: SourceChoice,
+    fallback_name: str,
+    clean_cache: CleanTextCacheService | None = None,
+) -> _PreparedDocument:
+    with stage("load"):
+        raw_blocks, source_mode_used = load_canonical_blocks(choice)
+    with stage("clean"):
+        cleaned_blocks = _clean_blocks(raw_blocks, clean_cache)
     if not cleaned_blocks:
         raise ValueError("No usable text blocks extracted")
+    preview_text = "\n".join(block.text for block in cleaned_blocks[:30])
+    name = extract_document_name(cleaned_blocks, fallback_name=fallback_name)
+    return _PreparedDocument(
+        source_mode_used=source_mode_used,
+        cleaned_blocks=cleaned_blocks,
+        name=name,
+        year=extract_year(preview_text),
+        brief_description=extract_brief_description(cleaned_blocks, title=name),
+        language_hint=detect_language_hint(preview_text),
+    )
 
-    source_folder = str(folder.resolve())
-    md_path = str(choice.md_path.resolve()) if choice.md_path is not None else None
-    source_file = choice.md_path.name if choice.md_path is not None else folder.name
+
+def _build_document_segments(cleaned_blocks: list[CanonicalBlock], config: PipelineConfig) -> list[Segment]:
+    with stage("segment"):
+        segments = build_segments(cleaned_blocks)
+    return _merge_document_segments(segments, config)
+
+
+def _merge_document_segments(segments: list[Segment], config: PipelineConfig) -> list[Segment]:
+    with stage("merge_segments"):
+        # One batched encode fills the token cache for the ToC and small-segment merge passes.
+        count_tokens_many([segment.text for segment in segments])
+        segments = _merge_toc_segments(segments, max_tokens=config.max_tokens, drop_toc=config.drop_toc)
+        return _merge_small_segments(
+            segments,
+            min_tokens=config.min_viable_chunk_tokens,
+            max_tokens=config.max_tokens,
+        )
+
+
+def _load_document_stages(
+    folder: Path,
+    choice: SourceChoice,
+    doc_id: str,
+    config: PipelineConfig,
+    clean_cache: CleanTextCacheService | None = None,
+    file_digests: dict[str, str] | None = None,
+) -> tuple[_PreparedDocument, list[Segment], list[str]]:
+    """Run or recall the prepare and segment stages; returns the stages served from cache.
+
+    ``file_digests`` are the per-file SHA-1 digests of the folder fingerprint,
+    reused to key the stage cache instead of reading the sources again.
+    """
     fallback_name = _normalized_folder_title(folder.name)
-    doc_id = _sha1(source_folder)[:16]
+    if not (config.stage_cache and config.incremental):
+        prepared = _prepare_document(choice, fallback_name, clean_cache)
+        return prepared, _build_document_segments(prepared.cleaned_blocks, config), []
+
+    stage_cache = StageCacheService(root=config.output_dir / "stage_cache", sha1_func=_sha1)
+    source_hash = stage_cache.source_hash(choice, file_digests)
+    cache_hits: list[str] = []
+
+    prepare_key = stage_cache.stage_key(
+        "prepare",
+        source_hash,
+        {"source_priority": config.source_priority, "source_mode": choice.mode, "fallback_name": fallback_name},
+    )
+    payload = stage_cache.load(doc_id, "prepare", prepare_key)
+    if payload is not None:
+        prepared = _PreparedDocument(**{**payload, "cleaned_blocks": stage_cache.decode_blocks(payload["cleaned_blocks"])})
+        cache_hits.append("prepare")
+    else:
+        prepared = _prepare_document(choice, fallback_name, clean_cache)
+        stage_cache.store(
+            doc_id,
+            "prepare",
+            prepare_key,
+            {**prepared.__dict__, "cleaned_blocks": stage_cache.encode_blocks(prepared.cleaned_blocks)},
+        )
 
-    preview_text = "\n".join(block.text for block in cleaned_blocks[:30])
-    name = extract_document_name(cleaned_blocks, fallback_name=fallback_name)
-    year = extract_year(preview_text)
-    brief_description = extract_brief_description(cleaned_blocks, title=name)
-    language_hint = detect_language_hint(preview_text)
-
-    segments = build_segments(cleaned_blocks)
-    segments = _merge_toc_segments(segments, max_tokens=config.max_tokens, drop_toc=config.drop_toc)
-    segments = _merge_small_segments(
-        segments,
-        min_tokens=config.min_viable_chunk_tokens,
-        max_tokens=config.max_tokens,
+    segments_key = stage_cache.stage_key(
+        "segments",
+        prepare_key,
+        {
+            "max_tokens": config.max_tokens,
+            "drop_toc": config.drop_toc,
+            "min_viable_chunk_tokens": config.min_viable_chunk_tokens,
+            "tokenizer": tokenizer_identity(),
+        },
+    )
+    payload = stage_cache.load(doc_id, "segments", segments_key)
+    if payload is not None:
+        segments = stage_cache.decode_segments(payload)
+        cache_hits.append("segments")
+    else:
+        segments = _build_document_segments(prepared.cleaned_blocks, config)
+        stage_cache.store(doc_id, "segments", segments_key, stage_cache.encode_segments(segments))
+    return prepared, segments, cache_hits
+
+
+@dataclass
+class _DocumentSource:
+    folder: Path
+    choice: SourceChoice
+    source_folder: str
+    md_path: str | None
+    source_file: str
+    doc_id: str
+
+
+def _document_source(folder: Path, source_priority: str) -> _DocumentSource:
+    choice = choose_source(folder, source_priority=source_priority)
+    source_folder = str(folder.resolve())
+    return _DocumentSource(
+        folder=folder,
+        choice=choice,
+        source_folder=source_folder,
+        md_path=str(choice.md_path.resolve()) if choice.md_path is not None else None,
+        source_file=choice.md_path.name if choice.md_path is not None else folder.name,
+        doc_id=_sha1(source_folder)[:16],
+    )
+
+
+def _clean_cache_for(config: PipelineConfig) -> CleanTextCacheService | None:
+    if not (config.clean_cache and config.incremental):
+        return None
+    return CleanTextCacheService(
+        path=config.output_dir / CLEAN_CACHE_FILENAME,
+        clean_func=clean_text,
+        max_entries=config.clean_cache_max_entries,
     )
+
+
+def _chunk_row_transform(config: PipelineConfig) -> Callable[[dict[str, Any]], dict[str, Any]] | None:
+    if config.output_profile not in OUTPUT_PROFILES:
+        raise ValueError(f"Unsupported output profile {config.output_profile!r}; expected one of {', '.join(OUTPUT_PROFILES)}")
+    return compact_chunk_row if config.output_profile == "compact" else None
+
+
+def _write_columnar(config: PipelineConfig) -> dict[str, Any]:
+    documents = load_documents(config.output_dir) if config.output_profile == "compact" else {}
+
+    def expand_row(row: dict[str, Any]) -> dict[str, Any]:
+        return expand_chunk_row(row, documents.get(str(row.get("doc_id", ""))))
+
+    return write_columnar_chunks(
+        config.output_dir / "chunks.jsonl",
+        config.output_dir,
+        str(config.columnar_format),
+        expand_row=expand_row if documents else None,
+    )
+
+
+def _stage_recorder_for(config: PipelineConfig) -> StageRecorder | None:
+    if not (config.instrument or config.instrument_memory):
+        return None
+    return StageRecorder(track_memory=config.instrument_memory)
+
+
+def _profiler_for(config: PipelineConfig) -> DocumentProfiler | None:
+    if not (config.cprofile or config.cprofile_docs):
+        return None
+    return DocumentProfiler(config.cprofile_docs)
+
+
+def _process_document_folder(
+    folder: Path,
+    config: PipelineConfig,
+    file_digests: dict[str, str] | None = None,
+    clean_cache: CleanTextCacheService | None = None,
+) -> tuple[dict, list[dict], dict]:
+    source = _document_source(folder, config.source_priority)
+    # Runs pass the clean cache they keep open; a standalone call opens one just for this document.
+    owns_clean_cache = clean_cache is None
+    if owns_clean_cache:
+        clean_cache = _clean_cache_for(config)
+    clean_before = clean_cache.stats() if clean_cache is not None else {}
+    # A recorder of its own per document, so worker processes can report their stage timings back.
+    recorder = _stage_recorder_for(config)
+    with recording(recorder), profile_document(source.doc_id, folder.name):
+        try:
+            prepared, segments, stage_cache_hits = _load_document_stages(
+                folder, source.choice, source.doc_id, config, clean_cache, file_digests
+            )
+        finally:
+            if owns_clean_cache and clean_cache is not None:
+                clean_cache.close()
+        with stage("assemble"):
+            result = _assemble_document(source, prepared, segments, config, stage_cache_hits)
+    if clean_cache is not None:
+        result[2]["clean_cache"] = {key: value - clean_before[key] for key, value in clean_cache.stats().items()}
+    if recorder is not None:
+        result[2]["stage_timings"] = recorder.run_stages
+    return result
+
+
+def _process_document_variants(
+    folder: Path,
+    configs: list[PipelineConfig],
+    clean_cache: CleanTextCacheService | None = None,
+) -> list[tuple[tuple[dict, list[dict], dict] | None, Exception | None, float]]:
+    """Load, clean and segment ``folder`` once, then merge and assemble it for every config.
+
+    All configs must share ``source_priority``. Each config is assembled with
+    its own tokenizer; merged segments are shared between configs that agree
+    on the tokenizer and the fields the segment stage reads, and token counts
+    are shared through each tokenizer's cache. ``clean_cache`` serves the
+    clean stage; the stage cache is not used. Returns
+    ``(result, error, assemble_seconds)`` per config, in order.
+    """
+    source = _document_source(folder, configs[0].source_priority)
+    prepared = _prepare_document(source.choice, _normalized_folder_title(folder.name), clean_cache)
+    base_segments = build_segments(prepared.cleaned_blocks)
+    segments_by_key: dict[tuple[str, Path | None, int, bool, int], list[Segment]] = {}
+    outcomes: list[tuple[tuple[dict, list[dict], dict] | None, Exception | None, float]] = []
+    for config in configs:
+        started = time.perf_counter()
+        try:
+            with using_tokenizer(config.tokenizer_name, config.tokenizer_cache_dir):
+                key = (
+                    config.tokenizer_name,
+                    config.tokenizer_cache_dir,
+                    config.max_tokens,
+                    config.drop_toc,
+                    config.min_viable_chunk_tokens,
+                )
+                if key not in segments_by_key:
+                    segments_by_key[key] = _merge_document_segments(base_segments, config)
+                result = _assemble_document(source, prepared, segments_by_key[key], config)
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            outcomes.append((None, exc, time.perf_counter() - started))
+            continue
+        outcomes.append((result, None, time.perf_counter() - started))
+    return outcomes
+
+
+def _assemble_document(
+    source: _DocumentSource,
+    prepared: _PreparedDocument,
+    segments: list[Segment],
+    config: PipelineConfig,
+    stage_cache_hits: list[str] | None = None,
+) -> tuple[dict, list[dict], dict]:
+    choice = source.choice
+    source_folder = source.source_folder
+    md_path = source.md_path
+    source_file = source.source_file
+    doc_id = source.doc_id
+    source_mode_used = prepared.source_mode_used
+    cleaned_blocks = prepared.cleaned_blocks
+    name = prepared.name
+    year = prepared.year
+    brief_description = prepared.brief_description
+    language_hint = prepared.language_hint
+
     chunk_rows: list[dict] = []
     seen_chunk_texts: set[str] = set()
     chunk_index = 0
-    for segment in segments:
+    segment_chunk_texts: list[list[str]] = []
+    with stage("chunk"):
+        for segment in segments:
+            chunk_texts = _chunk_segment_texts(
+                segment.text,
+                target_tokens=config.target_tokens,
+                max_tokens=config.max_tokens,
+                overlap_tokens=config.overlap_tokens,
+                min_chars=config.min_chars,
+            )
+            chunk_texts = _merge_tiny_chunk_texts(
+                chunk_texts,
+                min_tokens=config.min_chunk_tokens,
+                max_tokens=config.max_tokens,
+            )
+            segment_chunk_texts.append(
+                _dedup_chunk_boundaries(
+                    chunk_texts,
+                    overlap_tokens=config.overlap_tokens,
+                )
+            )
+        # Count every chunk of the document in one batched encode; the row loop below then hits the cache.
+        count_tokens_many([text.strip() for chunk_texts in segment_chunk_texts for text in chunk_texts])
+
+    for segment, chunk_texts in zip(segments, segment_chunk_texts):
         resolved_section, resolved_article, resolved_subarticle = _resolve_structure(segment)
-        chunk_texts = _chunk_segment_texts(
-            segment.text,
-            target_tokens=config.target_tokens,
-            max_tokens=config.max_tokens,
-            overlap_tokens=config.overlap_tokens,
-            min_chars=config.min_chars,
-        )
-        chunk_texts = _merge_tiny_chunk_texts(
-            chunk_texts,
-            min_tokens=config.min_chunk_tokens,
-            max_tokens=config.max_tokens,
-        )
-        chunk_texts = _dedup_chunk_boundaries(
-            chunk_texts,
-            overlap_tokens=config.overlap_tokens,
-        )
         for chunk_text in chunk_texts:
             chunk_text = chunk_text.strip()
             if not chunk_text:
@@ -726,8 +1008,9 @@ def _process_document_folder(folder: Path, config: PipelineConfig) -> tuple[dict
                     article=chunk_article,
                     subarticle=chunk_subarticle,
                 ):
-                    merged_candidate = chunk_rows[-1]["text"].rstrip() + "\n\n" + chunk_text
-                    if count_tokens(merged_candidate) <= config.max_tokens:
+                    previous_text = chunk_rows[-1]["text"].rstrip()
+                    if fits_joined(previous_text, chunk_text, config.max_tokens, right_tokens=token_count):
+                        merged_candidate = previous_text + "\n\n" + chunk_text
                         old_text = chunk_rows[-1]["text"]
                         chunk_rows[-1]["text"] = merged_candidate
                         chunk_rows[-1]["token_count"] = count_tokens(merged_candidate)
@@ -737,14 +1020,17 @@ def _process_document_folder(folder: Path, config: PipelineConfig) -> tuple[dict
                         if merged_refs:
                             chunk_rows[-1]["page_start"] = min(ref["page_idx"] for ref in merged_refs)
                             chunk_rows[-1]["page_end"] = max(ref["page_idx"] for ref in merged_refs)
+                        # The merged row keeps its own structure metadata, so augment from that rather than the
+                        # tiny chunk's; readers of compact output derive augmented_text the same way.
+                        merged_metadata = chunk_rows[-1].get("metadata", {})
                         chunk_rows[-1]["augmented_text"] = build_augmented_text(
                             merged_candidate,
                             name=name,
                             year=year,
                             brief_description=brief_description,
-                            section=resolved_section,
-                            article=chunk_article,
-                            subarticle=chunk_subarticle,
+                            section=merged_metadata.get("section"),
+                            article=merged_metadata.get("article"),
+                            subarticle=merged_metadata.get("subarticle"),
                         )
                         if config.dedupe_chunks:
                             seen_chunk_texts.discard(old_text)
@@ -794,12 +1080,13 @@ def _process_document_folder(folder: Path, config: PipelineConfig) -> tuple[dict
                 seen_chunk_texts.add(chunk_text)
             chunk_index += 1
 
-    chunk_rows = _final_tiny_chunk_sweep(
-        chunk_rows,
-        max_tokens=config.max_tokens,
-        sweep_tokens=config.min_viable_chunk_tokens,
-        min_viable_chunk_tokens=config.min_viable_chunk_tokens,
-    )
+    with stage("tiny_sweep"):
+        chunk_rows = _final_tiny_chunk_sweep(
+            chunk_rows,
+            max_tokens=config.max_tokens,
+            sweep_tokens=config.min_viable_chunk_tokens,
+            min_viable_chunk_tokens=config.min_viable_chunk_tokens,
+        )
 
     pages = sorted(
         {
@@ -837,101 +1124,591 @@ def _process_document_folder(folder: Path, config: PipelineConfig) -> tuple[dict
         result_manifest["warnings"].append("block_list not used")
     if year is None:
         result_manifest["warnings"].append("year not detected")
+    if stage_cache_hits:
+        result_manifest["stage_cache_hits"] = stage_cache_hits
     return document_row, chunk_rows, result_manifest
 
 
-def run_pipeline(config: PipelineConfig) -> dict:
+@dataclass
+class _DocumentPlan:
+    folder: Path
+    source_folder: str
+    doc_id: str
+    folder_hash: str
+    files: dict[str, list[Any]]
+    reuse: bool
+
+
+def _hash_source_paths(folder: Path, config: PipelineConfig) -> list[Path] | None:
+    if config.hash_scope == "folder":
+        return None
+    if config.hash_scope != "source":
+        raise ValueError(f"Unsupported hash scope: {config.hash_scope}")
+    choice = choose_source(folder, source_priority=config.source_priority)
+    return [path for path in (choice.block_path, choice.content_path, choice.md_path) if path is not None]
+
+
+def _prune_stage_cache(root: Path, doc_ids: set[str]) -> None:
+    if not root.exists():
+        return
+    for path in root.iterdir():
+        if path.is_dir() and path.name not in doc_ids:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+# Clean cache of the current worker process, opened by _init_worker and closed when the worker exits.
+_WORKER_CLEAN_CACHE: CleanTextCacheService | None = None
+
+
+def _init_worker(config: PipelineConfig) -> None:
+    global _WORKER_CLEAN_CACHE  # pylint: disable=global-statement
+    # Load the tokenizer once per worker process instead of once per document.
+    configure_tokenizer(config.tokenizer_name, config.tokenizer_cache_dir)
+    count_tokens("warmup")
+    # One SQLite connection per worker instead of a connect/close cycle per document.
+    _WORKER_CLEAN_CACHE = _clean_cache_for(config)
+    if _WORKER_CLEAN_CACHE is not None:
+        Finalize(_WORKER_CLEAN_CACHE, _WORKER_CLEAN_CACHE.close, exitpriority=10)
+
+
+def _token_cache_delta(before: dict[str, int], after: dict[str, int]) -> dict[str, int]:
+    return {key: after[key] - before[key] for key in ("hits", "misses")}
+
+
+def _hit_rate(usage: dict[str, Any]) -> float:
+    lookups = usage["hits"] + usage["misses"]
+    return round(usage["hits"] / lookups, 4) if lookups else 0.0
+
+
+def _token_cache_usage(
+    before: dict[str, int],
+    after: dict[str, int],
+    worker_stats: dict[str, int] | None = None,
+) -> dict[str, Any]:
+    """The ``token_count_cache`` manifest section: counters between two snapshots plus worker counters."""
+    usage: dict[str, Any] = _token_cache_delta(before, after)
+    for key, value in (worker_stats or {}).items():
+        usage[key] += value
+    usage["hit_rate"] = _hit_rate(usage)
+    usage["max_entries"] = after["max_entries"]
+    return usage
+
+
+def _finish_clean_cache(
+    clean_cache: CleanTextCacheService | None,
+    usage: dict[str, int],
+    config: PipelineConfig,
+) -> dict[str, Any]:
+    """Prune and close ``clean_cache``; returns the ``clean_cache`` manifest section."""
+    section: dict[str, Any] = {"enabled": clean_cache is not None, "max_entries": config.clean_cache_max_entries, **usage}
+    if clean_cache is not None:
+        section["pruned"] = clean_cache.prune()
+        section["entries"] = clean_cache.entry_count()
+        clean_cache.close()
+    section["hit_rate"] = _hit_rate(section)
+    return section
+
+
+def _process_document_in_worker(
+    folder: Path,
+    config: PipelineConfig,
+    file_digests: dict[str, str] | None = None,
+) -> tuple[tuple[dict, list[dict], dict], dict[str, int]]:
+    # Each worker owns its own token-count cache; report its counters back to the parent.
+    before = token_cache_stats()
+    result = _process_document_folder(folder, config, file_digests, _WORKER_CLEAN_CACHE)
+    return result, _token_cache_delta(before, token_cache_stats())
+
+
+def _iter_processed_documents(
+    folders: list[Path],
+    config: PipelineConfig,
+    worker_token_stats: dict[str, int] | None = None,
+    file_digests: dict[Path, dict[str, str]] | None = None,
+    clean_cache: CleanTextCacheService | None = None,
+) -> Iterator[tuple[Path, tuple[dict, list[dict], dict] | None, Exception | None]]:
+    """Yield ``(folder, result, error)`` for every folder, always in input order.
+
+    With ``config.workers > 1`` folders are processed in a process pool; results
+    are still consumed in submission order so the merged artifacts do not depend
+    on worker scheduling. Token-cache counters reported by workers are summed
+    into ``worker_token_stats`` when given. ``file_digests`` holds each folder's
+    fingerprint digests for the stage cache. Serial runs clean through
+    ``clean_cache``; every worker process opens a clean cache of its own.
+    """
+    file_digests = file_digests or {}
+    if config.workers <= 1 or len(folders) <= 1:
+        for folder in folders:
+            try:
+                yield folder, _process_document_folder(folder, config, file_digests.get(folder), clean_cache), None
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                yield folder, None, exc
+        return
+
+    max_workers = min(config.workers, len(folders))
+    executor = ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(config,),
+    )
+    try:
+        # Keep a bounded window of submissions so finished-but-unconsumed results do not pile up.
+        window = max_workers * PARALLEL_SUBMIT_WINDOW_PER_WORKER
+        pending: deque[tuple[Path, Future]] = deque()
+        remaining = iter(folders)
+        for folder in islice(remaining, window):
+            pending.append((folder, executor.submit(_process_document_in_worker, folder, config, file_digests.get(folder))))
+        while pending:
+            folder, future = pending.popleft()
+            for next_folder in islice(remaining, 1):
+                pending.append(
+                    (next_folder, executor.submit(_process_document_in_worker, next_folder, config, file_digests.get(next_folder)))
+                )
+            try:
+                result, token_stats = future.result()
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                yield folder, None, exc
+                continue
+            if worker_token_stats is not None:
+                for key, value in token_stats.items():
+                    worker_token_stats[key] = worker_token_stats.get(key, 0) + value
+            yield folder, result, None
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+PROFILE_NAME_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]*$")
+
+
+@dataclass
+class _ProfileRun:
+    name: str
+    config: PipelineConfig
+    tokenizer: str
+    cache_service: IncrementalCacheService
+    snapshot: IncrementalCacheSnapshot
+    signature: str
+    writer: ArtifactWriterService
+    token_stats_before: dict[str, int]
+    source_mode_counts: dict[str, int] = field(default_factory=dict)
+    document_results: list[dict] = field(default_factory=list)
+    errors: list[dict] = field(default_factory=list)
+    reusable_hashes: dict[str, dict[str, str]] = field(default_factory=dict)
+    processed_documents: int = 0
+    reused_documents: int = 0
+
+    def record(self, document_row: dict, doc_manifest: dict) -> None:
+        mode = document_row.get("source_mode_used", "unknown")
+        self.source_mode_counts[mode] = self.source_mode_counts.get(mode, 0) + 1
+        self.document_results.append(doc_manifest)
+
+
+def _profile_configs(config: PipelineConfig, profiles: list[ChunkProfile]) -> list[PipelineConfig]:
+    names = [profile.name for profile in profiles]
+    for name in names:
+        if not PROFILE_NAME_RE.match(name):
+            raise ValueError(f"Invalid chunk profile name: {name!r}")
+    if len(set(names)) != len(names):
+        raise ValueError("Chunk profile names must be unique")
+    resolved: list[PipelineConfig] = []
+    for profile in profiles:
+        overrides = {
+            key: getattr(profile, key)
+            for key in ("tokenizer_name", "target_tokens", "max_tokens", "overlap_tokens")
+            if getattr(profile, key) is not None
+        }
+        resolved.append(replace(config, output_dir=config.output_dir / profile.name, **overrides))
+    return resolved
+
+
+def _run_profiles(config: PipelineConfig, profiles: list[ChunkProfile]) -> dict:
+    """Parse, clean and segment each document once and emit one artifact set per profile.
+
+    Every profile keeps its own incremental cache and shards under
+    ``<output_dir>/<profile>/``; a document is only loaded when at least one
+    profile cannot reuse it, and then only the profiles that need it are
+    assembled. Documents are processed serially. The clean cache is shared by
+    all profiles under ``output_dir``; the stage cache is not used, since the
+    shared parse already replaces it within a run.
+    """
+    recorder = active_recorder()
+    profiler = active_profiler()
+    clean_cache = _clean_cache_for(config)
+    runs: list[_ProfileRun] = []
+    for profile, profile_config in zip(profiles, _profile_configs(config, profiles)):
+        with using_tokenizer(profile_config.tokenizer_name, profile_config.tokenizer_cache_dir):
+            identity = tokenizer_identity()
+            token_stats_before = token_cache_stats()
+        dedupe_service = GlobalChunkDedupeService(sha1_func=_sha1)
+        shard_store = DocumentShardStore(root=profile_config.output_dir / "shards", dedupe_key=dedupe_service.dedupe_key)
+        cache_service = IncrementalCacheService(
+            output_dir=profile_config.output_dir,
+            sha1_func=_sha1,
+            read_json=read_json,
+            load_shard_index=shard_store.load_index,
+            tokenizer_identity=lambda identity=identity: identity,
+            json_codec_name=lambda: get_json_codec().name,
+        )
+        writer = ArtifactWriterService(
+            output_dir=profile_config.output_dir,
+            streaming=profile_config.streaming_output,
+            dedupe_service=dedupe_service if profile_config.dedupe_chunks else None,
+            shard_store=shard_store,
+            row_transform=_chunk_row_transform(profile_config),
+        )
+        runs.append(
+            _ProfileRun(
+                name=profile.name,
+                config=profile_config,
+                tokenizer=identity,
+                cache_service=cache_service,
+                snapshot=cache_service.load_snapshot(),
+                signature=cache_service.processing_signature(profile_config),
+                writer=writer,
+                token_stats_before=token_stats_before,
+            )
+        )
+
+    folders = discover_document_folders(config.input_dir)
+    prepared_documents = 0
+    rehashed_files = 0
+    stat_matched_files = 0
+    try:
+        for folder in folders:
+            source_folder = str(folder.resolve())
+            doc_id = _sha1(source_folder)[:16]
+            prior_files = next(
+                (run.snapshot.cache_by_doc[doc_id].get("files") for run in runs if doc_id in run.snapshot.cache_by_doc),
+                None,
+            )
+            fingerprint = runs[0].cache_service.fingerprint_folder(
+                folder,
+                prior_files=prior_files,
+                source_paths=_hash_source_paths(folder, config),
+            )
+            rehashed_files += fingerprint.rehashed_files
+            stat_matched_files += fingerprint.stat_matched_files
+
+            pending: list[tuple[_ProfileRun, dict]] = []
+            for run in runs:
+                entry = run.cache_service.build_entry(
+                    source_folder=source_folder,
+                    folder_hash=fingerprint.content_hash,
+                    processing_signature=run.signature,
+                    files=fingerprint.files,
+                )
+                reuse = config.incremental and run.cache_service.can_reuse(
+                    doc_id=doc_id,
+                    folder_hash=fingerprint.content_hash,
+                    processing_signature=run.signature,
+                    snapshot=run.snapshot,
+                )
+                if not reuse:
+                    pending.append((run, entry))
+                    continue
+                document_row = run.writer.add_reused(doc_id, run.snapshot.shards_by_doc[doc_id])
+                run.record(
+                    document_row,
+                    {
+                        "doc_id": doc_id,
+                        "source_folder": source_folder,
+                        "source_mode_used": document_row.get("source_mode_used", "unknown"),
+                        "fallback_reason": "incremental reuse",
+                        "warnings": [],
+                        "reused": True,
+                    },
+                )
+                run.reusable_hashes[doc_id] = entry
+                run.reused_documents += 1
+            if not pending:
+                continue
+
+            prepared_documents += 1
+            try:
+                with document_scope(doc_id), profile_document(doc_id, folder.name):
+                    outcomes = _process_document_variants(folder, [run.config for run, _ in pending], clean_cache)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                outcomes = [(None, exc, 0.0)] * len(pending)
+            for (run, entry), (result, exc, _) in zip(pending, outcomes):
+                if exc is not None:
+                    run.errors.append({"source_folder": source_folder, "error": str(exc)})
+                    print(f"[rag-chunker] {run.name}: failed to process {folder.name}: {exc}", file=sys.stderr)
+                    if config.fail_fast:
+                        raise exc
+                    continue
+                document_row, chunk_rows, doc_manifest = result
+                with document_scope(doc_id), stage("write"):
+                    run.writer.add(document_row, chunk_rows)
+                run.record(document_row, doc_manifest)
+                run.reusable_hashes[str(document_row.get("doc_id", doc_id))] = entry
+                run.processed_documents += 1
+    except BaseException:
+        for run in runs:
+            run.writer.abort()
+        if clean_cache is not None:
+            clean_cache.close()
+        raise
+
+    processed_at = datetime.now(timezone.utc).isoformat()
+    # One clean cache serves every profile, so each profile manifest carries the same section.
+    clean_cache_usage = _finish_clean_cache(
+        clean_cache, clean_cache.stats() if clean_cache is not None else {"hits": 0, "misses": 0}, config
+    )
+    manifests: dict[str, dict] = {}
+    for run in runs:
+        with stage("finalize"):
+            run.writer.finalize()
+        with stage("columnar"):
+            columnar = _write_columnar(run.config) if config.columnar_format else None
+        # Profiles with the same tokenizer share its token cache and so report the same counters.
+        with using_tokenizer(run.config.tokenizer_name, run.config.tokenizer_cache_dir):
+            token_cache_usage = _token_cache_usage(run.token_stats_before, token_cache_stats())
+        manifest = {
+            "input_dir": str(config.input_dir.resolve()),
+            "output_dir": str(run.config.output_dir.resolve()),
+            "processed_at_utc": processed_at,
+            "documents": run.writer.documents_written,
+            "chunks": run.writer.chunks_written,
+            "source_modes": run.source_mode_counts,
+            "tokenizer": run.tokenizer,
+            "output_profile": run.config.output_profile,
+            "profile": {
+                "name": run.name,
+                "target_tokens": run.config.target_tokens,
+                "max_tokens": run.config.max_tokens,
+                "overlap_tokens": run.config.overlap_tokens,
+            },
+            "incremental": {
+                "enabled": config.incremental,
+                "processed_documents": run.processed_documents,
+                "reused_documents": run.reused_documents,
+                "rehashed_files": rehashed_files,
+                "stat_matched_files": stat_matched_files,
+                "shard_copied_documents": run.writer.copied_documents,
+            },
+            "token_count_cache": token_cache_usage,
+            "stage_cache": {"enabled": False, "prepare_hits": 0, "segments_hits": 0},
+            "clean_cache": clean_cache_usage,
+            **({"columnar": columnar} if columnar else {}),
+            "document_results": run.document_results,
+            "errors": run.errors,
+        }
+        write_json(run.config.output_dir / "run_manifest.json", manifest)
+        run.cache_service.write_cache(generated_at_utc=processed_at, entries=run.reusable_hashes, write_json=write_json)
+        manifests[run.name] = manifest
+
+    summary = {
+        "input_dir": str(config.input_dir.resolve()),
+        "output_dir": str(config.output_dir.resolve()),
+        "processed_at_utc": processed_at,
+        "documents": len(folders),
+        "prepared_documents": prepared_documents,
+        **({"stage_timings": recorder.summary()} if recorder is not None else {}),
+        **({"cprofile": profiler.write(config.output_dir)} if profiler is not None else {}),
+        "profiles": manifests,
+    }
+    write_json(
+        config.output_dir / "profiles_manifest.json",
+        {
+            **{key: value for key, value in summary.items() if key != "profiles"},
+            "profiles": {
+                name: {key: manifest[key] for key in ("output_dir", "documents", "chunks", "tokenizer", "profile", "errors")}
+                for name, manifest in manifests.items()
+            },
+        },
+    )
+    return summary
+
+
+def run_pipeline(config: PipelineConfig, profiles: list[ChunkProfile] | None = None) -> dict:
+    """Run the pipeline; with ``profiles``, emit one artifact set per profile from a shared parse.
+
+    Without profiles, returns the run manifest written to ``run_manifest.json``.
+    With profiles, returns a summary whose ``profiles`` key maps each profile
+    name to its run manifest under ``<output_dir>/<name>/``. With
+    ``config.cprofile`` (or ``cprofile_docs``), document processing runs under
+    cProfile and ``cprofile.pstats`` plus ``cprofile_stacks.txt`` are written
+    to ``output_dir``.
+    """
+    if config.columnar_format:
+        require_pyarrow(config.columnar_format)
+    profiler = _profiler_for(config)
+    if profiler is not None and config.workers > 1:
+        # cProfile only sees the current process, so profiled runs process documents serially.
+        print("[rag-chunker] Profiling processes documents serially; ignoring --workers", file=sys.stderr)
+        config = replace(config, workers=1)
+    if profiles and config.workers > 1:
+        print("[rag-chunker] Chunk profiles process documents serially; ignoring --workers", file=sys.stderr)
+        config = replace(config, workers=1)
+    with recording(_stage_recorder_for(config)), profiling(profiler):
+        if profiles:
+            return _run_profiles(config, profiles)
+        return _run_single(config)
+
+
+def _run_single(config: PipelineConfig) -> dict:
+    recorder = active_recorder()
+    profiler = active_profiler()
+    configure_tokenizer(config.tokenizer_name, config.tokenizer_cache_dir)
     folders = discover_document_folders(config.input_dir)
+    dedupe_service = GlobalChunkDedupeService(sha1_func=_sha1)
+    shard_store = DocumentShardStore(root=config.output_dir / "shards", dedupe_key=dedupe_service.dedupe_key)
     cache_service = IncrementalCacheService(
         output_dir=config.output_dir,
         sha1_func=_sha1,
         read_json=read_json,
-        version=2,
+        load_shard_index=shard_store.load_index,
+        tokenizer_identity=tokenizer_identity,
+        json_codec_name=lambda: get_json_codec().name,
     )
     snapshot = cache_service.load_snapshot()
     current_signature = cache_service.processing_signature(config)
-    dedupe_service = GlobalChunkDedupeService(sha1_func=_sha1)
-    documents: list[dict] = []
-    chunks: list[dict] = []
+    writer = ArtifactWriterService(
+        output_dir=config.output_dir,
+        streaming=config.streaming_output,
+        dedupe_service=dedupe_service if config.dedupe_chunks else None,
+        shard_store=shard_store,
+        row_transform=_chunk_row_transform(config),
+    )
+    source_mode_counts: dict[str, int] = {}
     errors: list[dict] = []
     doc_results: list[dict] = []
     reusable_hashes: dict[str, dict[str, str]] = {}
     reused_documents = 0
     processed_documents = 0
-
+    rehashed_files = 0
+    stat_matched_files = 0
+    stage_cache_hits = {"prepare": 0, "segments": 0}
+    clean_cache_usage = {"hits": 0, "misses": 0}
+    token_stats_before = token_cache_stats()
+    worker_token_stats: dict[str, int] = {}
+
+    plans: list[_DocumentPlan] = []
     for folder in folders:
         source_folder = str(folder.resolve())
         doc_id = _sha1(source_folder)[:16]
-        folder_hash = cache_service.compute_folder_hash(folder)
-        if config.incremental and cache_service.can_reuse(
+        fingerprint = cache_service.fingerprint_folder(
+            folder,
+            prior_files=snapshot.cache_by_doc.get(doc_id, {}).get("files"),
+            source_paths=_hash_source_paths(folder, config),
+        )
+        rehashed_files += fingerprint.rehashed_files
+        stat_matched_files += fingerprint.stat_matched_files
+        reuse = config.incremental and cache_service.can_reuse(
             doc_id=doc_id,
-            folder_hash=folder_hash,
+            folder_hash=fingerprint.content_hash,
             processing_signature=current_signature,
             snapshot=snapshot,
-        ):
-            document_row = snapshot.docs_by_id[doc_id]
-            chunk_rows = snapshot.chunks_by_doc.get(doc_id, [])
-            documents.append(document_row)
-            chunks.extend(chunk_rows)
-            doc_results.append(
-                {
-                    "doc_id": doc_id,
-                    "source_folder": source_folder,
-                    "source_mode_used": document_row.get("source_mode_used", "unknown"),
-                    "fallback_reason": "incremental reuse",
-                    "warnings": [],
-                    "reused": True,
-                }
-            )
-            reusable_hashes[doc_id] = cache_service.build_entry(
-                source_folder=source_folder,
-                folder_hash=folder_hash,
-                processing_signature=current_signature,
-            )
-            reused_documents += 1
-            continue
-        try:
-            document_row, chunk_rows, doc_manifest = _process_document_folder(folder, config)
-            documents.append(document_row)
-            chunks.extend(chunk_rows)
-            doc_results.append(doc_manifest)
-            reusable_hashes[str(document_row.get("doc_id", doc_id))] = cache_service.build_entry(
-                source_folder=source_folder,
-                folder_hash=folder_hash,
-                processing_signature=current_signature,
-            )
-            processed_documents += 1
-        except Exception as exc:  # pylint: disable=broad-exception-caught
-            error_row = {"source_folder": str(folder.resolve()), "error": str(exc)}
-            errors.append(error_row)
-            print(f"[rag-chunker] Failed to process {folder.name}: {exc}", file=sys.stderr)
-            if config.fail_fast:
-                raise
+        )
+        plans.append(_DocumentPlan(folder, source_folder, doc_id, fingerprint.content_hash, fingerprint.files, reuse))
 
-    if config.dedupe_chunks:
-        chunks = dedupe_service.apply(chunks, documents)
+    def count_source_mode(document_row: dict) -> None:
+        mode = document_row.get("source_mode_used", "unknown")
+        source_mode_counts[mode] = source_mode_counts.get(mode, 0) + 1
 
-    output_dir = config.output_dir
-    write_jsonl(output_dir / "documents.jsonl", documents)
-    write_jsonl(output_dir / "chunks.jsonl", chunks)
+    pending = [plan.folder for plan in plans if not plan.reuse]
+    # The fingerprint already holds a digest of every source file; the stage cache keys on those.
+    file_digests = {plan.folder: {rel: str(entry[3]) for rel, entry in plan.files.items()} for plan in plans if not plan.reuse}
+    # Opened once for the run; it cleans serial documents and prunes the cache at the end.
+    clean_cache = _clean_cache_for(config)
+    with closing(_iter_processed_documents(pending, config, worker_token_stats, file_digests, clean_cache)) as outcomes:
+        try:
+            for plan in plans:
+                if plan.reuse:
+                    document_row = writer.add_reused(plan.doc_id, snapshot.shards_by_doc[plan.doc_id])
+                    count_source_mode(document_row)
+                    doc_results.append(
+                        {
+                            "doc_id": plan.doc_id,
+                            "source_folder": plan.source_folder,
+                            "source_mode_used": document_row.get("source_mode_used", "unknown"),
+                            "fallback_reason": "incremental reuse",
+                            "warnings": [],
+                            "reused": True,
+                        }
+                    )
+                    reusable_hashes[plan.doc_id] = cache_service.build_entry(
+                        source_folder=plan.source_folder,
+                        folder_hash=plan.folder_hash,
+                        processing_signature=current_signature,
+                        files=plan.files,
+                    )
+                    reused_documents += 1
+                    continue
 
-    source_mode_counts: dict[str, int] = {}
-    for row in documents:
-        mode = row.get("source_mode_used", "unknown")
-        source_mode_counts[mode] = source_mode_counts.get(mode, 0) + 1
+                folder, result, exc = next(outcomes)
+                if exc is not None:
+                    error_row = {"source_folder": str(folder.resolve()), "error": str(exc)}
+                    errors.append(error_row)
+                    print(f"[rag-chunker] Failed to process {folder.name}: {exc}", file=sys.stderr)
+                    if config.fail_fast:
+                        raise exc
+                    continue
+                document_row, chunk_rows, doc_manifest = result
+                for cached_stage in doc_manifest.get("stage_cache_hits", []):
+                    stage_cache_hits[cached_stage] += 1
+                # Hit counts and timings vary between runs, so keep them out of document_results.
+                for key, value in doc_manifest.pop("clean_cache", {}).items():
+                    clean_cache_usage[key] += value
+                timings = doc_manifest.pop("stage_timings", None)
+                if recorder is not None and timings is not None:
+                    recorder.add_document(plan.doc_id, timings)
+                with document_scope(plan.doc_id), stage("write"):
+                    writer.add(document_row, chunk_rows)
+                count_source_mode(document_row)
+                doc_results.append(doc_manifest)
+                reusable_hashes[str(document_row.get("doc_id", plan.doc_id))] = cache_service.build_entry(
+                    source_folder=plan.source_folder,
+                    folder_hash=plan.folder_hash,
+                    processing_signature=current_signature,
+                    files=plan.files,
+                )
+                processed_documents += 1
+        except BaseException:
+            writer.abort()
+            if clean_cache is not None:
+                clean_cache.close()
+            raise
+
+    with stage("finalize"):
+        writer.finalize()
+    output_dir = config.output_dir
+    with stage("columnar"):
+        columnar = _write_columnar(config) if config.columnar_format else None
+    if config.stage_cache and config.incremental:
+        _prune_stage_cache(output_dir / "stage_cache", {plan.doc_id for plan in plans})
+    clean_cache_section = _finish_clean_cache(clean_cache, clean_cache_usage, config)
+    token_cache_usage = _token_cache_usage(token_stats_before, token_cache_stats(), worker_token_stats)
 
     manifest = {
         "input_dir": str(config.input_dir.resolve()),
         "output_dir": str(output_dir.resolve()),
         "processed_at_utc": datetime.now(timezone.utc).isoformat(),
-        "documents": len(documents),
-        "chunks": len(chunks),
+        "documents": writer.documents_written,
+        "chunks": writer.chunks_written,
         "source_modes": source_mode_counts,
+        "tokenizer": tokenizer_identity(),
+        "output_profile": config.output_profile,
         "incremental": {
             "enabled": config.incremental,
             "processed_documents": processed_documents,
             "reused_documents": reused_documents,
+            "rehashed_files": rehashed_files,
+            "stat_matched_files": stat_matched_files,
+            "shard_copied_documents": writer.copied_documents,
+        },
+        # Both vary with --workers: every worker process counts against its own token cache, and
+        # clean-cache hits depend on which documents were cleaned first.
+        "token_count_cache": token_cache_usage,
+        "stage_cache": {
+            "enabled": config.stage_cache and config.incremental,
+            "prepare_hits": stage_cache_hits["prepare"],
+            "segments_hits": stage_cache_hits["segments"],
         },
+        "clean_cache": clean_cache_section,
+        **({"columnar": columnar} if columnar else {}),
+        **({"stage_timings": recorder.summary()} if recorder is not None else {}),
+        **({"cprofile": profiler.write(output_dir)} if profiler is not None else {}),
         "document_results": doc_results,
         "errors": errors,
     }
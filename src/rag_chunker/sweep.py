@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import re
+import sys
+import time
+from dataclasses import dataclass, field, fields, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from .config import EvalConfig, PipelineConfig, SweepConfig
+from .infrastructure.io import discover_document_folders, write_json
+from .pipeline import PROFILE_NAME_RE, _process_document_variants, _sha1, _token_cache_delta, _chunk_row_transform
+from .use_cases.chunking import configure_tokenizer, token_cache_stats, tokenizer_identity
+from .use_cases.services.artifact_evaluation_service import ArtifactEvaluationService
+from .use_cases.services.artifact_writer_service import ArtifactWriterService
+from .use_cases.services.document_shard_store import DocumentShardStore
+from .use_cases.services.global_chunk_dedupe_service import GlobalChunkDedupeService
+
+# Fields every variant must share: documents are loaded and token counts cached
+# once for the whole sweep, and each variant writes to its own output folder.
+SWEEP_FIXED_FIELDS = frozenset({"input_dir", "output_dir", "source_priority", "tokenizer_name", "tokenizer_cache_dir"})
+# Run-level fields the sweep sets itself (one streaming, non-incremental pass with
+# the base fail_fast and no caches, columnar output or instrumentation), so a
+# variant overriding them would be recorded as applied without taking effect.
+SWEEP_IGNORED_FIELDS = frozenset(
+    {
+        "incremental",
+        "fail_fast",
+        "workers",
+        "streaming_output",
+        "hash_scope",
+        "stage_cache",
+        "clean_cache",
+        "clean_cache_max_entries",
+        "columnar_format",
+        "instrument",
+        "instrument_memory",
+        "cprofile",
+        "cprofile_docs",
+    }
+)
+VARIANT_NAME_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+@dataclass
+class _VariantRun:
+    name: str
+    overrides: dict[str, Any]
+    config: PipelineConfig
+    writer: ArtifactWriterService
+    source_modes: dict[str, int] = field(default_factory=dict)
+    document_results: list[dict] = field(default_factory=list)
+    errors: list[dict] = field(default_factory=list)
+    chunking_seconds: float = 0.0
+
+
+def variant_name(overrides: dict[str, Any]) -> str:
+    if not overrides:
+        return "base"
+    parts = [f"{key}-{value}" for key, value in sorted(overrides.items())]
+    return VARIANT_NAME_RE.sub("_", "__".join(parts))
+
+
+def build_variant_configs(config: SweepConfig) -> list[tuple[str, dict[str, Any], PipelineConfig]]:
+    """Resolve ``config.variants`` into named ``PipelineConfig`` objects."""
+    known_fields = {item.name for item in fields(PipelineConfig)}
+    variants = config.variants or [{}]
+    resolved: list[tuple[str, dict[str, Any], PipelineConfig]] = []
+    seen_names: set[str] = set()
+    for variant in variants:
+        overrides = {key: value for key, value in variant.items() if key != "name"}
+        unknown = sorted(set(overrides) - known_fields)
+        if unknown:
+            raise ValueError(f"Unknown PipelineConfig fields in sweep variant: {', '.join(unknown)}")
+        fixed = sorted(set(overrides) & SWEEP_FIXED_FIELDS)
+        if fixed:
+            raise ValueError(f"Sweep variants cannot override: {', '.join(fixed)}")
+        ignored = sorted(set(overrides) & SWEEP_IGNORED_FIELDS)
+        if ignored:
+            raise ValueError(f"Sweep variants cannot override fields the sweep does not apply: {', '.join(ignored)}")
+        name = str(variant.get("name") or variant_name(overrides))
+        # The name becomes a folder under output_dir, so it must not hold path separators or "..".
+        if not PROFILE_NAME_RE.match(name):
+            raise ValueError(f"Invalid sweep variant name: {name!r}")
+        if name in seen_names:
+            raise ValueError(f"Duplicate sweep variant name: {name}")
+        seen_names.add(name)
+        variant_config = replace(
+            config.base,
+            **overrides,
+            output_dir=config.output_dir / name,
+            incremental=False,
+            workers=1,
+        )
+        resolved.append((name, overrides, variant_config))
+    return resolved
+
+
+def run_sweep(config: SweepConfig) -> dict:
+    """Run every variant of ``config`` over the corpus in one pass and compare them.
+
+    Each document is loaded and cleaned once; segmentation is shared between
+    variants that agree on the segment-stage fields, and token counts are
+    shared through the chunking service cache. Every variant gets the usual
+    artifacts and an evaluation report under ``output_dir/<variant>/``, and
+    the comparison is written to ``sweep_report.json`` and ``sweep_report.md``.
+    """
+    variants = build_variant_configs(config)
+    configure_tokenizer(config.base.tokenizer_name, config.base.tokenizer_cache_dir)
+    folders = discover_document_folders(config.base.input_dir)
+    dedupe_service = GlobalChunkDedupeService(sha1_func=_sha1)
+    runs: list[_VariantRun] = []
+    for name, overrides, variant_config in variants:
+        shard_store = DocumentShardStore(root=variant_config.output_dir / "shards", dedupe_key=dedupe_service.dedupe_key)
+        writer = ArtifactWriterService(
+            output_dir=variant_config.output_dir,
+            streaming=True,
+            dedupe_service=dedupe_service if variant_config.dedupe_chunks else None,
+            shard_store=shard_store,
+            row_transform=_chunk_row_transform(variant_config),
+        )
+        runs.append(_VariantRun(name=name, overrides=overrides, config=variant_config, writer=writer))
+    configs = [run.config for run in runs]
+
+    token_stats_before = token_cache_stats()
+    sweep_started = time.perf_counter()
+    shared_seconds = 0.0
+    try:
+        for folder in folders:
+            started = time.perf_counter()
+            try:
+                outcomes = _process_document_variants(folder, configs)
+            except Exception as exc:  # pylint: disable=broad-exception-caught
+                outcomes = [(None, exc, 0.0)] * len(runs)
+            shared_seconds += time.perf_counter() - started - sum(seconds for _, _, seconds in outcomes)
+            for run, (result, exc, seconds) in zip(runs, outcomes):
+                run.chunking_seconds += seconds
+                if exc is not None:
+                    run.errors.append({"source_folder": str(folder.resolve()), "error": str(exc)})
+                    print(f"[rag-chunker] {run.name}: failed to process {folder.name}: {exc}", file=sys.stderr)
+                    if config.base.fail_fast:
+                        raise exc
+                    continue
+                document_row, chunk_rows, doc_manifest = result
+                run.writer.add(document_row, chunk_rows)
+                mode = document_row.get("source_mode_used", "unknown")
+                run.source_modes[mode] = run.source_modes.get(mode, 0) + 1
+                run.document_results.append(doc_manifest)
+    except BaseException:
+        for run in runs:
+            run.writer.abort()
+        raise
+
+    processed_at = datetime.now(timezone.utc).isoformat()
+    comparison: list[dict[str, Any]] = []
+    evaluator = ArtifactEvaluationService()
+    for run in runs:
+        run.writer.finalize()
+        output_dir = run.config.output_dir
+        write_json(
+            output_dir / "run_manifest.json",
+            {
+                "input_dir": str(run.config.input_dir.resolve()),
+                "output_dir": str(output_dir.resolve()),
+                "processed_at_utc": processed_at,
+                "documents": run.writer.documents_written,
+                "chunks": run.writer.chunks_written,
+                "source_modes": run.source_modes,
+                "sweep_variant": {"name": run.name, "overrides": _jsonable(run.overrides)},
+                "document_results": run.document_results,
+                "errors": run.errors,
+            },
+        )
+        report = evaluator.run(
+            EvalConfig(
+                artifacts_dir=output_dir,
+                output_json=output_dir / "eval_report.json",
+                output_md=output_dir / "eval_report.md",
+                target_tokens=run.config.target_tokens,
+                max_tokens=run.config.max_tokens,
+                small_chunk_threshold=config.small_chunk_threshold,
+                moderate_chunk_threshold=config.moderate_chunk_threshold,
+                max_small_chunk_pct=config.max_small_chunk_pct,
+                max_article_mixed_pct=config.max_article_mixed_pct,
+            )
+        )
+        chunk_metrics = report["chunk_metrics"]
+        comparison.append(
+            {
+                "name": run.name,
+                "overrides": _jsonable(run.overrides),
+                "output_dir": str(output_dir.resolve()),
+                "documents": run.writer.documents_written,
+                "chunks": run.writer.chunks_written,
+                "errors": len(run.errors),
+                "overall_score": report["summary"]["overall_score"],
+                "overall_status": report["summary"]["overall_status"],
+                "coverage_ratio": report["summary"]["coverage_ratio"],
+                "token_median": chunk_metrics["token_stats"]["median"],
+                "token_p95": chunk_metrics["token_stats"]["p95"],
+                "small_chunk_pct": chunk_metrics["small_chunks"]["pct"],
+                "oversized_chunks": chunk_metrics["oversized_chunks"]["count"],
+                "quality_gates_passed": report["quality_gates"]["passed"],
+                "chunking_seconds": round(run.chunking_seconds, 4),
+            }
+        )
+
+    token_cache_usage = _token_cache_delta(token_stats_before, token_cache_stats())
+    lookups = token_cache_usage["hits"] + token_cache_usage["misses"]
+    sweep_report = {
+        "input_dir": str(config.base.input_dir.resolve()),
+        "output_dir": str(config.output_dir.resolve()),
+        "processed_at_utc": processed_at,
+        "documents": len(folders),
+        "tokenizer": tokenizer_identity(),
+        "timings": {
+            "shared_prepare_seconds": round(shared_seconds, 4),
+            "total_seconds": round(time.perf_counter() - sweep_started, 4),
+        },
+        "token_count_cache": {
+            **token_cache_usage,
+            "hit_rate": round(token_cache_usage["hits"] / lookups, 4) if lookups else 0.0,
+        },
+        "variants": comparison,
+    }
+    write_json(config.output_dir / "sweep_report.json", sweep_report)
+    (config.output_dir / "sweep_report.md").write_text(render_sweep_markdown(sweep_report), encoding="utf-8")
+    return sweep_report
+
+
+def render_sweep_markdown(report: dict[str, Any]) -> str:
+    lines = ["# Chunking Parameter Sweep", ""]
+    lines.append(f"- Input: `{report['input_dir']}`")
+    lines.append(f"- Documents: {report['documents']}")
+    lines.append(f"- Shared load/clean/segment time: {report['timings']['shared_prepare_seconds']}s")
+    lines.append(f"- Total time: {report['timings']['total_seconds']}s")
+    lines.append("")
+    lines.append(
+        "| Variant | Overrides | Chunks | Score | Status | Median tok | P95 tok | Small % | Oversized | Gates | Chunking s |"
+    )
+    lines.append("|---|---|---:|---:|---|---:|---:|---:|---:|---|---:|")
+    for row in report["variants"]:
+        overrides = ", ".join(f"{key}={value}" for key, value in sorted(row["overrides"].items())) or "-"
+        lines.append(
+            f"| {row['name']} | {overrides} | {row['chunks']} | {row['overall_score']} | {row['overall_status']} "
+            f"| {row['token_median']} | {row['token_p95']} | {row['small_chunk_pct']} | {row['oversized_chunks']} "
+            f"| {'pass' if row['quality_gates_passed'] else 'fail'} | {row['chunking_seconds']} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _jsonable(overrides: dict[str, Any]) -> dict[str, Any]:
+    return {key: str(value) if isinstance(value, Path) else value for key, value in overrides.items()}
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Iterator
+
+from ..infrastructure.io import decode_json, read_jsonl
+from .augment import build_augmented_text
+
+OUTPUT_PROFILES = ("full", "compact")
+# Metadata keys copied from the document row; compact chunk rows omit them and reference ``doc_id`` instead.
+DOCUMENT_METADATA_FIELDS = ("year", "name", "brief_description", "language_hint")
+# Key order of ``metadata`` in full chunk rows.
+CHUNK_METADATA_ORDER = ("year", "name", "brief_description", "section", "article", "subarticle", "heading_path", "language_hint")
+
+
+def compact_chunk_row(row: dict[str, Any]) -> dict[str, Any]:
+    """Drop ``augmented_text`` and document-level metadata from a full chunk row."""
+    compact = {key: value for key, value in row.items() if key != "augmented_text"}
+    metadata = row.get("metadata")
+    if isinstance(metadata, dict):
+        compact["metadata"] = {key: value for key, value in metadata.items() if key not in DOCUMENT_METADATA_FIELDS}
+    return compact
+
+
+def is_compact_row(row: dict[str, Any]) -> bool:
+    return "augmented_text" not in row
+
+
+def expand_chunk_row(
+    row: dict[str, Any],
+    document: dict[str, Any] | None,
+    *,
+    augmented_text: bool = False,
+) -> dict[str, Any]:
+    """Rebuild the full-profile shape of a compact chunk row from its document row.
+
+    Document-level metadata is taken from ``document``; ``augmented_text`` is
+    derived only when requested, since it repeats the whole chunk text; the
+    pipeline augments every row from its own metadata, rows merged from tiny
+    chunks included, so it matches the full profile. Full rows are returned
+    unchanged.
+    """
+    if not is_compact_row(row):
+        return row
+    document = document or {}
+    chunk_metadata = row.get("metadata") or {}
+    merged = {**{key: document.get(key) for key in DOCUMENT_METADATA_FIELDS}, **chunk_metadata}
+    metadata = {key: merged[key] for key in CHUNK_METADATA_ORDER if merged.get(key) is not None}
+    metadata.update((key, value) for key, value in chunk_metadata.items() if key not in metadata)
+
+    expanded: dict[str, Any] = {}
+    for key, value in row.items():
+        expanded[key] = metadata if key == "metadata" else value
+        if key == "text" and augmented_text:
+            expanded["augmented_text"] = build_augmented_text(
+                str(value),
+                name=str(metadata.get("name") or ""),
+                year=metadata.get("year"),
+                brief_description=str(metadata.get("brief_description") or ""),
+                section=metadata.get("section"),
+                article=metadata.get("article"),
+                subarticle=metadata.get("subarticle"),
+            )
+    return expanded
+
+
+def load_documents(artifacts_dir: Path) -> dict[str, dict[str, Any]]:
+    """Document rows of ``documents.jsonl`` keyed by ``doc_id``."""
+    return {str(row.get("doc_id", "")): row for row in read_jsonl(artifacts_dir / "documents.jsonl")}
+
+
+def iter_chunks(
+    artifacts_dir: Path,
+    *,
+    augmented_text: bool = False,
+    documents: dict[str, dict[str, Any]] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Stream ``chunks.jsonl`` rows with document-level metadata filled in.
+
+    Works for both output profiles: compact rows are joined with their
+    ``documents.jsonl`` row by ``doc_id``, full rows pass through as written.
+    """
+    if documents is None:
+        documents = load_documents(artifacts_dir)
+    with (artifacts_dir / "chunks.jsonl").open("rb") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            row = decode_json(line)
+            yield expand_chunk_row(row, documents.get(str(row.get("doc_id", ""))), augmented_text=augmented_text)
+
+
+def load_chunks(artifacts_dir: Path, *, augmented_text: bool = False) -> list[dict[str, Any]]:
+    return list(iter_chunks(artifacts_dir, augmented_text=augmented_text))
@@ -1,17 +1,87 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
 from ..domain.models import CanonicalBlock, Segment
 from .services.chunking_service import ChunkingService
 
 # Backward-compatible module facade. Consumers can keep importing these symbols,
-# while logic is owned by the ChunkingService class.
+# while logic is owned by the ChunkingService class. The tokenizer is loaded on
+# first use, so importing this module does not touch the network.
 _DEFAULT_SERVICE = ChunkingService()
+# Services for tokenizers other than the default one, each with its own token-count cache.
+_TOKENIZER_SERVICES: dict[tuple[str, Path | None], ChunkingService] = {}
+
+
+@contextmanager
+def using_tokenizer(tokenizer_name: str, cache_dir: Path | None = None) -> Iterator[ChunkingService]:
+    """Route the module-level functions through a service for ``tokenizer_name`` inside the block.
+
+    Used to assemble chunks for several tokenizers in one process without
+    clearing the default service's token-count cache on every switch.
+    """
+    global _DEFAULT_SERVICE  # pylint: disable=global-statement
+    previous = _DEFAULT_SERVICE
+    if (previous.tokenizer_name, previous.tokenizer_cache_dir) != (tokenizer_name, cache_dir):
+        key = (tokenizer_name, cache_dir)
+        if key not in _TOKENIZER_SERVICES:
+            _TOKENIZER_SERVICES[key] = ChunkingService(tokenizer_name=tokenizer_name, tokenizer_cache_dir=cache_dir)
+        _DEFAULT_SERVICE = _TOKENIZER_SERVICES[key]
+    try:
+        yield _DEFAULT_SERVICE
+    finally:
+        _DEFAULT_SERVICE = previous
+
+
+def configure_tokenizer(tokenizer_name: str, cache_dir: Path | None = None) -> None:
+    _DEFAULT_SERVICE.set_tokenizer(tokenizer_name, cache_dir=cache_dir)
+
+
+def tokenizer_identity() -> str:
+    return _DEFAULT_SERVICE.tokenizer_identity
 
 
 def count_tokens(text: str) -> int:
     return _DEFAULT_SERVICE.count_tokens(text)
 
 
+def count_tokens_many(texts: list[str]) -> list[int]:
+    return _DEFAULT_SERVICE.count_tokens_many(texts)
+
+
+def encode_many(texts: list[str]) -> list[list[int]]:
+    return _DEFAULT_SERVICE.encode_many(texts)
+
+
+def joined_token_bounds(left_tokens: int, right_tokens: int, separator: str = "\n\n") -> tuple[int, int]:
+    return _DEFAULT_SERVICE.joined_token_bounds(left_tokens, right_tokens, separator)
+
+
+def fits_joined(
+    left: str,
+    right: str,
+    max_tokens: int,
+    *,
+    separator: str = "\n\n",
+    left_tokens: int | None = None,
+    right_tokens: int | None = None,
+) -> bool:
+    return _DEFAULT_SERVICE.fits_joined(
+        left,
+        right,
+        max_tokens,
+        separator=separator,
+        left_tokens=left_tokens,
+        right_tokens=right_tokens,
+    )
+
+
+def token_cache_stats() -> dict[str, int]:
+    return _DEFAULT_SERVICE.token_cache_stats()
+
+
 def build_segments(blocks: list[CanonicalBlock]) -> list[Segment]:
     return _DEFAULT_SERVICE.build_segments(blocks)
 
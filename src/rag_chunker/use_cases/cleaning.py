@@ -20,12 +20,42 @@ BOOKMARK_INLINE_RE = re.compile(
     r"(?i)\s*errore\.\s*il\s+(?:segnalibro|segnalbro)\s+non\s+.*?definit[oa]\.?\s*"
 )
 SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+FRAC_CMD_RE = re.compile(r"\\(?:d|t)?frac\s*")
+# Applied after ``\\left``/``\\right`` are removed. Every command starts with a
+# backslash and none is a prefix of another, so matches cannot overlap and one
+# alternation pass equals the former chain of ``str.replace`` calls.
+LATEX_SYMBOLS = {
+    "\\times": "×",
+    "\\cdot": "·",
+    "\\succ": ">",
+    "\\prec": "<",
+    "\\geq": "≥",
+    "\\leq": "≤",
+    "\\bullet": "•",
+    "\\neq": "≠",
+    "\\approx": "≈",
+}
+LATEX_SYMBOL_RE = re.compile("|".join(re.escape(cmd) for cmd in LATEX_SYMBOLS))
+LATEX_ESCAPE_RE = re.compile(r"\\([%()\[\]])")
+LATEX_COMMAND_RE = re.compile(r"\\[a-z]+\b")
+ORDINAL_YEAR_RE = re.compile(r"([0-9]{1,2}(?:st|nd|rd|th))(20[0-9]{2})")
+WHITESPACE_RE = re.compile(r"\s+")
+# Lines reaching the noise check are already stripped and whitespace-collapsed,
+# so IMAGE_LINE_RE and NOISE_PATTERNS reduce to one anchored alternation.
+NOISE_LINE_RE = re.compile(
+    r"!\[[^\]]*]\([^)]*\)$"
+    r"|(?i:errore\.\s*il segnalibro non)"
+    r"|(?i:error\.\s*bookmark not defined)"
+    r"|[#=\-*_]{4,}$"
+)
+# ``[^\W_]`` matches exactly the characters for which ``str.isalnum()`` is true.
+ALNUM_RE = re.compile(r"[^\W_]")
 
 
 def _clean_cell(cell: str) -> str:
     cell = html.unescape(cell)
     cell = TAG_RE.sub(" ", cell)
-    cell = re.sub(r"\s+", " ", cell)
+    cell = WHITESPACE_RE.sub(" ", cell)
     return cell.strip()
 
 
@@ -63,11 +93,10 @@ def _extract_braced(text: str, start: int) -> tuple[str | None, int]:
 
 
 def _replace_frac_commands(text: str) -> str:
-    frac_cmd_re = re.compile(r"\\(?:d|t)?frac\s*")
     out: list[str] = []
     idx = 0
     while idx < len(text):
-        match = frac_cmd_re.search(text, idx)
+        match = FRAC_CMD_RE.search(text, idx)
         if not match:
             out.append(text[idx:])
             break
@@ -93,53 +122,42 @@ def _replace_frac_commands(text: str) -> str:
     return "".join(out)
 
 
+def _inline_math_replacer(match: re.Match[str]) -> str:
+    inner = match.group(1)
+    inner = inner.replace("\\%", "%")
+    inner = inner.replace("\\", "")
+    return inner.strip()
+
+
 def normalize_inline_math(text: str) -> str:
-    while True:
+    if "\\" not in text:
+        return INLINE_MATH_RE.sub(_inline_math_replacer, text) if "$" in text else text
+    while FRAC_CMD_RE.search(text):
         updated = _replace_frac_commands(text)
         if updated == text:
             break
         text = updated
+    # Kept as two passes: deleting one command can join the text around it into the other.
     text = text.replace("\\left", "").replace("\\right", "")
-    text = text.replace("\\times", "×")
-    text = text.replace("\\cdot", "·")
-    # Add LaTeX command mappings
-    latex_mappings = {
-        "\\succ": ">",
-        "\\prec": "<",
-        "\\geq": "≥",
-        "\\leq": "≤",
-        "\\bullet": "•",
-        "\\neq": "≠",
-        "\\approx": "≈",
-    }
-    for cmd, sym in latex_mappings.items():
-        text = text.replace(cmd, sym)
-
-    def replacer(match: re.Match[str]) -> str:
-        inner = match.group(1)
-        inner = inner.replace("\\%", "%")
-        inner = inner.replace("\\", "")
-        return inner.strip()
-
-    text = INLINE_MATH_RE.sub(replacer, text)
-    text = PAREN_MATH_RE.sub(lambda m: m.group(1), text)
-    text = BRACKET_MATH_RE.sub(lambda m: m.group(1), text)
-    text = text.replace("\\%", "%")
-    text = text.replace(r"\(", "(").replace(r"\)", ")")
-    text = text.replace(r"\[", "[").replace(r"\]", "]")
+    text = LATEX_SYMBOL_RE.sub(lambda m: LATEX_SYMBOLS[m.group(0)], text)
+    if "$" in text:
+        text = INLINE_MATH_RE.sub(_inline_math_replacer, text)
+    if "\\(" in text:
+        text = PAREN_MATH_RE.sub(lambda m: m.group(1), text)
+    if "\\[" in text:
+        text = BRACKET_MATH_RE.sub(lambda m: m.group(1), text)
+    text = LATEX_ESCAPE_RE.sub(r"\1", text)
     # Catch-all for unknown LaTeX commands
-    text = re.sub(r"\\[a-z]+\b", "", text)
-    return text
+    return LATEX_COMMAND_RE.sub("", text)
 
 
 def _is_noise_line(line: str) -> bool:
+    """Check a stripped, whitespace-collapsed line against every noise rule at once."""
     if not line:
         return False
-    if IMAGE_LINE_RE.match(line):
+    if len(line) >= 4 and ALNUM_RE.search(line) is None:
         return True
-    if all(not ch.isalnum() for ch in line) and len(line) >= 4:
-        return True
-    return any(pattern.match(line) for pattern in NOISE_PATTERNS)
+    return NOISE_LINE_RE.match(line) is not None
 
 
 def _dedupe_consecutive_sentences(text: str) -> str:
@@ -152,7 +170,7 @@ def _dedupe_consecutive_sentences(text: str) -> str:
         candidate = part.strip()
         if not candidate:
             continue
-        norm = re.sub(r"\s+", " ", candidate).strip().lower()
+        norm = " ".join(candidate.split()).lower()
         # Remove repeated full sentences, but keep short labels/captions.
         if norm in seen_norms and len(norm) >= 24:
             continue
@@ -163,22 +181,32 @@ def _dedupe_consecutive_sentences(text: str) -> str:
 
 
 def clean_text(text: str) -> str:
+    """Clean one block of MinerU markdown.
+
+    Every stage is skipped when the characters it needs are absent, and lines
+    are normalized once, so most blocks take a handful of C-level scans.
+    """
     if not text:
         return ""
 
     text = html.unescape(text)
-    text = BOOKMARK_INLINE_RE.sub(" ", text)
-    text = TABLE_RE.sub(lambda m: "\n" + flatten_html_table(m.group(0)) + "\n", text)
+    lowered = text.lower()
+    if "errore" in lowered:
+        text = BOOKMARK_INLINE_RE.sub(" ", text)
+    if "<table" in lowered:
+        text = TABLE_RE.sub(lambda m: "\n" + flatten_html_table(m.group(0)) + "\n", text)
     text = normalize_inline_math(text)
-    text = TAG_RE.sub(" ", text)
+    if "<" in text:
+        text = TAG_RE.sub(" ", text)
     text = text.replace("\u00a0", " ")
     text = text.replace("\r", "")
-    text = re.sub(r"([0-9]{1,2}(?:st|nd|rd|th))(20[0-9]{2})", r"\1 \2", text)
+    text = ORDINAL_YEAR_RE.sub(r"\1 \2", text)
 
     cleaned_lines: list[str] = []
     seen_long_non_table_lines: set[str] = set()
     for raw_line in text.splitlines():
-        line = re.sub(r"\s+", " ", raw_line).strip()
+        # Same result as collapsing ``\s+`` runs and stripping: both use str.isspace().
+        line = " ".join(raw_line.split())
         if not line:
             if cleaned_lines and cleaned_lines[-1] != "":
                 cleaned_lines.append("")
@@ -188,14 +216,14 @@ def clean_text(text: str) -> str:
         if cleaned_lines and cleaned_lines[-1] == line:
             continue
         if "|" not in line and not line.startswith("#") and len(line) >= 48:
-            normalized_line = re.sub(r"\s+", " ", line).strip().lower()
+            normalized_line = line.lower()
             if normalized_line in seen_long_non_table_lines:
                 continue
             seen_long_non_table_lines.add(normalized_line)
         cleaned_lines.append(line)
 
+    # Lines are collapsed and blank runs are already folded to one empty line,
+    # so the joined text has no triple newlines or repeated spaces to squeeze.
     cleaned = "\n".join(cleaned_lines)
-    cleaned = re.sub(r"\n{3,}", "\n\n", cleaned)
-    cleaned = re.sub(r"[ \t]{2,}", " ", cleaned)
     cleaned = _dedupe_consecutive_sentences(cleaned)
     return cleaned.strip()
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+# Candidate overlaps are located with str.find on this many leading characters of
+# the right-hand text; after this many failed verifications the scan switches to KMP.
+_ANCHOR_CHARS = 8
+_MAX_ANCHOR_VERIFICATIONS = 8
+
+
+def max_suffix_prefix_overlap(left: str, right: str, scan_chars: int) -> int:
+    """Length of the longest suffix of ``left`` that is also a prefix of ``right``.
+
+    Only the last/first ``scan_chars`` characters of each text are considered.
+    Candidates are found with ``str.find`` on a short anchor, which settles
+    ordinary prose in C-level scans; repetitive text that produces many false
+    anchor hits falls back to a Knuth-Morris-Pratt pass, so the worst case
+    stays linear in ``scan_chars``.
+    """
+    left_tail = left[-scan_chars:]
+    right_head = right[:scan_chars]
+    max_len = min(len(left_tail), len(right_head))
+    if max_len == 0:
+        return 0
+    left_tail = left_tail[-max_len:]
+
+    anchor_len = min(_ANCHOR_CHARS, max_len)
+    anchor = right_head[:anchor_len]
+    position = left_tail.find(anchor)
+    verifications = 0
+    # Earlier positions mean longer overlaps, so the first verified hit is the answer.
+    while position != -1:
+        overlap = max_len - position
+        if left_tail[position:] == right_head[:overlap]:
+            return overlap
+        verifications += 1
+        if verifications >= _MAX_ANCHOR_VERIFICATIONS:
+            return _kmp_suffix_prefix_overlap(left_tail, right_head)
+        position = left_tail.find(anchor, position + 1)
+
+    for overlap in range(anchor_len - 1, 0, -1):
+        if left_tail[-overlap:] == right_head[:overlap]:
+            return overlap
+    return 0
+
+
+def _kmp_suffix_prefix_overlap(text: str, pattern: str) -> int:
+    """Longest prefix of ``pattern`` that ends ``text``, via the KMP failure function."""
+    pattern_len = len(pattern)
+    failure = [0] * pattern_len
+    matched = 0
+    for idx in range(1, pattern_len):
+        char = pattern[idx]
+        while matched and pattern[matched] != char:
+            matched = failure[matched - 1]
+        if pattern[matched] == char:
+            matched += 1
+        failure[idx] = matched
+
+    matched = 0
+    for char in text:
+        while matched and (matched == pattern_len or pattern[matched] != char):
+            matched = failure[matched - 1]
+        if pattern[matched] == char:
+            matched += 1
+    return matched
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from typing import Any
+
+from ..config.perf_gate_config import PerfGateConfig
+from .services.perf_gate_service import PerfGateService
+
+_DEFAULT_SERVICE = PerfGateService()
+
+
+def run_perf_gate(config: PerfGateConfig) -> dict:
+    return _DEFAULT_SERVICE.run(config)
+
+
+def compare_perf_results(results: dict[str, Any], baseline: dict[str, Any], config: PerfGateConfig) -> dict:
+    return _DEFAULT_SERVICE.compare(results, baseline, config)
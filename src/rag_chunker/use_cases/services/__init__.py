@@ -1,18 +1,23 @@
 """Pipeline service layer for single-responsibility components."""
 
 from .artifact_evaluation_service import ArtifactEvaluationService
+from .artifact_writer_service import ArtifactWriterService
 from .chunking_service import ChunkingService
 from .deepeval_gate_service import DeepEvalGateService
 from .global_chunk_dedupe_service import GlobalChunkDedupeService
-from .incremental_cache_service import IncrementalCacheService, IncrementalCacheSnapshot
+from .incremental_cache_service import FolderFingerprint, IncrementalCacheService, IncrementalCacheSnapshot
+from .perf_gate_service import PerfGateService
 from .tiny_chunk_sweep_service import TinyChunkSweepService
 
 __all__ = [
     "ArtifactEvaluationService",
+    "ArtifactWriterService",
     "ChunkingService",
     "DeepEvalGateService",
+    "FolderFingerprint",
     "GlobalChunkDedupeService",
     "IncrementalCacheService",
     "IncrementalCacheSnapshot",
+    "PerfGateService",
     "TinyChunkSweepService",
 ]
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import re
 import statistics
 from collections import Counter
@@ -8,6 +7,8 @@ from pathlib import Path
 from typing import Any
 
 from ...config.eval_config import EvalConfig
+from ...infrastructure.io import read_json, read_jsonl, write_json
+from ..chunk_reader import iter_chunks
 
 ARTICLE_RE = re.compile(r"(?im)^\s*(?:#\s*)?(?:ART\.?|ARTICLE|ARTICOLO)\s*[-.:]?\s*(\d+(?:\.\d+)*)\b")
 HTML_LEFTOVER_RE = re.compile(r"<\/?(?:table|tr|td|th)\b", re.IGNORECASE)
@@ -20,13 +21,13 @@ class ArtifactEvaluationService:
     """Computes artifact quality metrics and renders the scorecard report."""
 
     def evaluate_artifacts(self, config: EvalConfig) -> dict[str, Any]:
-        chunks_path = config.artifacts_dir / "chunks.jsonl"
         documents_path = config.artifacts_dir / "documents.jsonl"
         manifest_path = config.artifacts_dir / "run_manifest.json"
 
-        chunks = self._load_jsonl(chunks_path)
-        documents = self._load_jsonl(documents_path)
-        manifest = json.loads(manifest_path.read_text(encoding="utf-8")) if manifest_path.exists() else {}
+        documents = read_jsonl(documents_path)
+        # Compact rows get their document-level metadata back from documents.jsonl.
+        chunks = list(iter_chunks(config.artifacts_dir, documents={str(doc.get("doc_id", "")): doc for doc in documents}))
+        manifest = read_json(manifest_path) if manifest_path.exists() else {}
 
         total_chunks = len(chunks)
         total_docs = len(documents)
@@ -36,7 +37,9 @@ class ArtifactEvaluationService:
         coverage_ratios = []
         for doc in documents:
             doc_id = doc.get("doc_id")
-            source_path = Path(doc.get("source_md_path"))
+            if not doc.get("source_md_path"):
+                continue
+            source_path = Path(doc["source_md_path"])
             if not source_path.exists():
                 continue
             source_text = source_path.read_text(encoding="utf-8")
@@ -441,24 +444,11 @@ class ArtifactEvaluationService:
             "checks": checks,
         }
 
-        config.output_json.parent.mkdir(parents=True, exist_ok=True)
         config.output_md.parent.mkdir(parents=True, exist_ok=True)
-        config.output_json.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        write_json(config.output_json, report)
         config.output_md.write_text(self.render_markdown_report(report), encoding="utf-8")
         return report
 
-    @staticmethod
-    def _load_jsonl(path: Path) -> list[dict[str, Any]]:
-        rows: list[dict[str, Any]] = []
-        if not path.exists():
-            return rows
-        with path.open("r", encoding="utf-8") as handle:
-            for line in handle:
-                line = line.strip()
-                if line:
-                    rows.append(json.loads(line))
-        return rows
-
     @staticmethod
     def _pct(part: int, total: int) -> float:
         if total <= 0:
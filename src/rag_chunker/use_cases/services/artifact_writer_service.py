@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Any, Callable
+
+from ...infrastructure.io import decode_json, encode_json_line
+from .document_shard_store import DocumentShardStore
+from .global_chunk_dedupe_service import GlobalChunkDedupeService
+
+
+class ArtifactWriterService:
+    """Writes ``documents.jsonl``, ``chunks.jsonl`` and per-document shards for a run.
+
+    Documents are emitted in the order they are added: each one is deduped
+    against the keys seen so far, which gives the same result as one global
+    dedupe pass over the whole corpus. In buffered mode documents are held
+    until :meth:`finalize`; in streaming mode they are appended to temporary
+    files right away. Either way :meth:`finalize` moves the files into place
+    atomically, and both modes produce byte-identical artifacts.
+    ``row_transform`` rewrites each chunk row before it is sharded, e.g. into
+    the compact output profile.
+    """
+
+    def __init__(
+        self,
+        *,
+        output_dir: Path,
+        streaming: bool,
+        dedupe_service: GlobalChunkDedupeService | None,
+        shard_store: DocumentShardStore,
+        row_transform: Callable[[dict[str, Any]], dict[str, Any]] | None = None,
+    ) -> None:
+        self.output_dir = output_dir
+        self.streaming = streaming
+        self._dedupe_service = dedupe_service
+        self._shard_store = shard_store
+        self._row_transform = row_transform
+        self._seen_keys: set[str] = set()
+        self._pending: list[tuple[dict[str, Any], dict[str, Any], list[bytes] | None]] = []
+        self._shard_entries: dict[str, dict[str, Any]] = {}
+        self._handles: dict[str, Any] = {}
+        self.documents_written = 0
+        self.chunks_written = 0
+        self.copied_documents = 0
+
+    def add(self, document_row: dict[str, Any], chunk_rows: list[dict[str, Any]]) -> None:
+        """Add a freshly processed document."""
+        if self._row_transform is not None:
+            chunk_rows = [self._row_transform(row) for row in chunk_rows]
+        entry, lines = self._shard_store.write_shard(document_row, chunk_rows)
+        self._shard_entries[str(document_row.get("doc_id", ""))] = entry
+        self._submit(document_row, entry, lines)
+
+    def add_reused(self, doc_id: str, entry: dict[str, Any]) -> dict[str, Any]:
+        """Add a document from its shard without decoding its chunk rows.
+
+        Returns the document row that will be written.
+        """
+        self._shard_entries[doc_id] = entry
+        document_row = dict(entry["document"])
+        if isinstance(document_row.get("stats"), dict):
+            document_row["stats"] = dict(document_row["stats"])
+        self._submit(document_row, entry, None)
+        return document_row
+
+    def finalize(self) -> None:
+        self._open()
+        for document_row, entry, lines in self._pending:
+            self._emit(document_row, entry, lines)
+        self._pending.clear()
+        for name, handle in self._handles.items():
+            handle.close()
+            os.replace(self._temp_path(name), self.output_dir / name)
+        self._handles.clear()
+        self._shard_store.write_index(self._shard_entries)
+
+    def abort(self) -> None:
+        """Discard partially written output, leaving prior artifacts untouched."""
+        for name, handle in self._handles.items():
+            handle.close()
+            self._temp_path(name).unlink(missing_ok=True)
+        self._handles.clear()
+        self._pending.clear()
+
+    def _submit(self, document_row: dict[str, Any], entry: dict[str, Any], lines: list[bytes] | None) -> None:
+        if not self.streaming:
+            self._pending.append((document_row, entry, lines))
+            return
+        self._open()
+        self._emit(document_row, entry, lines)
+
+    def _open(self) -> None:
+        if self._handles:
+            return
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for name in ("documents.jsonl", "chunks.jsonl"):
+            self._handles[name] = self._temp_path(name).open("wb")
+
+    def _emit(self, document_row: dict[str, Any], entry: dict[str, Any], lines: list[bytes] | None) -> None:
+        """Write one document; ``lines`` is ``None`` when rows come from the shard file."""
+        keys: list[str] = entry["keys"]
+        if self._dedupe_service is None:
+            kept = range(len(keys))
+        else:
+            kept = []
+            for idx, key in enumerate(keys):
+                if key not in self._seen_keys:
+                    self._seen_keys.add(key)
+                    kept.append(idx)
+
+        chunks_handle = self._handles["chunks.jsonl"]
+        if lines is not None:
+            kept_lines = [lines[idx] for idx in kept]
+            chunks_handle.write(b"".join(kept_lines))
+        elif len(kept) == len(keys):
+            self._shard_store.copy_to(entry, chunks_handle)
+            self.copied_documents += 1
+        else:
+            kept_lines = self._shard_store.read_lines(entry, kept)
+            chunks_handle.write(b"".join(kept_lines))
+        self.chunks_written += len(kept)
+
+        if self._dedupe_service is not None:
+            if len(kept) == len(keys):
+                stats = document_row.get("stats")
+                if not isinstance(stats, dict):
+                    stats = {}
+                    document_row["stats"] = stats
+                stats.update(entry["stats"])
+            else:
+                # Only documents that lost rows to dedupe need their kept rows decoded.
+                kept_rows = [decode_json(line) for line in kept_lines]
+                self._dedupe_service.refresh_document_stats(kept_rows, [document_row])
+        self._handles["documents.jsonl"].write(encode_json_line(document_row))
+        self.documents_written += 1
+
+    def _temp_path(self, name: str) -> Path:
+        return self.output_dir / f".{name}.partial"
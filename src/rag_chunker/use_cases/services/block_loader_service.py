@@ -3,10 +3,10 @@ from __future__ import annotations
 import hashlib
 import re
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
-from ...infrastructure.io import read_json, read_text
-from ...domain.models import CanonicalBlock, PageRef
+from ...infrastructure.io import iter_json_object, read_json, read_text
+from ...domain.models import CanonicalBlock, PageRef, page_ref_for_page
 
 UUID_SUFFIX_RE = re.compile(r"-[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.IGNORECASE)
 HEADING_RE = re.compile(r"^\s*(#{1,6})\s+(.*)$")
@@ -26,55 +26,61 @@ def _normalized_folder_title(folder_name: str) -> str:
     return re.sub(r"\s+", " ", text)
 
 
-def _load_blocks_from_block_list(path: Path) -> list[CanonicalBlock]:
-    payload = read_json(path)
-    if not isinstance(payload, dict):
-        return []
-    pages = payload.get("pdfData", [])
-    if not isinstance(pages, list):
-        return []
-
-    raw_blocks: list[CanonicalBlock] = []
-    block_position_to_idx: dict[str, int] = {}
-    block_positions: list[str | None] = []
-    for page in pages:
-        if not isinstance(page, list):
+def _block_from_item(item: Any) -> CanonicalBlock | None:
+    if not isinstance(item, dict):
+        return None
+    if item.get("is_discarded") is True:
+        return None
+    block_type = str(item.get("type", "")).strip()
+    if block_type not in BLOCK_ALLOWED_TYPES:
+        return None
+
+    if block_type == "table_body":
+        text = str(item.get("table_body") or item.get("text") or "")
+    else:
+        text = str(item.get("text") or item.get("content") or "")
+    page_idx = item.get("page_idx")
+    page_ref: list[PageRef] = []
+    if isinstance(page_idx, int):
+        page_ref = [PageRef(page_idx=page_idx, block_id=item.get("id"), block_position=item.get("block_position"))]
+    heading_level = item.get("level") if block_type == "title" else None
+    if not isinstance(heading_level, int):
+        heading_level = None
+    return CanonicalBlock(
+        text=text,
+        block_type=block_type,
+        page_refs=page_ref,
+        heading_level=heading_level,
+        source_hint=item.get("block_position"),
+    )
+
+
+def iter_block_list_blocks(path: Path, members: dict[str, Any] | None = None) -> Iterator[CanonicalBlock]:
+    """Yield the kept blocks of ``block_list.json`` page by page, before merges are applied.
+
+    Only one ``pdfData`` page is decoded at a time, so the raw MinerU dicts of a
+    large document never coexist in memory. Other top-level members (such as
+    ``mergeConnections``) are stored into ``members`` when given.
+    """
+    for key, value in iter_json_object(path, "pdfData"):
+        if key != "pdfData":
+            if members is not None:
+                members[key] = value
             continue
-        for item in page:
-            if not isinstance(item, dict):
-                continue
-            if item.get("is_discarded") is True:
-                continue
-            block_type = str(item.get("type", "")).strip()
-            if block_type not in BLOCK_ALLOWED_TYPES:
-                continue
+        if not isinstance(value, list):
+            continue
+        for item in value:
+            block = _block_from_item(item)
+            if block is not None:
+                yield block
 
-            if block_type == "table_body":
-                text = str(item.get("table_body") or item.get("text") or "")
-            else:
-                text = str(item.get("text") or item.get("content") or "")
-            page_idx = item.get("page_idx")
-            page_ref = []
-            if isinstance(page_idx, int):
-                page_ref.append(PageRef(page_idx=page_idx, block_id=item.get("id"), block_position=item.get("block_position")))
-            heading_level = item.get("level") if block_type == "title" else None
-            if not isinstance(heading_level, int):
-                heading_level = None
-            raw_blocks.append(
-                CanonicalBlock(
-                    text=text,
-                    block_type=block_type,
-                    page_refs=page_ref,
-                    heading_level=heading_level,
-                    source_hint=item.get("block_position"),
-                )
-            )
-            block_position = item.get("block_position")
-            block_positions.append(block_position if isinstance(block_position, str) else None)
-            if isinstance(block_position, str):
-                block_position_to_idx[block_position] = len(raw_blocks) - 1
 
-    merge_connections = payload.get("mergeConnections") or []
+def _apply_merge_connections(raw_blocks: list[CanonicalBlock], merge_connections: Any) -> list[CanonicalBlock]:
+    block_position_to_idx: dict[str, int] = {}
+    for idx, block in enumerate(raw_blocks):
+        if isinstance(block.source_hint, str):
+            block_position_to_idx[block.source_hint] = idx
+
     replacements: dict[int, CanonicalBlock] = {}
     skip: set[int] = set()
     if isinstance(merge_connections, list):
@@ -119,6 +125,14 @@ def _load_blocks_from_block_list(path: Path) -> list[CanonicalBlock]:
     return merged_blocks
 
 
+def _load_blocks_from_block_list(path: Path) -> list[CanonicalBlock]:
+    # Merge connections may span pages and may follow pdfData in the file, so
+    # they are applied once every kept block (small by comparison) is known.
+    members: dict[str, Any] = {}
+    raw_blocks = list(iter_block_list_blocks(path, members))
+    return _apply_merge_connections(raw_blocks, members.get("mergeConnections") or [])
+
+
 def _load_blocks_from_content_list(path: Path) -> list[CanonicalBlock]:
     payload = read_json(path)
     if not isinstance(payload, list):
@@ -132,7 +146,7 @@ def _load_blocks_from_content_list(path: Path) -> list[CanonicalBlock]:
             continue
 
         page_idx = item.get("page_idx")
-        page_refs = [PageRef(page_idx=page_idx)] if isinstance(page_idx, int) else []
+        page_refs = [page_ref_for_page(page_idx)] if isinstance(page_idx, int) else []
         if block_type == "table":
             table_text = str(item.get("table_body") or "")
             if item.get("table_caption"):
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from ...use_cases.chunking import count_tokens, split_text_by_tokens
+from ...use_cases.chunking import count_tokens, fits_joined, joined_token_bounds, split_text_by_tokens
 
 
 def _is_table_chunk_text(text: str) -> bool:
@@ -112,10 +112,17 @@ def _merge_tiny_chunk_texts(chunk_texts: list[str], *, min_tokens: int, max_toke
     if len(working) <= 1:
         return working
 
+    # Known lower bounds for merged candidates; exact counts are taken lazily.
+    floors: dict[int, int] = {}
     out: list[str] = []
     idx = 0
     while idx < len(working):
         chunk = working[idx]
+        floor = floors.pop(idx, None)
+        if floor is not None and floor >= min_tokens:
+            out.append(chunk)
+            idx += 1
+            continue
         tokens = count_tokens(chunk)
         if tokens >= min_tokens:
             out.append(chunk)
@@ -126,18 +133,18 @@ def _merge_tiny_chunk_texts(chunk_texts: list[str], *, min_tokens: int, max_toke
         if idx + 1 < len(working):
             nxt = working[idx + 1]
             if _is_table_chunk_text(chunk) == _is_table_chunk_text(nxt):
-                forward_candidate = chunk.rstrip() + "\n\n" + nxt.lstrip()
-                if count_tokens(forward_candidate) <= max_tokens:
-                    working[idx + 1] = forward_candidate
+                nxt_tokens = count_tokens(nxt)
+                if fits_joined(chunk, nxt, max_tokens, left_tokens=tokens, right_tokens=nxt_tokens):
+                    working[idx + 1] = chunk + "\n\n" + nxt
+                    floors[idx + 1] = joined_token_bounds(tokens, nxt_tokens)[0]
                     merged = True
         if merged:
             idx += 1
             continue
 
         if out and _is_table_chunk_text(out[-1]) == _is_table_chunk_text(chunk):
-            backward_candidate = out[-1].rstrip() + "\n\n" + chunk.lstrip()
-            if count_tokens(backward_candidate) <= max_tokens:
-                out[-1] = backward_candidate
+            if fits_joined(out[-1], chunk, max_tokens, right_tokens=tokens):
+                out[-1] = out[-1] + "\n\n" + chunk
                 idx += 1
                 continue
 
@@ -1,52 +1,264 @@
 from __future__ import annotations
 
+import hashlib
 import re
 import warnings
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
 
 from ...domain.models import CanonicalBlock, PageRef, Segment
+from ...infrastructure.tokenizer_loader import DEFAULT_TOKENIZER_NAME
+from ...infrastructure.tokenizer_registry import (
+    DEFAULT_TOKENIZER_REGISTRY,
+    REGEX_TOKENIZER_SPEC,
+    TokenizerRegistry,
+    identify_tokenizer,
+)
 from ..metadata import update_structure_state
+from ..overlap import max_suffix_prefix_overlap
 
 TOKEN_RE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
 SENTENCE_END_RE = re.compile(r"[.!?;:][\"')\]]*$")
 SENTENCE_BREAK_RE = re.compile(r"[.!?;:]\s+")
 OVERLAP_SCAN_CHARS = 320
 MAX_CONSECUTIVE_OVERLAP_CHARS = 30
+SENTENCE_PROBE_TAIL_CHARS = 32
+TOKEN_COUNT_CACHE_SIZE = 65536
+# Tokens that may re-merge or split where two texts meet; bounds wider than this trigger an exact count.
+JOIN_TOKEN_MARGIN = 4
 
 
 class ChunkingService:
     """Token-aware segmentation and chunk splitting service."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        token_cache_size: int = TOKEN_COUNT_CACHE_SIZE,
+        *,
+        tokenizer_name: str = DEFAULT_TOKENIZER_NAME,
+        tokenizer_cache_dir: Path | None = None,
+        tokenizer_registry: TokenizerRegistry | None = None,
+    ) -> None:
         self._fallback_token_safety_factor = 1.2
-        self._tokenizer = self._load_tokenizer()
-        if self._tokenizer is None:  # pragma: no cover
-            warnings.warn(
-                "tiktoken is not installed; using conservative regex token fallback. Install dependencies for exact token budgets.",
-                RuntimeWarning,
-            )
-
-    @staticmethod
-    def _load_tokenizer():
-        try:  # pragma: no cover
-            from tokenizers import Tokenizer
-
-            return Tokenizer.from_pretrained("Cohere/Cohere-embed-multilingual-v3.0")
-        except Exception:  # pragma: no cover
-            try:  # pragma: no cover
-                import tiktoken
-
-                return tiktoken.get_encoding("cl100k_base")
-            except Exception:  # pragma: no cover
-                return None
+        self._token_cache: OrderedDict[bytes, int] = OrderedDict()
+        self._token_cache_size = max(0, int(token_cache_size))
+        self._token_cache_hits = 0
+        self._token_cache_misses = 0
+        self._separator_token_counts: dict[str, int] = {}
+        self._special_token_overhead: int | None = None
+        self.tokenizer_name = tokenizer_name
+        self.tokenizer_cache_dir = tokenizer_cache_dir
+        self._tokenizer_registry = tokenizer_registry or DEFAULT_TOKENIZER_REGISTRY
+        self._loaded_tokenizer: Any | None = None
+        self._loaded_identity: str | None = None
+        self._load_error: str | None = None
+        self._tokenizer_loaded = False
+
+    @property
+    def _tokenizer(self) -> Any | None:
+        """The backing tokenizer, loaded on first use; ``None`` selects the regex estimator."""
+        if not self._tokenizer_loaded:
+            self._loaded_tokenizer = self._load_tokenizer()
+            self._tokenizer_loaded = True
+            # Only a tokenizer that failed to load warrants a warning; "regex" selects the estimator on purpose.
+            if self._loaded_tokenizer is None and self.tokenizer_name != REGEX_TOKENIZER_SPEC:
+                warnings.warn(
+                    f"Tokenizer {self.tokenizer_name!r} could not be loaded ({self._load_error}); using "
+                    "conservative regex token fallback. Install dependencies for exact token budgets.",
+                    RuntimeWarning,
+                )
+        return self._loaded_tokenizer
+
+    def _load_tokenizer(self):
+        loaded = self._tokenizer_registry.resolve(self.tokenizer_name, self.tokenizer_cache_dir)
+        self._loaded_identity = loaded.identity
+        self._load_error = loaded.error
+        return loaded.backend
+
+    @property
+    def tokenizer_identity(self) -> str:
+        """Identity of the active tokenizer, e.g. ``hf:<name>#<vocab digest>``, ``tiktoken:cl100k_base`` or ``regex``."""
+        tokenizer = self._tokenizer
+        if self._loaded_identity is None:
+            self._loaded_identity = identify_tokenizer(tokenizer, self.tokenizer_name)
+        return self._loaded_identity
+
+    def set_tokenizer(self, tokenizer_name: str, *, cache_dir: Path | None = None) -> None:
+        """Switch to ``tokenizer_name``; it is loaded lazily and cached counts are dropped."""
+        if tokenizer_name == self.tokenizer_name and cache_dir == self.tokenizer_cache_dir:
+            return
+        self.tokenizer_name = tokenizer_name
+        self.tokenizer_cache_dir = cache_dir
+        self._loaded_tokenizer = None
+        self._loaded_identity = None
+        self._load_error = None
+        self._tokenizer_loaded = False
+        self._token_cache.clear()
+        self._separator_token_counts.clear()
+        self._special_token_overhead = None
 
     def count_tokens(self, text: str) -> int:
         if not text:
             return 0
+        if self._token_cache_size <= 0:
+            return self._count_tokens_uncached(text)
+        key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+        cached = self._token_cache.get(key)
+        if cached is not None:
+            self._token_cache.move_to_end(key)
+            self._token_cache_hits += 1
+            return cached
+        self._token_cache_misses += 1
+        count = self._count_tokens_uncached(text)
+        self._token_cache[key] = count
+        if len(self._token_cache) > self._token_cache_size:
+            self._token_cache.popitem(last=False)
+        return count
+
+    def _count_tokens_uncached(self, text: str) -> int:
         if self._tokenizer is not None:
             encoding = self._tokenizer.encode(text)
-            return len(encoding.ids)
+            # Hugging Face returns an Encoding, tiktoken a plain list of ids.
+            return len(getattr(encoding, "ids", encoding))
+        return self._regex_token_count(text)
+
+    def _regex_token_count(self, text: str) -> int:
         return int(len(TOKEN_RE.findall(text)) * self._fallback_token_safety_factor + 0.5)
 
+    def count_tokens_many(self, texts: list[str]) -> list[int]:
+        """Count tokens for ``texts`` with one batched tokenizer call for the cache misses.
+
+        Returns the same values as calling :meth:`count_tokens` per text and
+        fills the token-count cache, so later single lookups of these texts hit.
+        """
+        counts = [0] * len(texts)
+        if self._token_cache_size <= 0:
+            pending = [idx for idx, text in enumerate(texts) if text]
+            for idx, count in zip(pending, self._count_tokens_batch_uncached([texts[idx] for idx in pending])):
+                counts[idx] = count
+            return counts
+
+        missing: dict[bytes, list[int]] = {}
+        missing_texts: list[str] = []
+        for idx, text in enumerate(texts):
+            if not text:
+                continue
+            key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+            cached = self._token_cache.get(key)
+            if cached is not None:
+                self._token_cache.move_to_end(key)
+                self._token_cache_hits += 1
+                counts[idx] = cached
+            elif key in missing:
+                # A repeat within the batch is served by the first occurrence.
+                self._token_cache_hits += 1
+                missing[key].append(idx)
+            else:
+                self._token_cache_misses += 1
+                missing[key] = [idx]
+                missing_texts.append(text)
+
+        for (key, indices), count in zip(missing.items(), self._count_tokens_batch_uncached(missing_texts)):
+            for idx in indices:
+                counts[idx] = count
+            self._token_cache[key] = count
+            if len(self._token_cache) > self._token_cache_size:
+                self._token_cache.popitem(last=False)
+        return counts
+
+    def encode_many(self, texts: list[str]) -> list[list[int]]:
+        """Return the token ids of each text, encoded in one batched tokenizer call.
+
+        Requires a loaded tokenizer; the regex estimator has no token ids.
+        """
+        if self._tokenizer is None:
+            raise RuntimeError("encode_many requires a tokenizer; the regex fallback only estimates counts")
+        if not texts:
+            return []
+        encodings = self._tokenizer.encode_batch(list(texts))
+        return [list(getattr(encoding, "ids", encoding)) for encoding in encodings]
+
+    def _count_tokens_batch_uncached(self, texts: list[str]) -> list[int]:
+        if not texts:
+            return []
+        if self._tokenizer is None:
+            return [self._regex_token_count(text) for text in texts]
+        if not hasattr(self._tokenizer, "encode_batch"):
+            return [self._count_tokens_uncached(text) for text in texts]
+        # Hugging Face tokenizers encode the batch in parallel in Rust; tiktoken uses a thread pool.
+        return [len(getattr(encoding, "ids", encoding)) for encoding in self._tokenizer.encode_batch(list(texts))]
+
+    def joined_token_bounds(self, left_tokens: int, right_tokens: int, separator: str = "\n\n") -> tuple[int, int]:
+        """Return ``(lower, upper)`` bounds for the token count of ``left + separator + right``.
+
+        The regex fallback is additive across whitespace, so only the rounding of
+        the safety factor (one token either way) is uncertain. Tokenizer counts
+        can only change where the texts meet, and special tokens added per
+        encode call are counted once instead of twice.
+        """
+        base = left_tokens + right_tokens + self._separator_tokens(separator)
+        if self._tokenizer is None:
+            margin = 1 if not separator.strip() else JOIN_TOKEN_MARGIN
+        else:
+            base -= self._special_tokens_per_encode()
+            margin = JOIN_TOKEN_MARGIN
+        return max(0, base - margin), base + margin
+
+    def fits_joined(
+        self,
+        left: str,
+        right: str,
+        max_tokens: int,
+        *,
+        separator: str = "\n\n",
+        left_tokens: int | None = None,
+        right_tokens: int | None = None,
+    ) -> bool:
+        """Whether ``left + separator + right`` stays within ``max_tokens``.
+
+        Decided from the counts of both sides; the joined text is only encoded
+        when the budget falls inside the bounds of :meth:`joined_token_bounds`.
+        """
+        if left_tokens is None:
+            left_tokens = self.count_tokens(left)
+        if right_tokens is None:
+            right_tokens = self.count_tokens(right)
+        lower, upper = self.joined_token_bounds(left_tokens, right_tokens, separator)
+        if upper <= max_tokens:
+            return True
+        if lower > max_tokens:
+            return False
+        return self.count_tokens(left + separator + right) <= max_tokens
+
+    def _separator_tokens(self, separator: str) -> int:
+        cached = self._separator_token_counts.get(separator)
+        if cached is None:
+            cached = self._count_tokens_uncached(separator) if separator else 0
+            if self._tokenizer is not None and separator:
+                cached = max(0, cached - self._special_tokens_per_encode())
+            self._separator_token_counts[separator] = cached
+        return cached
+
+    def _special_tokens_per_encode(self) -> int:
+        if self._special_token_overhead is None:
+            self._special_token_overhead = self._count_tokens_uncached("") if self._tokenizer is not None else 0
+        return self._special_token_overhead
+
+    def token_cache_stats(self) -> dict[str, int]:
+        """Return cumulative hit/miss counters and occupancy of the token-count cache."""
+        return {
+            "hits": self._token_cache_hits,
+            "misses": self._token_cache_misses,
+            "entries": len(self._token_cache),
+            "max_entries": self._token_cache_size,
+        }
+
+    def clear_token_cache(self) -> None:
+        self._token_cache.clear()
+        self._token_cache_hits = 0
+        self._token_cache_misses = 0
+
     def _fallback_budget(self, value: int) -> int:
         return max(1, int(value / self._fallback_token_safety_factor))
 
@@ -92,13 +304,7 @@ class ChunkingService:
 
     @staticmethod
     def _max_suffix_prefix_overlap(left: str, right: str, *, scan_chars: int = OVERLAP_SCAN_CHARS) -> int:
-        left_tail = left[-scan_chars:]
-        right_head = right[:scan_chars]
-        max_len = min(len(left_tail), len(right_head))
-        for overlap in range(max_len, 0, -1):
-            if left_tail[-overlap:] == right_head[:overlap]:
-                return overlap
-        return 0
+        return max_suffix_prefix_overlap(left, right, scan_chars)
 
     @staticmethod
     def _looks_sentence_start(text: str) -> bool:
@@ -136,7 +342,9 @@ class ChunkingService:
 
     def _next_start_index_bpe(
         self,
-        token_ids: list[int],
+        text: str,
+        starts: list[int],
+        ends: list[int],
         *,
         start: int,
         end: int,
@@ -145,15 +353,13 @@ class ChunkingService:
         min_start = max(start + 1, end - overlap_tokens)
         idx = min_start
         while idx < end:
-            overlap_text = self._tokenizer.decode(token_ids[idx:end])
-            if len(overlap_text) <= MAX_CONSECUTIVE_OVERLAP_CHARS:
+            if self._span_chars(starts, ends, idx, end) <= MAX_CONSECUTIVE_OVERLAP_CHARS:
                 break
             idx += 1
         for probe in range(idx, end):
-            overlap_text = self._tokenizer.decode(token_ids[probe:end])
-            if len(overlap_text) > MAX_CONSECUTIVE_OVERLAP_CHARS:
+            if self._span_chars(starts, ends, probe, end) > MAX_CONSECUTIVE_OVERLAP_CHARS:
                 continue
-            preview = self._tokenizer.decode(token_ids[probe : min(end, probe + 16)])
+            preview = self._span_text(text, starts, ends, probe, min(end, probe + 16))
             if self._looks_sentence_start(preview):
                 return probe
         return min(idx, end)
@@ -204,36 +410,87 @@ class ChunkingService:
 
     def _choose_end_index_bpe(
         self,
-        token_ids: list[int],
+        text: str,
+        starts: list[int],
+        ends: list[int],
         *,
         start: int,
         target_tokens: int,
         max_tokens: int,
     ) -> int:
-        candidate_end = min(start + target_tokens, len(token_ids))
-        max_end = min(start + max_tokens, len(token_ids))
+        token_count = len(starts)
+        candidate_end = min(start + target_tokens, token_count)
+        max_end = min(start + max_tokens, token_count)
         min_end = min(start + max(32, target_tokens // 3), max_end)
 
         probe_forward_limit = min(max_end, candidate_end + 24)
         for end in range(candidate_end, probe_forward_limit + 1):
-            if self._ends_with_sentence_boundary(self._tokenizer.decode(token_ids[start:end])):
+            if self._span_ends_with_sentence_boundary(text, starts, ends, start, end):
                 return end
         for end in range(candidate_end, min_end - 1, -1):
-            if self._ends_with_sentence_boundary(self._tokenizer.decode(token_ids[start:end])):
+            if self._span_ends_with_sentence_boundary(text, starts, ends, start, end):
                 return end
         return candidate_end
 
+    def _encode_with_offsets(self, text: str) -> tuple[list[int], list[int], list[int]]:
+        """Encode ``text`` once and return token ids with character start/end offsets.
+
+        Special and zero-width tokens are pinned to the preceding character
+        position, so any token range maps to a valid slice of ``text``.
+        """
+        if hasattr(self._tokenizer, "decode_with_offsets"):
+            # tiktoken: offsets are character starts in the (lossless) decoded text.
+            token_ids = list(self._tokenizer.encode(text))
+            decoded, starts = self._tokenizer.decode_with_offsets(token_ids)
+            ends = [*starts[1:], len(decoded)]
+            return token_ids, list(starts), ends
+
+        encoding = self._tokenizer.encode(text)
+        special_mask = encoding.special_tokens_mask
+        starts: list[int] = []
+        ends: list[int] = []
+        cursor = 0
+        for (char_start, char_end), is_special in zip(encoding.offsets, special_mask):
+            if is_special or char_end <= char_start:
+                starts.append(cursor)
+                ends.append(cursor)
+                continue
+            starts.append(char_start)
+            ends.append(char_end)
+            cursor = max(cursor, char_end)
+        return list(encoding.ids), starts, ends
+
+    @staticmethod
+    def _span_chars(starts: list[int], ends: list[int], start: int, end: int) -> int:
+        if end <= start:
+            return 0
+        return max(0, ends[end - 1] - starts[start])
+
+    @staticmethod
+    def _span_text(text: str, starts: list[int], ends: list[int], start: int, end: int) -> str:
+        if end <= start:
+            return ""
+        char_start = starts[start]
+        char_end = ends[end - 1]
+        if char_end <= char_start:
+            return ""
+        return text[char_start:char_end]
+
+    def _span_ends_with_sentence_boundary(self, text: str, starts: list[int], ends: list[int], start: int, end: int) -> bool:
+        # Only the tail matters; avoid materialising the whole window per probe.
+        if end <= start:
+            return False
+        char_start = starts[start]
+        char_end = ends[end - 1]
+        tail = text[max(char_start, char_end - SENTENCE_PROBE_TAIL_CHARS) : char_end]
+        if len(tail.rstrip()) >= 6 or char_end - char_start <= SENTENCE_PROBE_TAIL_CHARS:
+            return self._ends_with_sentence_boundary(tail)
+        return self._ends_with_sentence_boundary(text[char_start:char_end])
+
     @staticmethod
     def _dedupe_page_refs(page_refs: list[PageRef]) -> list[PageRef]:
-        seen: set[tuple[int, str | None, str | None]] = set()
-        deduped: list[PageRef] = []
-        for ref in page_refs:
-            key = (ref.page_idx, ref.block_id, ref.block_position)
-            if key in seen:
-                continue
-            seen.add(key)
-            deduped.append(ref)
-        return deduped
+        # PageRef equality covers exactly (page_idx, block_id, block_position); dict keeps first-seen order.
+        return list(dict.fromkeys(page_refs))
 
     def build_segments(self, blocks: list[CanonicalBlock]) -> list[Segment]:
         segments: list[Segment] = []
@@ -262,7 +519,8 @@ class ChunkingService:
                     section=current_section,
                     article=current_article,
                     subarticle=current_subarticle,
-                    heading_path=list(current_heading_path),
+                    # Already a copy taken at segment start and only ever rebound, never mutated.
+                    heading_path=current_heading_path,
                 )
             )
 
@@ -325,7 +583,7 @@ class ChunkingService:
             safe_overlap = min(max(1, self._fallback_budget(overlap_tokens)), safe_target - 1)
             return self._split_text_by_regex_tokens(text, safe_target, safe_max, safe_overlap)
 
-        token_ids = self._tokenizer.encode(text).ids
+        token_ids, starts, ends = self._encode_with_offsets(text)
         token_count = len(token_ids)
         if token_count == 0:
             return []
@@ -340,7 +598,9 @@ class ChunkingService:
                 end = token_count
             else:
                 end = self._choose_end_index_bpe(
-                    token_ids,
+                    text,
+                    starts,
+                    ends,
                     start=start,
                     target_tokens=target_tokens,
                     max_tokens=max_tokens,
@@ -349,7 +609,7 @@ class ChunkingService:
             if end <= start:
                 break
 
-            chunk_text = self._tokenizer.decode(token_ids[start:end])
+            chunk_text = self._span_text(text, starts, ends, start, end)
             chunk_text = self._strip_fragment_prefix(chunk_text, is_first_chunk=not out)
             if chunk_text:
                 out.append(chunk_text)
@@ -357,7 +617,9 @@ class ChunkingService:
                 break
 
             next_start = self._next_start_index_bpe(
-                token_ids,
+                text,
+                starts,
+                ends,
                 start=start,
                 end=end,
                 overlap_tokens=overlap_tokens,
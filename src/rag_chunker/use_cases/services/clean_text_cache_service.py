@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable
+
+# Bump whenever ``clean_text`` output changes so stale cleaned blocks are ignored.
+CLEAN_CACHE_VERSION = 1
+CLEAN_CACHE_FILENAME = "clean_cache.sqlite"
+# SQLite limits the number of bound parameters per statement.
+_LOOKUP_BATCH = 500
+
+
+class CleanTextCacheService:
+    """Persistent map from raw block text to its cleaned text, shared across documents and runs.
+
+    Entries live in a SQLite file (``clean_cache.sqlite`` next to
+    ``doc_hashes.json``) keyed by the SHA-1 of the raw text and
+    :data:`CLEAN_CACHE_VERSION`. Repeated boilerplate such as headers,
+    disclaimers and identical tables is cleaned once. :meth:`prune` keeps the
+    most recently used ``max_entries`` rows. A database that cannot be read or
+    written degrades to plain cleaning instead of failing the document.
+    """
+
+    def __init__(self, *, path: Path, clean_func: Callable[[str], str], max_entries: int = 100_000) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self._clean = clean_func
+        self._connection: sqlite3.Connection | None = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def block_key(text: str) -> str:
+        return hashlib.sha1(f"{CLEAN_CACHE_VERSION}\0{text}".encode("utf-8")).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30.0)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS cleaned_blocks "
+                "(key TEXT PRIMARY KEY, cleaned TEXT NOT NULL, last_used INTEGER NOT NULL)"
+            )
+            self._connection = connection
+        return self._connection
+
+    def clean_many(self, texts: list[str]) -> list[str]:
+        """Return ``clean_func(text)`` for every text, reading and filling the cache in one transaction."""
+        keys = [self.block_key(text) for text in texts]
+        try:
+            cached = self._lookup(set(keys))
+        except sqlite3.Error:
+            self.misses += len(texts)
+            return [self._clean(text) for text in texts]
+
+        results: list[str] = []
+        fresh: dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            cleaned = cached.get(key)
+            if cleaned is None:
+                cleaned = fresh.get(key)
+            if cleaned is None:
+                cleaned = self._clean(text)
+                fresh[key] = cleaned
+                self.misses += 1
+            else:
+                self.hits += 1
+            results.append(cleaned)
+
+        now = time.time_ns()
+        try:
+            with self._connect() as connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO cleaned_blocks (key, cleaned, last_used) VALUES (?, ?, ?)",
+                    [(key, cleaned, now) for key, cleaned in fresh.items()],
+                )
+                connection.executemany(
+                    "UPDATE cleaned_blocks SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in cached],
+                )
+        except sqlite3.Error:
+            pass
+        return results
+
+    def _lookup(self, keys: set[str]) -> dict[str, str]:
+        connection = self._connect()
+        ordered = sorted(keys)
+        found: dict[str, str] = {}
+        for start in range(0, len(ordered), _LOOKUP_BATCH):
+            batch = ordered[start : start + _LOOKUP_BATCH]
+            placeholders = ",".join("?" * len(batch))
+            rows = connection.execute(
+                f"SELECT key, cleaned FROM cleaned_blocks WHERE key IN ({placeholders})",
+                batch,
+            )
+            found.update(rows)
+        return found
+
+    def entry_count(self) -> int:
+        try:
+            return int(self._connect().execute("SELECT COUNT(*) FROM cleaned_blocks").fetchone()[0])
+        except sqlite3.Error:
+            return 0
+
+    def prune(self) -> int:
+        """Drop the least recently used rows beyond ``max_entries``; returns the number removed."""
+        try:
+            with self._connect() as connection:
+                cursor = connection.execute(
+                    "DELETE FROM cleaned_blocks WHERE key IN "
+                    "(SELECT key FROM cleaned_blocks ORDER BY last_used DESC, key LIMIT -1 OFFSET ?)",
+                    (max(self.max_entries, 0),),
+                )
+                return cursor.rowcount
+        except sqlite3.Error:
+            return 0
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -1,59 +1,71 @@
 from __future__ import annotations
 
 import json
-from pathlib import Path
+from functools import lru_cache
 from typing import Any
 
-from deepeval import assert_test
-from deepeval.metrics import BaseMetric
-from deepeval.test_case import LLMTestCase
-
 from ...config.deepeval_gate_config import DeepEvalGateConfig
-
-
-class ThresholdMetric(BaseMetric):
-    def __init__(self, name: str, actual: float, threshold: float) -> None:
-        self._metric_name = name
-        self.actual = float(actual)
-        self.threshold = float(threshold)
-        self.score: float | None = None
-        self.success: bool | None = None
-        self.reason: str | None = None
-        self.error = None
-        self.async_mode = False
-        self.evaluation_model = "deterministic"
-        self.verbose_mode = False
-
-    def measure(self, test_case: LLMTestCase, *args, **kwargs) -> float:  # noqa: ARG002
-        min_checks = {"median_tokens", "coverage_ratio"}
-        if self._metric_name in min_checks:
-            # For min thresholds, success if actual >= threshold
-            self.success = self.actual >= self.threshold
-            self.reason = f"actual={self.actual} min_required={self.threshold}"
-        else:
-            # For max thresholds, success if actual <= threshold
-            self.success = self.actual <= self.threshold
-            self.reason = f"actual={self.actual} max_allowed={self.threshold}"
-        self.score = 1.0 if self.success else 0.0
-        return self.score
-
-    async def a_measure(self, test_case: LLMTestCase, *args, **kwargs) -> float:  # noqa: ARG002
-        return self.measure(test_case)
-
-    def is_successful(self) -> bool:
-        return bool(self.success)
-
-    @property
-    def __name__(self) -> str:
-        return self._metric_name
+from ...infrastructure.io import read_json, write_json
+from ..chunk_reader import load_chunks
+from ..overlap import max_suffix_prefix_overlap
+
+
+@lru_cache(maxsize=1)
+def _threshold_metric_class() -> type:
+    # deepeval takes about a second to import, so it is only loaded when gates run.
+    from deepeval.metrics import BaseMetric
+
+    class ThresholdMetric(BaseMetric):
+        def __init__(self, name: str, actual: float, threshold: float) -> None:
+            self._metric_name = name
+            self.actual = float(actual)
+            self.threshold = float(threshold)
+            self.score: float | None = None
+            self.success: bool | None = None
+            self.reason: str | None = None
+            self.error = None
+            self.async_mode = False
+            self.evaluation_model = "deterministic"
+            self.verbose_mode = False
+
+        def measure(self, test_case, *args, **kwargs) -> float:  # noqa: ARG002
+            min_checks = {"median_tokens", "coverage_ratio"}
+            if self._metric_name in min_checks:
+                # For min thresholds, success if actual >= threshold
+                self.success = self.actual >= self.threshold
+                self.reason = f"actual={self.actual} min_required={self.threshold}"
+            else:
+                # For max thresholds, success if actual <= threshold
+                self.success = self.actual <= self.threshold
+                self.reason = f"actual={self.actual} max_allowed={self.threshold}"
+            self.score = 1.0 if self.success else 0.0
+            return self.score
+
+        async def a_measure(self, test_case, *args, **kwargs) -> float:  # noqa: ARG002
+            return self.measure(test_case)
+
+        def is_successful(self) -> bool:
+            return bool(self.success)
+
+        @property
+        def __name__(self) -> str:
+            return self._metric_name
+
+    return ThresholdMetric
+
+
+def __getattr__(name: str) -> Any:
+    if name == "ThresholdMetric":
+        return _threshold_metric_class()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class DeepEvalGateService:
     """Runs deterministic gate checks and reports them through DeepEval."""
 
     def run(self, config: DeepEvalGateConfig) -> dict[str, Any]:
-        eval_report = self._load_json(config.eval_report_path)
-        chunks = self._load_jsonl(config.artifacts_dir / "chunks.jsonl")
+        eval_report = read_json(config.eval_report_path)
+        chunks = load_chunks(config.artifacts_dir)
 
         total_chunks = len(chunks)
         tiny_chunks = [row for row in chunks if int(row.get("token_count", 0)) < config.tiny_chunk_tokens]
@@ -136,34 +148,21 @@ class DeepEvalGateService:
             "checks": checks,
         }
 
-        config.output_json.parent.mkdir(parents=True, exist_ok=True)
-        config.output_json.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        write_json(config.output_json, report)
 
+        from deepeval import assert_test
+        from deepeval.test_case import LLMTestCase
+
+        threshold_metric = _threshold_metric_class()
         test_case = LLMTestCase(
             input="rag chunk quality gates",
             actual_output=json.dumps({"checks": checks}),
             expected_output="all checks must pass",
         )
-        metrics = [ThresholdMetric(check["name"], check["actual"], check["expected"]) for check in checks]
+        metrics = [threshold_metric(check["name"], check["actual"], check["expected"]) for check in checks]
         assert_test(test_case, metrics, run_async=False)
         return report
 
-    @staticmethod
-    def _load_json(path: Path) -> dict[str, Any]:
-        return json.loads(path.read_text(encoding="utf-8"))
-
-    @staticmethod
-    def _load_jsonl(path: Path) -> list[dict[str, Any]]:
-        rows: list[dict[str, Any]] = []
-        if not path.exists():
-            return rows
-        with path.open("r", encoding="utf-8") as handle:
-            for line in handle:
-                line = line.strip()
-                if line:
-                    rows.append(json.loads(line))
-        return rows
-
     @staticmethod
     def _pct(part: int, total: int) -> float:
         if total <= 0:
@@ -178,16 +177,6 @@ class DeepEvalGateService:
         idx = max(0, int(0.95 * len(ordered)) - 1)
         return float(ordered[idx])
 
-    @staticmethod
-    def _max_suffix_prefix_overlap(left: str, right: str, scan_chars: int) -> int:
-        left_tail = left[-scan_chars:]
-        right_head = right[:scan_chars]
-        max_len = min(len(left_tail), len(right_head))
-        for overlap in range(max_len, 0, -1):
-            if left_tail[-overlap:] == right_head[:overlap]:
-                return overlap
-        return 0
-
     def _consecutive_overlaps(self, chunks: list[dict[str, Any]], scan_chars: int) -> list[int]:
         grouped: dict[str, list[dict[str, Any]]] = {}
         for chunk in chunks:
@@ -200,5 +189,5 @@ class DeepEvalGateService:
             for idx in range(1, len(ordered)):
                 prev_text = str(ordered[idx - 1].get("text", ""))
                 curr_text = str(ordered[idx].get("text", ""))
-                overlaps.append(self._max_suffix_prefix_overlap(prev_text, curr_text, scan_chars=scan_chars))
+                overlaps.append(max_suffix_prefix_overlap(prev_text, curr_text, scan_chars))
         return overlaps
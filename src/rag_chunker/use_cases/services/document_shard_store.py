@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from typing import Any, BinaryIO, Callable
+
+from ...infrastructure.io import encode_json_line, get_json_codec
+
+SHARD_INDEX_VERSION = 1
+
+
+class DocumentShardStore:
+    """Per-document chunk shards under ``<output_dir>/shards`` plus an offset index.
+
+    Each processed document's chunk rows (before global dedupe) are written to
+    ``<doc_id>-<digest>.jsonl``. ``index.json`` records, per document, the shard
+    file, row byte offsets, dedupe keys, the undeduped document row and its
+    chunk stats. Reused documents can then be emitted by copying shard bytes
+    without decoding any chunk rows; rows are only decoded when one of their
+    keys collides with an earlier document.
+    """
+
+    def __init__(self, *, root: Path, dedupe_key: Callable[[str], str]) -> None:
+        self.root = root
+        self._dedupe_key = dedupe_key
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / "index.json"
+
+    def load_index(self) -> dict[str, dict[str, Any]]:
+        if not self.index_path.exists():
+            return {}
+        try:
+            payload = get_json_codec().loads(self.index_path.read_bytes())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(payload, dict) or payload.get("version") != SHARD_INDEX_VERSION:
+            return {}
+        documents = payload.get("documents", {})
+        if not isinstance(documents, dict):
+            return {}
+        return {
+            str(doc_id): entry
+            for doc_id, entry in documents.items()
+            if isinstance(entry, dict) and (self.root / str(entry.get("file", ""))).is_file()
+        }
+
+    def write_shard(self, document_row: dict[str, Any], chunk_rows: list[dict[str, Any]]) -> tuple[dict[str, Any], list[bytes]]:
+        """Write one document's rows and return its index entry and encoded lines."""
+        lines = [encode_json_line(row) for row in chunk_rows]
+        payload = b"".join(lines)
+        doc_id = str(document_row.get("doc_id", ""))
+        name = f"{doc_id}-{hashlib.sha1(payload).hexdigest()[:12]}.jsonl"
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / name
+        if not path.exists():
+            temp_path = self.root / f".{name}.partial"
+            temp_path.write_bytes(payload)
+            os.replace(temp_path, path)
+
+        offsets: list[int] = []
+        position = 0
+        for line in lines:
+            offsets.append(position)
+            position += len(line)
+        pages = {
+            page_ref["page_idx"]
+            for row in chunk_rows
+            for page_ref in row.get("page_refs", [])
+            if isinstance(page_ref.get("page_idx"), int)
+        }
+        document = dict(document_row)
+        if isinstance(document.get("stats"), dict):
+            document["stats"] = dict(document["stats"])
+        entry = {
+            "file": name,
+            "rows": len(chunk_rows),
+            "bytes": len(payload),
+            "offsets": offsets,
+            "keys": [self._dedupe_key(str(row.get("text", ""))) for row in chunk_rows],
+            "stats": {
+                "chunks": len(chunk_rows),
+                "tokens": sum(int(row.get("token_count", 0)) for row in chunk_rows),
+                "pages": len(pages),
+            },
+            "document": document,
+        }
+        return entry, lines
+
+    def copy_to(self, entry: dict[str, Any], handle: BinaryIO) -> None:
+        with (self.root / entry["file"]).open("rb") as source:
+            shutil.copyfileobj(source, handle)
+
+    def read_lines(self, entry: dict[str, Any], indices: list[int]) -> list[bytes]:
+        """Return the encoded lines of the selected rows using the offset index."""
+        data = (self.root / entry["file"]).read_bytes()
+        bounds = [*entry["offsets"], len(data)]
+        return [data[bounds[idx] : bounds[idx + 1]] for idx in indices]
+
+    def write_index(self, entries: dict[str, dict[str, Any]]) -> None:
+        """Persist ``entries`` atomically and delete shard files no longer referenced."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        temp_path = self.root / ".index.json.partial"
+        temp_path.write_bytes(get_json_codec().dumps({"version": SHARD_INDEX_VERSION, "documents": entries}))
+        os.replace(temp_path, self.index_path)
+        referenced = {entry["file"] for entry in entries.values()}
+        for path in self.root.glob("*.jsonl"):
+            if path.name not in referenced:
+                path.unlink(missing_ok=True)
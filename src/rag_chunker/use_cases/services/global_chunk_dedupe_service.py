@@ -11,25 +11,36 @@ class GlobalChunkDedupeService:
         self._sha1 = sha1_func
         self._ws_re = re.compile(r"\s+")
 
-    def apply(self, chunks: list[dict[str, Any]], documents: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        seen_keys: set[str] = set()
+    def apply(
+        self,
+        chunks: list[dict[str, Any]],
+        documents: list[dict[str, Any]],
+        seen_keys: set[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Drop chunks whose key was already seen and refresh per-document stats.
+
+        Passing the same ``seen_keys`` set across calls lets callers dedupe one
+        document at a time with the same result as a single call over all rows.
+        """
+        if seen_keys is None:
+            seen_keys = set()
         deduped_chunks: list[dict[str, Any]] = []
         for row in chunks:
-            key = self._dedupe_key(str(row.get("text", "")))
+            key = self.dedupe_key(str(row.get("text", "")))
             if key in seen_keys:
                 continue
             seen_keys.add(key)
             deduped_chunks.append(row)
 
-        self._refresh_document_stats(deduped_chunks, documents)
+        self.refresh_document_stats(deduped_chunks, documents)
         return deduped_chunks
 
-    def _dedupe_key(self, text: str) -> str:
+    def dedupe_key(self, text: str) -> str:
         normalized = self._ws_re.sub(" ", text).strip().casefold()
         return self._sha1(normalized)
 
     @staticmethod
-    def _refresh_document_stats(chunks: list[dict[str, Any]], documents: list[dict[str, Any]]) -> None:
+    def refresh_document_stats(chunks: list[dict[str, Any]], documents: list[dict[str, Any]]) -> None:
         chunks_by_doc: dict[str, list[dict[str, Any]]] = {}
         for row in chunks:
             doc_id = str(row.get("doc_id", ""))
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import hashlib
 import json
+import time
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable
@@ -12,8 +13,35 @@ from ...config.pipeline_config import PipelineConfig
 @dataclass
 class IncrementalCacheSnapshot:
     docs_by_id: dict[str, dict[str, Any]]
-    chunks_by_doc: dict[str, list[dict[str, Any]]]
-    cache_by_doc: dict[str, dict[str, str]]
+    shards_by_doc: dict[str, dict[str, Any]]
+    cache_by_doc: dict[str, dict[str, Any]]
+
+
+@dataclass
+class FolderFingerprint:
+    """Content hash of a document folder plus the per-file stat entries behind it."""
+
+    content_hash: str
+    files: dict[str, list[Any]]
+    rehashed_files: int = 0
+    stat_matched_files: int = 0
+
+
+# Files modified this close to hashing time are rehashed on the next run, since a
+# later write within the filesystem's timestamp granularity would leave stat unchanged.
+RACY_MTIME_WINDOW_NS = 2_000_000_000
+
+
+def hash_file(path: Path) -> str:
+    """SHA-1 hex digest of a file's bytes, read in 64 KiB chunks."""
+    hasher = hashlib.sha1()
+    with path.open("rb") as handle:
+        while True:
+            chunk = handle.read(65536)
+            if not chunk:
+                break
+            hasher.update(chunk)
+    return hasher.hexdigest()
 
 
 class IncrementalCacheService:
@@ -25,11 +53,17 @@ class IncrementalCacheService:
         output_dir: Path,
         sha1_func: Callable[[str], str],
         read_json: Callable[[Path], dict[str, Any] | list[Any]],
-        version: int = 2,
+        load_shard_index: Callable[[], dict[str, dict[str, Any]]],
+        tokenizer_identity: Callable[[], str] | None = None,
+        json_codec_name: Callable[[], str] | None = None,
+        version: int = 3,
     ) -> None:
         self.output_dir = output_dir
         self._sha1 = sha1_func
         self._read_json = read_json
+        self._load_shard_index = load_shard_index
+        self._tokenizer_identity = tokenizer_identity
+        self._json_codec_name = json_codec_name
         self.version = version
 
     def processing_signature(self, config: PipelineConfig) -> str:
@@ -44,38 +78,74 @@ class IncrementalCacheService:
             "drop_toc": config.drop_toc,
             "dedupe_chunks": config.dedupe_chunks,
         }
+        if self._tokenizer_identity is not None:
+            # Token budgets depend on the tokenizer that actually loaded, not just the configured name.
+            payload["tokenizer"] = self._tokenizer_identity()
+        if self._json_codec_name is not None:
+            # Reused shards are copied byte for byte, and codecs format numbers and separators differently.
+            payload["json_codec"] = self._json_codec_name()
+        if config.output_profile != "full":
+            # Shards hold rows as written, so a profile change cannot reuse them.
+            payload["output_profile"] = config.output_profile
         return self._sha1(json.dumps(payload, sort_keys=True))
 
     def compute_folder_hash(self, folder: Path) -> str:
+        return self.fingerprint_folder(folder).content_hash
+
+    def fingerprint_folder(
+        self,
+        folder: Path,
+        *,
+        prior_files: dict[str, list[Any]] | None = None,
+        source_paths: list[Path] | None = None,
+    ) -> FolderFingerprint:
+        """Hash a folder from per-file digests, reusing digests whose stat is unchanged.
+
+        ``prior_files`` maps relative paths to ``[size, mtime_ns, inode, sha1]``
+        from the previous run. ``source_paths`` restricts hashing to the given
+        files (the sources ``choose_source`` picked) instead of the whole folder.
+        """
+        if source_paths is None:
+            paths = [path for path in folder.rglob("*") if path.is_file()]
+        else:
+            paths = [path for path in source_paths if path.is_file()]
+        paths.sort(key=lambda p: str(p.relative_to(folder)))
+        prior_files = prior_files or {}
+        now_ns = time.time_ns()
         hasher = hashlib.sha1()
-        files = sorted([path for path in folder.rglob("*") if path.is_file()], key=lambda p: str(p.relative_to(folder)))
-        for path in files:
+        files: dict[str, list[Any]] = {}
+        rehashed = 0
+        for path in paths:
             rel = str(path.relative_to(folder)).replace("\\", "/")
+            stat = path.stat()
+            prior = prior_files.get(rel)
+            if (
+                isinstance(prior, list)
+                and len(prior) == 4
+                and prior[:3] == [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+            ):
+                digest = str(prior[3])
+            else:
+                digest = hash_file(path)
+                rehashed += 1
+            mtime_ns = stat.st_mtime_ns if now_ns - stat.st_mtime_ns > RACY_MTIME_WINDOW_NS else None
+            files[rel] = [stat.st_size, mtime_ns, stat.st_ino, digest]
             hasher.update(rel.encode("utf-8"))
             hasher.update(b"\0")
-            with path.open("rb") as handle:
-                while True:
-                    chunk = handle.read(65536)
-                    if not chunk:
-                        break
-                    hasher.update(chunk)
-        return hasher.hexdigest()
+            hasher.update(digest.encode("ascii"))
+            hasher.update(b"\n")
+        return FolderFingerprint(
+            content_hash=hasher.hexdigest(),
+            files=files,
+            rehashed_files=rehashed,
+            stat_matched_files=len(paths) - rehashed,
+        )
 
     def load_snapshot(self) -> IncrementalCacheSnapshot:
-        docs_by_id: dict[str, dict[str, Any]] = {}
-        chunks_by_doc: dict[str, list[dict[str, Any]]] = {}
-        cache_by_doc: dict[str, dict[str, str]] = {}
-
-        for row in self._load_jsonl(self.output_dir / "documents.jsonl"):
-            doc_id = str(row.get("doc_id", ""))
-            if doc_id:
-                docs_by_id[doc_id] = row
-
-        for row in self._load_jsonl(self.output_dir / "chunks.jsonl"):
-            doc_id = str(row.get("doc_id", ""))
-            if not doc_id:
-                continue
-            chunks_by_doc.setdefault(doc_id, []).append(row)
+        # Only the shard index is read; chunk rows stay on disk until a document is reused.
+        shards_by_doc = self._load_shard_index()
+        docs_by_id = {doc_id: entry["document"] for doc_id, entry in shards_by_doc.items() if isinstance(entry.get("document"), dict)}
+        cache_by_doc: dict[str, dict[str, Any]] = {}
 
         cache_path = self.output_dir / "doc_hashes.json"
         if cache_path.exists():
@@ -88,15 +158,17 @@ class IncrementalCacheService:
                             continue
                         content_hash = item.get("content_hash")
                         processing_signature = item.get("processing_signature")
+                        files = item.get("files")
                         if isinstance(content_hash, str):
                             cache_by_doc[str(doc_id)] = {
                                 "content_hash": content_hash,
                                 "processing_signature": processing_signature if isinstance(processing_signature, str) else "",
+                                "files": files if isinstance(files, dict) else {},
                             }
 
         return IncrementalCacheSnapshot(
             docs_by_id=docs_by_id,
-            chunks_by_doc=chunks_by_doc,
+            shards_by_doc=shards_by_doc,
             cache_by_doc=cache_by_doc,
         )
 
@@ -113,21 +185,26 @@ class IncrementalCacheService:
             return False
         if prior.get("processing_signature") != processing_signature:
             return False
-        if doc_id not in snapshot.docs_by_id:
-            return False
-        if doc_id in snapshot.chunks_by_doc:
-            return True
-        return int(snapshot.docs_by_id[doc_id].get("stats", {}).get("chunks", 0)) == 0
+        return doc_id in snapshot.docs_by_id and doc_id in snapshot.shards_by_doc
 
     @staticmethod
-    def build_entry(*, source_folder: str, folder_hash: str, processing_signature: str) -> dict[str, str]:
-        return {
+    def build_entry(
+        *,
+        source_folder: str,
+        folder_hash: str,
+        processing_signature: str,
+        files: dict[str, list[Any]] | None = None,
+    ) -> dict[str, Any]:
+        entry: dict[str, Any] = {
             "source_folder": source_folder,
             "content_hash": folder_hash,
             "processing_signature": processing_signature,
         }
+        if files is not None:
+            entry["files"] = files
+        return entry
 
-    def write_cache(self, *, generated_at_utc: str, entries: dict[str, dict[str, str]], write_json: Callable[[Path, dict[str, Any]], None]) -> None:
+    def write_cache(self, *, generated_at_utc: str, entries: dict[str, dict[str, Any]], write_json: Callable[[Path, dict[str, Any]], None]) -> None:
         write_json(
             self.output_dir / "doc_hashes.json",
             {
@@ -136,15 +213,3 @@ class IncrementalCacheService:
                 "documents": entries,
             },
         )
-
-    @staticmethod
-    def _load_jsonl(path: Path) -> list[dict[str, Any]]:
-        rows: list[dict[str, Any]] = []
-        if not path.exists():
-            return rows
-        with path.open("r", encoding="utf-8") as handle:
-            for line in handle:
-                line = line.strip()
-                if line:
-                    rows.append(json.loads(line))
-        return rows
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from typing import Any
+
+from ...config.perf_gate_config import PerfGateConfig
+from ...infrastructure.io import read_json, write_json
+
+# Result fields that must agree for throughput numbers to be comparable.
+CORPUS_FIELDS = ("corpus", "input_dir", "tokenizer")
+
+
+class PerfGateService:
+    """Compares benchmark scenario results against a baseline and reports pass/fail checks.
+
+    Results and baseline use the JSON written by
+    ``benchmarks/pipeline_scenarios.py``: a ``scenarios`` map of per-scenario
+    rows with ``docs_per_sec``, ``chunks_per_sec`` and ``peak_rss_mib``. The
+    report uses the ``summary``/``checks`` layout of the other gate reports:
+    every check has a numeric ``actual`` and ``expected`` threshold, and
+    ``comparison`` says whether ``actual`` must be ``>=`` or ``<=`` it.
+    """
+
+    def run(self, config: PerfGateConfig) -> dict[str, Any]:
+        results = read_json(config.results_path)
+        baseline = read_json(config.baseline_path)
+        report = self.compare(results, baseline, config)
+        write_json(config.output_json, report)
+        return report
+
+    def compare(self, results: dict[str, Any], baseline: dict[str, Any], config: PerfGateConfig) -> dict[str, Any]:
+        unknown = sorted(set(config.scenario_tolerances) - set(baseline.get("scenarios", {})))
+        if unknown:
+            raise ValueError(f"Scenario tolerances for scenarios missing from the baseline: {', '.join(unknown)}")
+        checks: list[dict[str, Any]] = []
+        if config.require_matching_corpus:
+            mismatched = [key for key in CORPUS_FIELDS if results.get(key) != baseline.get(key)]
+            checks.append(
+                {
+                    "name": "corpus_mismatched_fields",
+                    "actual": float(len(mismatched)),
+                    "expected": 0.0,
+                    "comparison": "<=",
+                    "passed": not mismatched,
+                    "fields": mismatched,
+                }
+            )
+
+        current_scenarios = results.get("scenarios", {})
+        for scenario, base in sorted(baseline.get("scenarios", {}).items()):
+            current = current_scenarios.get(scenario)
+            if current is None:
+                checks.append(self._missing_check(scenario))
+                continue
+            drop_pct = config.scenario_tolerances.get(scenario, config.max_throughput_drop_pct)
+            for metric in config.throughput_metrics:
+                if not base.get(metric):
+                    continue
+                if current.get(metric) is None:
+                    checks.append(self._missing_check(f"{scenario}.{metric}"))
+                    continue
+                minimum = round(base[metric] * (1.0 - drop_pct / 100.0), 2)
+                actual = current[metric]
+                checks.append(
+                    {
+                        "name": f"{scenario}.{metric}",
+                        "actual": actual,
+                        "expected": minimum,
+                        "comparison": ">=",
+                        "passed": actual >= minimum,
+                        "change_pct": self._change_pct(actual, base[metric]),
+                    }
+                )
+            if base.get("peak_rss_mib") and current.get("peak_rss_mib") is None:
+                checks.append(self._missing_check(f"{scenario}.peak_rss_mib"))
+            elif base.get("peak_rss_mib"):
+                maximum = round(base["peak_rss_mib"] * (1.0 + config.max_peak_rss_growth_pct / 100.0), 1)
+                actual = current["peak_rss_mib"]
+                checks.append(
+                    {
+                        "name": f"{scenario}.peak_rss_mib",
+                        "actual": actual,
+                        "expected": maximum,
+                        "comparison": "<=",
+                        "passed": actual <= maximum,
+                        "change_pct": self._change_pct(actual, base["peak_rss_mib"]),
+                    }
+                )
+
+        return {
+            "summary": {
+                "scenarios": len(current_scenarios),
+                "results_commit": results.get("commit"),
+                "baseline_commit": baseline.get("commit"),
+                "gates_passed": all(check["passed"] for check in checks),
+            },
+            "tolerances": {
+                "max_throughput_drop_pct": config.max_throughput_drop_pct,
+                "max_peak_rss_growth_pct": config.max_peak_rss_growth_pct,
+                "scenario_tolerances": dict(config.scenario_tolerances),
+            },
+            "checks": checks,
+        }
+
+    @staticmethod
+    def _missing_check(name: str) -> dict[str, Any]:
+        # A metric or scenario the baseline gates on but the results lack fails
+        # outright; defaulting it to 0.0 would pass every ``<=`` check.
+        return {"name": f"{name}.present", "actual": 0.0, "expected": 1.0, "comparison": ">=", "passed": False}
+
+    @staticmethod
+    def _change_pct(actual: float, base: float) -> float:
+        if not base:
+            return 0.0
+        return round((actual - base) / base * 100.0, 2)
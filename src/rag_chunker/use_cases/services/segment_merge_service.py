@@ -6,15 +6,7 @@ from typing import Any
 from ...domain.models import PageRef, Segment
 
 def _dedupe_page_refs(page_refs: list[PageRef]) -> list[PageRef]:
-    seen: set[tuple[int, str | None, str | None]] = set()
-    out: list[PageRef] = []
-    for ref in page_refs:
-        key = (ref.page_idx, ref.block_id, ref.block_position)
-        if key in seen:
-            continue
-        seen.add(key)
-        out.append(ref)
-    return out
+    return list(dict.fromkeys(page_refs))
 
 
 def _same_structure(a, b) -> bool:
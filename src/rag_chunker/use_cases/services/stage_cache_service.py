@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable
+
+from ...domain.models import CanonicalBlock, PageRef, Segment, SourceChoice, page_ref_for_page
+from ...infrastructure.io import get_json_codec
+from .incremental_cache_service import hash_file
+
+# Bump whenever the key derivation or a payload layout changes.
+STAGE_CACHE_VERSION = 2
+
+
+class StageCacheService:
+    """Per-document memo of the expensive early pipeline stages.
+
+    Entries live under ``<output_dir>/stage_cache/<doc_id>/<stage>.json``. Each
+    entry is keyed by the hash of the source files plus only the config fields
+    that stage reads, so a change to chunk sizing re-runs splitting and
+    assembly while loading, cleaning and segmentation are served from disk.
+    One entry per stage is kept for each document.
+    """
+
+    def __init__(self, *, root: Path, sha1_func: Callable[[str], str]) -> None:
+        self.root = root
+        self._sha1 = sha1_func
+
+    @staticmethod
+    def source_hash(choice: SourceChoice, file_digests: dict[str, str] | None = None) -> str:
+        """Hash the chosen source files from their SHA-1 digests.
+
+        ``file_digests`` maps paths relative to ``choice.folder`` to the digests
+        the incremental cache already computed or stat-matched for this run;
+        only files missing from it are read and hashed here.
+        """
+        file_digests = file_digests or {}
+        hasher = hashlib.sha1()
+        for path in (choice.block_path, choice.content_path, choice.md_path):
+            if path is None or not path.is_file():
+                continue
+            try:
+                rel = path.relative_to(choice.folder).as_posix()
+            except ValueError:
+                rel = None
+            digest = file_digests.get(rel) if rel is not None else None
+            hasher.update(path.name.encode("utf-8"))
+            hasher.update(b"\0")
+            hasher.update((digest or hash_file(path)).encode("ascii"))
+            hasher.update(b"\n")
+        return hasher.hexdigest()
+
+    def stage_key(self, stage: str, source_hash: str, params: dict[str, Any]) -> str:
+        payload = {"version": STAGE_CACHE_VERSION, "stage": stage, "source_hash": source_hash, "params": params}
+        return self._sha1(json.dumps(payload, sort_keys=True))
+
+    def load(self, doc_id: str, stage: str, key: str) -> Any | None:
+        path = self.root / doc_id / f"{stage}.json"
+        if not path.exists():
+            return None
+        try:
+            entry = get_json_codec().loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("key") != key:
+            return None
+        return entry.get("payload")
+
+    def store(self, doc_id: str, stage: str, key: str, payload: Any) -> None:
+        directory = self.root / doc_id
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{stage}.json"
+        temp_path = directory / f".{stage}.json.{os.getpid()}.partial"
+        temp_path.write_bytes(get_json_codec().dumps({"key": key, "payload": payload}))
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def encode_blocks(blocks: list[CanonicalBlock]) -> list[dict[str, Any]]:
+        return [
+            {
+                "text": block.text,
+                "block_type": block.block_type,
+                "page_refs": _encode_page_refs(block.page_refs),
+                "heading_level": block.heading_level,
+                "source_hint": block.source_hint,
+            }
+            for block in blocks
+        ]
+
+    @staticmethod
+    def decode_blocks(payload: list[dict[str, Any]]) -> list[CanonicalBlock]:
+        interned: dict[tuple[Any, ...], PageRef] = {}
+        return [
+            CanonicalBlock(
+                text=item["text"],
+                block_type=item["block_type"],
+                page_refs=_decode_page_refs(item["page_refs"], interned),
+                heading_level=item["heading_level"],
+                source_hint=item["source_hint"],
+            )
+            for item in payload
+        ]
+
+    @staticmethod
+    def encode_segments(segments: list[Segment]) -> list[dict[str, Any]]:
+        return [
+            {
+                "text": segment.text,
+                "page_refs": _encode_page_refs(segment.page_refs),
+                "section": segment.section,
+                "article": segment.article,
+                "subarticle": segment.subarticle,
+                "heading_path": list(segment.heading_path),
+            }
+            for segment in segments
+        ]
+
+    @staticmethod
+    def decode_segments(payload: list[dict[str, Any]]) -> list[Segment]:
+        interned: dict[tuple[Any, ...], PageRef] = {}
+        return [
+            Segment(
+                text=item["text"],
+                page_refs=_decode_page_refs(item["page_refs"], interned),
+                section=item["section"],
+                article=item["article"],
+                subarticle=item["subarticle"],
+                heading_path=list(item["heading_path"]),
+            )
+            for item in payload
+        ]
+
+
+def _encode_page_refs(page_refs: list[PageRef]) -> list[list[Any]]:
+    return [[ref.page_idx, ref.block_id, ref.block_position] for ref in page_refs]
+
+
+def _decode_page_refs(payload: list[list[Any]], interned: dict[tuple[Any, ...], PageRef]) -> list[PageRef]:
+    # Segments repeat the refs of their blocks; decode each distinct ref once per payload.
+    refs: list[PageRef] = []
+    for page_idx, block_id, block_position in payload:
+        if block_id is None and block_position is None:
+            refs.append(page_ref_for_page(page_idx))
+            continue
+        key = (page_idx, block_id, block_position)
+        ref = interned.get(key)
+        if ref is None:
+            ref = interned[key] = PageRef(page_idx=page_idx, block_id=block_id, block_position=block_position)
+        refs.append(ref)
+    return refs
+
@@ -22,6 +22,7 @@ class TinyChunkSweepService:
         build_augmented_text: Callable[[str, str | None, str | None, str | None, str | None, str | None, str | None], str],
         sha1_func: Callable[[str], str],
         is_table_chunk_text: Callable[[str], bool],
+        fits_joined: Callable[..., bool] | None = None,
     ) -> None:
         self.max_tokens = max_tokens
         self.sweep_tokens = sweep_tokens
@@ -32,6 +33,7 @@ class TinyChunkSweepService:
         self._build_augmented_text = build_augmented_text
         self._sha1 = sha1_func
         self._is_table_chunk_text = is_table_chunk_text
+        self._fits_joined = fits_joined
 
     def sweep(self, chunk_rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
         if len(chunk_rows) <= 1:
@@ -64,8 +66,9 @@ class TinyChunkSweepService:
             if idx > 0:
                 prev = working[idx - 1]
                 if self._is_compatible_neighbor(prev, section, article, subarticle, is_table):
-                    merged_text = str(prev.get("text", "")).rstrip() + "\n\n" + text
-                    if self._count_tokens(merged_text) <= self.max_tokens:
+                    prev_text = str(prev.get("text", "")).rstrip()
+                    if self._joined_fits(prev_text, text, right_tokens=token_count):
+                        merged_text = prev_text + "\n\n" + text
                         merged_refs = self._merge_page_ref_payload(prev.get("page_refs", []), row.get("page_refs", []))
                         self._refresh_chunk_row_text(prev, merged_text)
                         self._set_chunk_row_page_meta(prev, merged_refs)
@@ -77,8 +80,9 @@ class TinyChunkSweepService:
             if idx + 1 < len(working):
                 nxt = working[idx + 1]
                 if self._is_compatible_neighbor(nxt, section, article, subarticle, is_table):
-                    merged_text = text + "\n\n" + str(nxt.get("text", "")).lstrip()
-                    if self._count_tokens(merged_text) <= self.max_tokens:
+                    nxt_text = str(nxt.get("text", "")).lstrip()
+                    if self._joined_fits(text, nxt_text, left_tokens=token_count):
+                        merged_text = text + "\n\n" + nxt_text
                         merged_refs = self._merge_page_ref_payload(row.get("page_refs", []), nxt.get("page_refs", []))
                         self._refresh_chunk_row_text(nxt, merged_text)
                         self._set_chunk_row_page_meta(nxt, merged_refs)
@@ -92,6 +96,11 @@ class TinyChunkSweepService:
             row["chunk_id"] = self._sha1(f"{row.get('doc_id')}:{new_idx}:{str(row.get('text', ''))[:80]}")[:20]
         return working
 
+    def _joined_fits(self, left: str, right: str, *, left_tokens: int | None = None, right_tokens: int | None = None) -> bool:
+        if self._fits_joined is None:
+            return self._count_tokens(left + "\n\n" + right) <= self.max_tokens
+        return self._fits_joined(left, right, self.max_tokens, left_tokens=left_tokens, right_tokens=right_tokens)
+
     def _is_compatible_neighbor(
         self,
         neighbor: dict[str, Any],
@@ -0,0 +1,22 @@
+import pytest
+
+
+@pytest.fixture
+def bpe_tokenizer(tmp_path):
+    """Train a small byte-level BPE tokenizer and save it as ``tokenizer.json``.
+
+    Call it as ``bpe_tokenizer(corpus, vocab_size)``; it returns the tokenizer
+    and the path it was saved to. Tests using it are skipped without ``tokenizers``.
+    """
+    tokenizers = pytest.importorskip("tokenizers")
+    from tokenizers import models, pre_tokenizers, trainers
+
+    def train(corpus, vocab_size=200):
+        tokenizer = tokenizers.Tokenizer(models.BPE())
+        tokenizer.pre_tokenizer = pre_tokenizers.ByteLevel(add_prefix_space=False)
+        tokenizer.train_from_iterator(corpus, trainer=trainers.BpeTrainer(vocab_size=vocab_size, show_progress=False))
+        path = tmp_path / "tokenizer.json"
+        tokenizer.save(str(path))
+        return tokenizer, path
+
+    return train
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from rag_chunker.domain.models import PageRef
+from rag_chunker.infrastructure.io import iter_json_object
+from rag_chunker.use_cases.chunking import build_segments
+from rag_chunker.use_cases.services.block_loader_service import (
+    _load_blocks_from_block_list,
+    _load_blocks_from_content_list,
+)
+from rag_chunker.use_cases.services.stage_cache_service import StageCacheService
+
+
+def test_iter_json_object_matches_json_load_across_buffer_boundaries(tmp_path):
+    payload = {
+        "mergeConnections": [{"blocks": ["0-1", "1-0"], "type": "merge"}],
+        "pdfData": [[{"text": "é \"quoted\" \\u2014", "n": 12345678901234567890, "f": -1.5e-7}], [], [True, None]],
+        "meta": {"nested": [1, 2, {"deep": "value"}]},
+        "count": 1000000,
+    }
+    path = tmp_path / "payload.json"
+    path.write_text(json.dumps(payload, indent=1, ensure_ascii=False), encoding="utf-8")
+    for chunk_chars in (1, 3, 7, 64, 65536):
+        members = list(iter_json_object(path, "pdfData", chunk_chars=chunk_chars))
+        assert members == [
+            ("mergeConnections", payload["mergeConnections"]),
+            ("pdfData", payload["pdfData"][0]),
+            ("pdfData", []),
+            ("pdfData", [True, None]),
+            ("meta", payload["meta"]),
+            ("count", 1000000),
+        ]
+
+    path.write_text("[1, 2]", encoding="utf-8")
+    assert list(iter_json_object(path, "pdfData")) == []
+    for broken in ('{"pdfData": [[1], ]}', '{"pdfData": [[1]]', '{"a": 1} {}', '{"a" 1}'):
+        path.write_text(broken, encoding="utf-8")
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_object(path, "pdfData", chunk_chars=4))
+
+
+def test_block_list_loader_streams_pages_and_applies_merges_declared_first(tmp_path):
+    pages = [
+        [
+            {"type": "header", "text": "HEADER", "is_discarded": True, "page_idx": 0, "block_position": "0-0"},
+            {"type": "title", "text": "# ART. 1", "level": 1, "page_idx": 0, "block_position": "0-1", "id": "a"},
+            {"type": "text", "text": "Students apply online", "page_idx": 0, "block_position": "0-2", "id": "b"},
+            {"type": "image", "text": "ignored", "page_idx": 0, "block_position": "0-3"},
+        ],
+        [
+            {"type": "text", "text": "before the deadline.", "page_idx": 1, "block_position": "1-0", "id": "c"},
+            {"type": "table_body", "table_body": "<table></table>", "page_idx": 1, "block_position": "1-1"},
+        ],
+    ]
+    path = tmp_path / "block_list.json"
+    path.write_text(
+        json.dumps({"mergeConnections": [{"type": "merge", "blocks": ["0-2", "1-0"]}], "pdfData": pages}),
+        encoding="utf-8",
+    )
+    blocks = _load_blocks_from_block_list(path)
+    assert [block.block_type for block in blocks] == ["title", "text", "table_body"]
+    assert blocks[1].text == "Students apply online\nbefore the deadline."
+    assert [ref.page_idx for ref in blocks[1].page_refs] == [0, 1]
+    assert blocks[0].heading_level == 1
+
+
+def test_content_list_blocks_share_frozen_page_refs_per_page(tmp_path):
+    path = tmp_path / "Doc_content_list.json"
+    items = [{"type": "text", "text": "ART. 1 Scope", "text_level": 1, "page_idx": 0}]
+    items += [{"type": "text", "text": f"Paragraph {idx}.", "page_idx": idx // 3} for idx in range(9)]
+    path.write_text(json.dumps(items), encoding="utf-8")
+
+    blocks = _load_blocks_from_content_list(path)
+    assert blocks[0].page_refs[0] is blocks[1].page_refs[0]
+    assert len({id(block.page_refs[0]) for block in blocks}) == 3
+    assert not hasattr(blocks[0], "__dict__") and not hasattr(blocks[0].page_refs[0], "__dict__")
+    with pytest.raises(AttributeError):
+        blocks[0].text = "changed"
+
+    segments = build_segments(blocks)
+    assert segments[0].page_refs == [PageRef(page_idx=0), PageRef(page_idx=1), PageRef(page_idx=2)]
+    decoded = StageCacheService.decode_segments(json.loads(json.dumps(StageCacheService.encode_segments(segments))))
+    assert decoded == segments
+    assert decoded[0].page_refs[0] is blocks[0].page_refs[0]
@@ -1,3 +1,8 @@
+import sys
+import warnings
+
+import pytest
+
 from rag_chunker import build_segments, count_tokens, split_text_by_tokens, CanonicalBlock, PageRef
 
 
@@ -60,3 +65,181 @@ def test_split_text_by_tokens_overlap_trim_prefers_sentence_break():
     assert len(chunks) > 2
     starts = [chunk.lstrip()[:1] for chunk in chunks[1:]]
     assert sum(1 for ch in starts if ch and ch.islower()) <= 1
+
+
+def test_split_text_by_tokens_bpe_path_slices_source_text(monkeypatch, bpe_tokenizer):
+    from rag_chunker.use_cases.services.chunking_service import ChunkingService
+
+    sentence = "Students must submit complete documentation before the stated deadline."
+    corpus = [f"{sentence} Reference code R{idx}.\n\n" for idx in range(40)]
+    tokenizer, _ = bpe_tokenizer(corpus, 300)
+
+    class _NoDecodeTokenizer:
+        def encode(self, text):
+            return tokenizer.encode(text)
+
+        def decode(self, ids):  # pragma: no cover - must not be reached
+            raise AssertionError("split_text_by_tokens should not decode token windows")
+
+    monkeypatch.setattr(ChunkingService, "_load_tokenizer", staticmethod(lambda: _NoDecodeTokenizer()))
+    service = ChunkingService()
+    text = "".join(corpus)
+    chunks = service.split_text_by_tokens(text, target_tokens=60, max_tokens=80, overlap_tokens=10)
+    assert len(chunks) > 2
+    assert all(chunk in text for chunk in chunks)
+    assert all(service.count_tokens(chunk) <= 80 for chunk in chunks)
+
+
+def test_count_tokens_cache_is_bounded_lru():
+    from rag_chunker.use_cases.services.chunking_service import ChunkingService
+
+    service = ChunkingService(token_cache_size=2)
+    first = service.count_tokens("alpha beta gamma")
+    assert service.count_tokens("alpha beta gamma") == first
+    service.count_tokens("delta")
+    service.count_tokens("alpha beta gamma")  # refresh, so "delta" is the eviction candidate
+    service.count_tokens("epsilon zeta")
+    stats = service.token_cache_stats()
+    assert stats == {"hits": 2, "misses": 3, "entries": 2, "max_entries": 2}
+    service.count_tokens("delta")
+    assert service.token_cache_stats()["misses"] == 4
+
+
+def test_count_tokens_many_batches_misses_and_matches_single_counts(monkeypatch, bpe_tokenizer):
+    from rag_chunker.use_cases.services.chunking_service import ChunkingService
+
+    corpus = [f"Applicants submit form F{idx} before the deadline.\n\n" for idx in range(30)]
+    tokenizer, _ = bpe_tokenizer(corpus, 200)
+    batch_calls = []
+
+    class _CountingTokenizer:
+        def encode(self, text):
+            return tokenizer.encode(text)
+
+        def encode_batch(self, texts):
+            batch_calls.append(len(texts))
+            return tokenizer.encode_batch(texts)
+
+    monkeypatch.setattr(ChunkingService, "_load_tokenizer", staticmethod(lambda: _CountingTokenizer()))
+    service = ChunkingService()
+    texts = [corpus[0], "", corpus[1], corpus[0], corpus[2]]
+    service.count_tokens(corpus[2])
+    counts = service.count_tokens_many(texts)
+
+    assert counts == [len(tokenizer.encode(text).ids) if text else 0 for text in texts]
+    assert batch_calls == [2]
+    assert service.token_cache_stats()["misses"] == 3
+    assert service.count_tokens(corpus[1]) == counts[2]
+    assert service.encode_many(corpus[:3]) == [tokenizer.encode(text).ids for text in corpus[:3]]
+
+    monkeypatch.setattr(ChunkingService, "_load_tokenizer", staticmethod(lambda: None))
+    regex_service = ChunkingService(token_cache_size=0)
+    assert regex_service.count_tokens_many(texts) == [regex_service.count_tokens(text) for text in texts]
+
+
+def test_batched_counts_ignore_padding_and_truncation_from_tokenizer_json(bpe_tokenizer):
+    from rag_chunker.infrastructure.tokenizer_registry import TokenizerRegistry
+    from rag_chunker.use_cases.services.chunking_service import ChunkingService
+
+    corpus = [f"Scholarship holders renew grant G{idx} every academic year.\n\n" for idx in range(30)]
+    tokenizer, tokenizer_file = bpe_tokenizer(corpus, 200)
+    unpadded = [len(tokenizer.encode(text).ids) for text in ("hi", corpus[0] * 3)]
+    tokenizer.enable_padding()
+    tokenizer.enable_truncation(max_length=8)
+    tokenizer.save(str(tokenizer_file))
+    assert len(tokenizer.encode_batch(["hi", corpus[0]])[0].ids) > unpadded[0]
+
+    service = ChunkingService(tokenizer_name=f"hf:{tokenizer_file}", tokenizer_registry=TokenizerRegistry())
+    texts = ["hi", corpus[0] * 3]
+    assert service.count_tokens_many(texts) == unpadded
+    assert [service.count_tokens(text) for text in texts] == unpadded
+    assert [len(ids) for ids in service.encode_many(texts)] == unpadded
+
+
+def test_tokenizer_loads_lazily_from_local_file_or_cache_dir(tmp_path, monkeypatch, bpe_tokenizer):
+    from rag_chunker.infrastructure.tokenizer_loader import cached_tokenizer_path
+    from rag_chunker.use_cases.services.chunking_service import ChunkingService
+
+    corpus = [f"Housing grants cover rent for tenant T{idx}.\n\n" for idx in range(30)]
+    tokenizer, local_file = bpe_tokenizer(corpus, 200)
+    cache_dir = tmp_path / "cache"
+    cached_tokenizer_path("acme/embedder", cache_dir).parent.mkdir(parents=True)
+    tokenizer.save(str(cached_tokenizer_path("acme/embedder", cache_dir)))
+    monkeypatch.setenv("RAG_CHUNKER_OFFLINE", "1")
+    expected = len(tokenizer.encode(corpus[3]).ids)
+
+    from_file = ChunkingService(tokenizer_name=str(local_file))
+    assert from_file._tokenizer_loaded is False
+    assert from_file.count_tokens(corpus[3]) == expected
+    assert from_file._tokenizer_loaded is True
+
+    from_cache = ChunkingService(tokenizer_name="acme/embedder", tokenizer_cache_dir=cache_dir)
+    assert from_cache.count_tokens(corpus[3]) == expected
+
+    from_cache.set_tokenizer("acme/missing", cache_dir=cache_dir)
+    monkeypatch.setitem(sys.modules, "tiktoken", None)
+    with pytest.warns(RuntimeWarning, match=r"'acme/missing' could not be loaded \(hf: .*acme/missing.*; tiktoken: "):
+        assert from_cache.count_tokens(corpus[3]) == from_cache._regex_token_count(corpus[3])
+
+    regex_service = ChunkingService(tokenizer_name="regex")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert regex_service.count_tokens(corpus[3]) == regex_service._regex_token_count(corpus[3])
+
+
+def test_tokenizer_registry_resolves_specs_and_caches_per_process(monkeypatch, bpe_tokenizer):
+    from rag_chunker.infrastructure.tokenizer_registry import TokenizerRegistry
+
+    tokenizer, tokenizer_file = bpe_tokenizer(["Tuition waivers for students."] * 5, 100)
+    monkeypatch.setenv("RAG_CHUNKER_OFFLINE", "1")
+    registry = TokenizerRegistry()
+
+    regex = registry.resolve("regex")
+    assert regex.backend is None and regex.identity == "regex"
+    loaded = registry.resolve(f"hf:{tokenizer_file}")
+    assert loaded.identity.startswith(f"hf:{tokenizer_file}#")
+    assert registry.resolve(f"hf:{tokenizer_file}") is loaded
+    with pytest.raises(ValueError):
+        registry.resolve("hf:acme/not-downloaded")
+
+    registry.register("fixed", lambda name, cache_dir: tokenizer)
+    assert registry.resolve("fixed:demo").backend is tokenizer
+
+
+def test_fits_joined_matches_exact_count_of_joined_text():
+    import random
+
+    from rag_chunker.use_cases.services.chunking_service import ChunkingService
+
+    service = ChunkingService()
+    rng = random.Random(11)
+    vocab = ["Art.", "1", "students", "must", "apply", "(see", "below);", "fee:", "€", "2025/26", "|", "a"]
+    for _ in range(200):
+        left = " ".join(rng.choice(vocab) for _ in range(rng.randint(0, 40)))
+        right = " ".join(rng.choice(vocab) for _ in range(rng.randint(0, 40)))
+        joined = left + "\n\n" + right
+        exact = service.count_tokens(joined)
+        lower, upper = service.joined_token_bounds(service.count_tokens(left), service.count_tokens(right))
+        assert lower <= exact <= upper
+        for budget in (exact - 1, exact, exact + 1):
+            assert service.fits_joined(left, right, budget) is (exact <= budget)
+
+
+def test_shared_overlap_routine_matches_descending_slice_scan():
+    import random
+
+    from rag_chunker.use_cases.overlap import max_suffix_prefix_overlap
+
+    rng = random.Random(5)
+    pairs = [("a" * 400 + "b", "a" * 400), ("ab" * 300 + "a", "ab" * 300), ("", "x"), ("xyz", "yzq")]
+    for _ in range(300):
+        alphabet = rng.choice(["ab", "abc ", "students apply. "])
+        left = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 400)))
+        right = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 400)))
+        if rng.random() < 0.5:
+            right = left[-rng.randint(0, 120) :] + right
+        pairs.append((left, right))
+    for left, right in pairs:
+        for scan_chars in (1, 7, 240, 320, 1000):
+            expected = _max_suffix_prefix_overlap(left[-scan_chars:], right[:scan_chars])
+            assert max_suffix_prefix_overlap(left, right, scan_chars) == expected
@@ -63,3 +63,32 @@ def test_clean_text_dedupes_non_consecutive_long_lines():
     )
     cleaned = clean_text(raw)
     assert cleaned.count("The issue of documentation is free of charge and available through the designated office.") == 1
+
+
+def test_clean_text_matches_reference_on_fuzzed_blocks():
+    import random
+
+    from cleaning_reference import clean_text as reference_clean_text
+    from cleaning_reference import normalize_inline_math as reference_normalize_inline_math
+
+    fragments = [
+        "Students must submit the online application before the deadline.",
+        "The issue of documentation is free of charge and available through the designated office.",
+        "Short label.", "Art. 5", "word", " ", "  ", "\t", "\n", "\n\n\n", "\r\n", " ", " ", "\x0c",
+        "$66\\%$", "$x \\leq y$", "$", "\\(", "\\)", "\\[", "\\]", "\\%", "\\", "\\\\", "\\left", "\\right",
+        "\\ri", "ght", "\\le", "ft", "geq", "times", "\\times", "\\cdot", "\\succ", "\\prec", "\\geq", "\\leq",
+        "\\bullet", "\\neq", "\\approx", "\\precsim", "\\alpha", "\\frac", "\\dfrac", "\\tfrac", "{1}", "{a{b}}",
+        "{", "}", "\\frac{\\frac{1}{2}}{3}", "<table><tr><td>Col A</td><th>Col B</th></tr></table>", "<TABLE>x</TABLE>",
+        "<b>", "</p>", "<", ">", "&amp;", "&nbsp;", "&lt;td&gt;", "Errore. Il segnalibro non è definito.",
+        "ERRORE. il  segnalbro non e definita", "Error. Bookmark not defined.", "----", "====", "#### ",
+        "![img](figure.png)", "![](x)", "|", "# Heading", "12th2024", "1st2031", "...", "?!", "_", "ſ", "İ",
+    ]
+    # Inputs where one replacement creates a match for a later one.
+    cascades = ["\\\\leftgeq", "\\ri\\leftghtx", "\\\\left%", "\\\\(", "\\frac{\\frac{1}{2}}{\\left3}", "$a\\%$\\%"]
+    rng = random.Random(1234)
+    for _ in range(3000):
+        raw = "".join(rng.choice(fragments) for _ in range(rng.randint(1, 40)))
+        cascades.append(raw)
+    for raw in cascades:
+        assert clean_text(raw) == reference_clean_text(raw), raw
+        assert normalize_inline_math(raw) == reference_normalize_inline_math(raw), raw
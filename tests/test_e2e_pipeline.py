@@ -1,4 +1,9 @@
 import json
+import os
+import sqlite3
+from dataclasses import replace
+
+import pytest
 
 from rag_chunker.pipeline import PipelineConfig, run_pipeline
 import rag_chunker.pipeline as pipeline_module
@@ -217,9 +222,9 @@ def test_pipeline_incremental_reprocesses_changed_document(tmp_path, monkeypatch
     calls = {"count": 0}
     original = pipeline_module._process_document_folder
 
-    def wrapped(folder, config):
+    def wrapped(folder, config, *args):
         calls["count"] += 1
-        return original(folder, config)
+        return original(folder, config, *args)
 
     monkeypatch.setattr("rag_chunker.pipeline._process_document_folder", wrapped)
     second = run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=output_dir))
@@ -227,3 +232,586 @@ def test_pipeline_incremental_reprocesses_changed_document(tmp_path, monkeypatch
     assert calls["count"] == 1
     assert second["incremental"]["processed_documents"] == 1
     assert second["incremental"]["reused_documents"] == 0
+
+
+def test_pipeline_incremental_skips_rehash_for_unchanged_stat_and_non_source_files(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    doc = data_dir / "DocH.pdf-88888888-8888-8888-8888-888888888888"
+    doc.mkdir()
+    md_path = doc / "DocH.md"
+    md_path.write_text("# ART. 1 Intro\nStable content for stat-based reuse.\n", encoding="utf-8")
+    image_path = doc / "page_1.png"
+    image_path.write_bytes(b"png-v1")
+    for path in (md_path, image_path):
+        os.utime(path, ns=(1_600_000_000_000_000_000, 1_600_000_000_000_000_000))
+    output_dir = tmp_path / "artifacts"
+    config = PipelineConfig(input_dir=data_dir, output_dir=output_dir, hash_scope="source")
+
+    first = run_pipeline(config)
+    assert first["incremental"]["rehashed_files"] == 1
+
+    monkeypatch.setattr(
+        "rag_chunker.use_cases.services.incremental_cache_service.hash_file",
+        lambda _path: (_ for _ in ()).throw(RuntimeError("unchanged files must not be re-read")),
+    )
+    image_path.write_bytes(b"png-v2 is not a source file")
+    second = run_pipeline(config)
+    assert second["incremental"]["reused_documents"] == 1
+    assert second["incremental"]["stat_matched_files"] == 1
+
+
+def test_pipeline_parallel_workers_match_serial_output(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for idx, letter in enumerate("HIJ"):
+        doc = data_dir / f"Doc{letter}.pdf-8888888{idx}-8888-8888-8888-888888888888"
+        doc.mkdir()
+        (doc / f"Doc{letter}.md").write_text(
+            f"# ART. {idx + 1} Intro\n"
+            f"Document {letter} explains how students apply for the benefit in A.Y. 2025/26.\n\n"
+            "# ART. 9 Shared\n"
+            "This shared paragraph appears in every document and is removed by global dedupe.\n",
+            encoding="utf-8",
+        )
+    (data_dir / "DocK.pdf-99999999-9999-9999-9999-999999999999").mkdir()
+
+    def run(output_name, workers):
+        output_dir = tmp_path / output_name
+        manifest = run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=output_dir, workers=workers))
+        return output_dir, manifest
+
+    serial_dir, serial = run("serial", 1)
+    parallel_dir, parallel = run("parallel", 3)
+
+    for name in ("documents.jsonl", "chunks.jsonl"):
+        assert (serial_dir / name).read_bytes() == (parallel_dir / name).read_bytes()
+    volatile = {"processed_at_utc", "output_dir", "token_count_cache", "clean_cache"}
+    assert {k: v for k, v in serial.items() if k not in volatile} == {
+        k: v for k, v in parallel.items() if k not in volatile
+    }
+    assert len(parallel["errors"]) == 1
+    for manifest in (serial, parallel):
+        usage = manifest["token_count_cache"]
+        assert usage["hits"] + usage["misses"] > 0
+        assert 0.0 < usage["hit_rate"] <= 1.0
+
+    rerun_serial = run("serial", 1)[1]
+    rerun_parallel = run("parallel", 3)[1]
+    assert rerun_parallel["incremental"] == rerun_serial["incremental"]
+    assert rerun_parallel["incremental"]["reused_documents"] == 3
+
+
+def test_pipeline_streaming_output_matches_buffered_output(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for idx, letter in enumerate("ABC"):
+        doc = data_dir / f"Doc{letter}.pdf-{idx}0000000-0000-0000-0000-000000000000"
+        doc.mkdir()
+        (doc / f"Doc{letter}.md").write_text(
+            f"# ART. {idx + 1} Intro\n"
+            f"Document {letter} explains how students apply for the benefit in A.Y. 2025/26.\n\n"
+            "# ART. 9 Shared\n"
+            "This shared paragraph appears in every document and is removed by global dedupe.\n",
+            encoding="utf-8",
+        )
+
+    def run(output_name, streaming):
+        output_dir = tmp_path / output_name
+        manifest = run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=output_dir, streaming_output=streaming))
+        return output_dir, manifest
+
+    buffered_dir, buffered = run("buffered", False)
+    streamed_dir, streamed = run("streamed", True)
+
+    for name in ("documents.jsonl", "chunks.jsonl"):
+        assert (buffered_dir / name).read_bytes() == (streamed_dir / name).read_bytes()
+    assert streamed["chunks"] == buffered["chunks"]
+    assert not list(streamed_dir.glob(".*.partial"))
+
+    rerun_dir, rerun = run("streamed", True)
+    assert rerun["incremental"]["reused_documents"] == 3
+    assert (rerun_dir / "chunks.jsonl").read_bytes() == (buffered_dir / "chunks.jsonl").read_bytes()
+
+
+def test_pipeline_incremental_rerun_from_shards_matches_full_run(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    paths = []
+    for idx, letter in enumerate("ABC"):
+        doc = data_dir / f"Doc{letter}.pdf-{idx}1111111-1111-1111-1111-111111111111"
+        doc.mkdir()
+        path = doc / f"Doc{letter}.md"
+        path.write_text(
+            f"# ART. {idx + 1} Intro\n"
+            f"Document {letter} explains how students apply for the benefit in A.Y. 2025/26.\n",
+            encoding="utf-8",
+        )
+        paths.append(path)
+    output_dir = tmp_path / "artifacts"
+    run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=output_dir))
+    assert (output_dir / "shards" / "index.json").exists()
+
+    # DocA now repeats DocC's text, so DocC's shard collides and must be re-filtered.
+    paths[0].write_text(paths[2].read_text(encoding="utf-8"), encoding="utf-8")
+    rerun = run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=output_dir))
+    assert rerun["incremental"]["processed_documents"] == 1
+    assert rerun["incremental"]["reused_documents"] == 2
+    assert rerun["incremental"]["shard_copied_documents"] == 1
+
+    fresh_dir = tmp_path / "fresh"
+    fresh = run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=fresh_dir, incremental=False))
+    for name in ("documents.jsonl", "chunks.jsonl"):
+        assert (output_dir / name).read_bytes() == (fresh_dir / name).read_bytes()
+    assert rerun["chunks"] == fresh["chunks"]
+    assert len(list((output_dir / "shards").glob("*.jsonl"))) == 3
+
+
+def test_pipeline_stage_cache_skips_loading_when_only_chunking_params_change(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    doc = data_dir / "DocI.pdf-99999999-1111-1111-1111-111111111111"
+    doc.mkdir()
+    (doc / "DocI.md").write_text(
+        "# ART. 1 Intro\n"
+        + " ".join(f"Students submit form {idx} before the deadline." for idx in range(80))
+        + "\n\n# ART. 2 Fees\n"
+        + " ".join(f"Fee band {idx} applies to ISEE values." for idx in range(80))
+        + "\n",
+        encoding="utf-8",
+    )
+    output_dir = tmp_path / "artifacts"
+    first = run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=output_dir))
+    assert first["stage_cache"]["prepare_hits"] == 0
+
+    monkeypatch.setattr(
+        "rag_chunker.pipeline.load_canonical_blocks",
+        lambda *_args, **_kwargs: (_ for _ in ()).throw(RuntimeError("blocks should come from the stage cache")),
+    )
+    monkeypatch.setattr(
+        "rag_chunker.pipeline.build_segments",
+        lambda *_args, **_kwargs: (_ for _ in ()).throw(RuntimeError("segments should come from the stage cache")),
+    )
+    monkeypatch.setattr(
+        "rag_chunker.use_cases.services.stage_cache_service.hash_file",
+        lambda *_args, **_kwargs: (_ for _ in ()).throw(RuntimeError("sources should be keyed by fingerprint digests")),
+    )
+    resized = PipelineConfig(input_dir=data_dir, output_dir=output_dir, target_tokens=120, max_tokens=480, overlap_tokens=20)
+    second = run_pipeline(resized)
+    assert second["errors"] == []
+    assert second["incremental"]["processed_documents"] == 1
+    assert second["stage_cache"] == {"enabled": True, "prepare_hits": 1, "segments_hits": 1}
+
+    monkeypatch.undo()
+    fresh_dir = tmp_path / "fresh"
+    run_pipeline(
+        PipelineConfig(input_dir=data_dir, output_dir=fresh_dir, target_tokens=120, max_tokens=480, overlap_tokens=20, incremental=False)
+    )
+    assert (output_dir / "chunks.jsonl").read_bytes() == (fresh_dir / "chunks.jsonl").read_bytes()
+
+
+def test_pipeline_clean_cache_reuses_boilerplate_across_documents_and_runs(tmp_path, monkeypatch):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    disclaimer = "The university reserves the right to amend this call; amendments are published on the official site."
+    for idx, name in enumerate(("DocL", "DocM")):
+        doc = data_dir / f"{name}.pdf-{idx}bbbbbbb-1111-1111-1111-111111111111"
+        doc.mkdir()
+        (doc / f"{name}.md").write_text(
+            f"# ART. 1 {name} scope\n\n{disclaimer}\n\n"
+            + " ".join(f"{name} applicants submit form {n} before the deadline." for n in range(60))
+            + f"\n\n{disclaimer}\n",
+            encoding="utf-8",
+        )
+    output_dir = tmp_path / "artifacts"
+    config = PipelineConfig(input_dir=data_dir, output_dir=output_dir, stage_cache=False)
+    connects = []
+    real_connect = sqlite3.connect
+    monkeypatch.setattr(sqlite3, "connect", lambda *args, **kwargs: connects.append(args) or real_connect(*args, **kwargs))
+    first = run_pipeline(config)["clean_cache"]
+    assert len(connects) == 1
+    monkeypatch.undo()
+    assert (output_dir / "clean_cache.sqlite").exists()
+    assert first["enabled"] is True
+    assert first["hits"] >= 3
+    assert first["misses"] == first["entries"]
+
+    monkeypatch.setattr(
+        "rag_chunker.pipeline.clean_text",
+        lambda *_args, **_kwargs: (_ for _ in ()).throw(RuntimeError("blocks should come from the clean cache")),
+    )
+    (output_dir / "doc_hashes.json").unlink()
+    second = run_pipeline(config)
+    assert second["errors"] == []
+    assert second["incremental"]["processed_documents"] == 2
+    assert second["clean_cache"]["misses"] == 0
+    assert second["clean_cache"]["hit_rate"] == 1.0
+    assert all("clean_cache" not in row for row in second["document_results"])
+
+    monkeypatch.undo()
+    fresh_dir = tmp_path / "fresh"
+    run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=fresh_dir, incremental=False))
+    assert not (fresh_dir / "clean_cache.sqlite").exists()
+    assert (output_dir / "chunks.jsonl").read_bytes() == (fresh_dir / "chunks.jsonl").read_bytes()
+
+    (output_dir / "doc_hashes.json").unlink()
+    bounded = run_pipeline(
+        PipelineConfig(input_dir=data_dir, output_dir=output_dir, stage_cache=False, clean_cache_max_entries=2)
+    )["clean_cache"]
+    assert bounded["entries"] == 2
+    assert bounded["pruned"] == first["entries"] - 2
+
+
+def _write_two_article_corpus(data_dir):
+    for idx, name in enumerate(("DocN", "DocO")):
+        doc = data_dir / f"{name}.pdf-{idx}ccccccc-1111-1111-1111-111111111111"
+        doc.mkdir(parents=True)
+        (doc / f"{name}.md").write_text(
+            f"# ART. 1 {name} scope\n"
+            + " ".join(f"{name} applicants submit form {n} before the deadline." for n in range(70))
+            + "\n\n# ART. 2 Fees\n"
+            + " ".join(f"{name} fee band {n} applies to ISEE values." for n in range(70))
+            + "\n",
+            encoding="utf-8",
+        )
+
+
+@pytest.mark.parametrize("columnar_format", ["parquet", "arrow"])
+def test_pipeline_columnar_output_matches_jsonl(tmp_path, columnar_format):
+    pa = pytest.importorskip("pyarrow")
+    data_dir = tmp_path / "data"
+    _write_two_article_corpus(data_dir)
+    output_dir = tmp_path / "artifacts"
+    manifest = run_pipeline(
+        PipelineConfig(input_dir=data_dir, output_dir=output_dir, incremental=False, columnar_format=columnar_format)
+    )
+    rows = [json.loads(line) for line in (output_dir / "chunks.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert manifest["columnar"]["rows"] == len(rows) > 0
+
+    path = output_dir / manifest["columnar"]["path"]
+    if columnar_format == "parquet":
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path, columns=["chunk_id", "text", "token_count", "name", "section", "heading_path"])
+    else:
+        table = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+    assert pa.types.is_dictionary(table.schema.field("name").type)
+    assert table.column("chunk_id").to_pylist() == [row["chunk_id"] for row in rows]
+    assert table.column("text").to_pylist() == [row["text"] for row in rows]
+    assert table.column("token_count").to_pylist() == [row["token_count"] for row in rows]
+    assert table.column("name").to_pylist() == [row["metadata"].get("name") for row in rows]
+    assert table.column("section").to_pylist() == [row["metadata"].get("section") for row in rows]
+    assert table.column("heading_path").to_pylist() == [row["metadata"].get("heading_path", []) for row in rows]
+
+
+def test_pipeline_columnar_output_requires_pyarrow(tmp_path, monkeypatch):
+    import sys
+
+    data_dir = tmp_path / "data"
+    _write_two_article_corpus(data_dir)
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(RuntimeError, match="pyarrow"):
+        run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=tmp_path / "artifacts", columnar_format="parquet"))
+    assert not (tmp_path / "artifacts").exists()
+    with pytest.raises(ValueError, match="Unsupported columnar format"):
+        run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=tmp_path / "artifacts", columnar_format="csv"))
+
+
+
+def test_pipeline_reprocesses_documents_when_the_json_codec_changes(tmp_path, monkeypatch):
+    pytest.importorskip("orjson")
+    from rag_chunker.infrastructure import io
+
+    data_dir = tmp_path / "data"
+    _write_two_article_corpus(data_dir)
+    output_dir = tmp_path / "artifacts"
+    monkeypatch.setenv(io.JSON_CODEC_ENV, "json")
+    io.get_json_codec.cache_clear()
+    run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=output_dir))
+
+    monkeypatch.setenv(io.JSON_CODEC_ENV, "orjson")
+    io.get_json_codec.cache_clear()
+    try:
+        switched = run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=output_dir))
+        fresh_dir = tmp_path / "fresh"
+        run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=fresh_dir, incremental=False))
+    finally:
+        monkeypatch.delenv(io.JSON_CODEC_ENV)
+        io.get_json_codec.cache_clear()
+    assert switched["incremental"]["reused_documents"] == 0
+    assert (output_dir / "chunks.jsonl").read_bytes() == (fresh_dir / "chunks.jsonl").read_bytes()
+
+def test_pipeline_compact_output_profile_round_trips_through_reader(tmp_path):
+    from rag_chunker import EvalConfig, iter_chunks, run_evaluation
+
+    data_dir = tmp_path / "data"
+    _write_two_article_corpus(data_dir)
+    full_dir = tmp_path / "full"
+    compact_dir = tmp_path / "compact"
+    run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=full_dir, incremental=False))
+    manifest = run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=compact_dir, output_profile="compact"))
+    assert manifest["output_profile"] == "compact"
+
+    full_rows = [json.loads(line) for line in (full_dir / "chunks.jsonl").read_text(encoding="utf-8").splitlines()]
+    compact_rows = [json.loads(line) for line in (compact_dir / "chunks.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert (compact_dir / "documents.jsonl").read_bytes() == (full_dir / "documents.jsonl").read_bytes()
+    assert (compact_dir / "chunks.jsonl").stat().st_size < (full_dir / "chunks.jsonl").stat().st_size * 0.75
+    for row in compact_rows:
+        assert "augmented_text" not in row
+        assert not {"name", "year", "brief_description", "language_hint"} & set(row["metadata"])
+
+    expanded = list(iter_chunks(compact_dir))
+    assert expanded == [{key: value for key, value in row.items() if key != "augmented_text"} for row in full_rows]
+    with_augmented = list(iter_chunks(compact_dir, augmented_text=True))
+    assert [row["augmented_text"] for row in with_augmented] == [row["augmented_text"] for row in full_rows]
+    assert list(iter_chunks(full_dir)) == full_rows
+
+    reports = [
+        run_evaluation(EvalConfig(artifacts_dir=path, output_json=path / "eval.json", output_md=path / "eval.md"))
+        for path in (full_dir, compact_dir)
+    ]
+    assert reports[0]["chunk_metrics"] == reports[1]["chunk_metrics"]
+    assert reports[0]["metadata_metrics"] == reports[1]["metadata_metrics"]
+
+    rerun = run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=compact_dir, output_profile="compact"))
+    assert rerun["incremental"]["reused_documents"] == 2
+    switched = run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=compact_dir))
+    assert switched["incremental"]["reused_documents"] == 0
+    assert (compact_dir / "chunks.jsonl").read_bytes() == (full_dir / "chunks.jsonl").read_bytes()
+    with pytest.raises(ValueError, match="Unsupported output profile"):
+        run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=tmp_path / "bad", output_profile="tiny"))
+
+
+def test_pipeline_stage_timings_cover_every_document_without_changing_output(tmp_path):
+    data_dir = tmp_path / "data"
+    _write_two_article_corpus(data_dir)
+    plain = run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=tmp_path / "plain", incremental=False))
+    assert "stage_timings" not in plain
+
+    for workers in (1, 2):
+        output_dir = tmp_path / f"instrumented-{workers}"
+        manifest = run_pipeline(
+            PipelineConfig(
+                input_dir=data_dir,
+                output_dir=output_dir,
+                incremental=False,
+                workers=workers,
+                instrument_memory=True,
+            )
+        )
+        assert (output_dir / "chunks.jsonl").read_bytes() == (tmp_path / "plain" / "chunks.jsonl").read_bytes()
+        assert manifest["document_results"] == plain["document_results"]
+        timings = manifest["stage_timings"]
+        assert timings["memory"] is True
+        for name in ("load", "clean", "segment", "merge_segments", "chunk", "tiny_sweep", "assemble", "write"):
+            summary = timings["stages"][name]
+            assert summary["documents"] == 2
+            assert 0.0 <= summary["wall_s"]["p50"] <= summary["wall_s"]["p95"] <= summary["wall_s"]["max"]
+            assert summary["peak_kib"]["max"] > 0.0
+        assert {"finalize", "columnar"} <= set(timings["run"])
+        slowest = timings["slowest_documents"]
+        assert len(slowest) == 2 and slowest[0]["wall_s"] >= slowest[1]["wall_s"]
+
+
+def test_pipeline_cprofile_scopes_to_selected_documents_and_runs_serially(tmp_path, capsys):
+    import pstats
+
+    data_dir = tmp_path / "data"
+    _write_two_article_corpus(data_dir)
+    plain = run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=tmp_path / "plain", incremental=False))
+    assert "cprofile" not in plain
+
+    output_dir = tmp_path / "profiled"
+    manifest = run_pipeline(
+        PipelineConfig(
+            input_dir=data_dir,
+            output_dir=output_dir,
+            incremental=False,
+            workers=2,
+            cprofile_docs=("DocO.pdf-*",),
+        )
+    )
+    assert "serially" in capsys.readouterr().err
+    assert (output_dir / "chunks.jsonl").read_bytes() == (tmp_path / "plain" / "chunks.jsonl").read_bytes()
+    assert manifest["cprofile"]["documents"] == ["DocO.pdf-*"]
+    assert manifest["cprofile"]["profiled_documents"] == 1
+
+    stats = pstats.Stats(manifest["cprofile"]["pstats"])
+    assert any(name == "_assemble_document" for _, _, name in stats.stats)
+    lines = (output_dir / "cprofile_stacks.txt").read_text(encoding="utf-8").splitlines()
+    assert lines and all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("split_text_by_tokens" in line for line in lines)
+
+
+def test_sweep_prepares_each_document_once_and_matches_single_runs(tmp_path, monkeypatch):
+    from rag_chunker import SweepConfig, run_sweep
+
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for idx, name in enumerate(("DocJ", "DocK")):
+        doc = data_dir / f"{name}.pdf-{idx}aaaaaaa-1111-1111-1111-111111111111"
+        doc.mkdir()
+        (doc / f"{name}.md").write_text(
+            f"# ART. 1 {name} scope\n"
+            + " ".join(f"{name} applicants submit form {n} before the deadline." for n in range(90))
+            + "\n\n# ART. 2 Fees\n"
+            + " ".join(f"{name} fee band {n} applies to ISEE values." for n in range(90))
+            + "\n",
+            encoding="utf-8",
+        )
+
+    prepare_calls = []
+    original_prepare = pipeline_module._prepare_document
+
+    def counting_prepare(choice, fallback_name, clean_cache=None):
+        prepare_calls.append(fallback_name)
+        return original_prepare(choice, fallback_name, clean_cache)
+
+    monkeypatch.setattr(pipeline_module, "_prepare_document", counting_prepare)
+    base = PipelineConfig(input_dir=data_dir, output_dir=tmp_path / "unused", overlap_tokens=20)
+    variants = [{"name": "small", "target_tokens": 120, "max_tokens": 160}, {"target_tokens": 300, "max_tokens": 360}]
+    report = run_sweep(SweepConfig(base=base, variants=variants, output_dir=tmp_path / "sweep"))
+
+    assert len(prepare_calls) == 2
+    assert [row["name"] for row in report["variants"]] == ["small", "max_tokens-360__target_tokens-300"]
+    assert (tmp_path / "sweep" / "sweep_report.md").exists()
+    for row, variant in zip(report["variants"], variants):
+        variant_dir = tmp_path / "sweep" / row["name"]
+        assert (variant_dir / "eval_report.json").exists()
+        assert row["errors"] == 0 and row["chunks"] > 0
+        single_dir = tmp_path / f"single-{row['name']}"
+        overrides = {key: value for key, value in variant.items() if key != "name"}
+        run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=single_dir, overlap_tokens=20, incremental=False, **overrides))
+        assert (variant_dir / "chunks.jsonl").read_bytes() == (single_dir / "chunks.jsonl").read_bytes()
+        assert (variant_dir / "documents.jsonl").read_bytes() == (single_dir / "documents.jsonl").read_bytes()
+    assert report["variants"][0]["chunks"] > report["variants"][1]["chunks"]
+
+
+
+def test_sweep_rejects_unsafe_names_and_ignored_overrides(tmp_path):
+    from rag_chunker import SweepConfig
+    from rag_chunker.sweep import build_variant_configs
+
+    base = PipelineConfig(input_dir=tmp_path / "data", output_dir=tmp_path / "unused")
+    for variant in ({"name": "../x"}, {"name": "/tmp/x"}, {"name": "a/b", "target_tokens": 300}, {"workers": 4}, {"streaming_output": False}):
+        with pytest.raises(ValueError):
+            build_variant_configs(SweepConfig(base=base, variants=[variant], output_dir=tmp_path / "sweep"))
+    [(name, _, variant_config)] = build_variant_configs(
+        SweepConfig(base=base, variants=[{"name": "v1.small", "target_tokens": 300}], output_dir=tmp_path / "sweep")
+    )
+    assert name == "v1.small" and variant_config.output_dir == tmp_path / "sweep" / "v1.small"
+
+
+def test_pipeline_counts_tokens_with_configured_tokenizer(tmp_path, monkeypatch, bpe_tokenizer):
+    from rag_chunker.use_cases.services.chunking_service import ChunkingService
+
+    monkeypatch.setenv("RAG_CHUNKER_OFFLINE", "1")
+    monkeypatch.setattr("rag_chunker.use_cases.chunking._DEFAULT_SERVICE", ChunkingService())
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    doc = data_dir / "DocL.pdf-12121212-1111-1111-1111-111111111111"
+    doc.mkdir()
+    text = "# ART. 1 Rent\n" + " ".join(f"Housing grants cover rent for tenant T{idx}." for idx in range(120)) + "\n"
+    (doc / "DocL.md").write_text(text, encoding="utf-8")
+    tokenizer, tokenizer_file = bpe_tokenizer([text], 300)
+
+    output_dir = tmp_path / "artifacts"
+    run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=output_dir, tokenizer_name=str(tokenizer_file)))
+    rows = [json.loads(line) for line in (output_dir / "chunks.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert rows
+    assert all(row["token_count"] == len(tokenizer.encode(row["text"]).ids) for row in rows)
+
+
+def test_pipeline_incremental_cache_is_invalidated_by_tokenizer_change(tmp_path, monkeypatch, bpe_tokenizer):
+    from rag_chunker.use_cases.services.chunking_service import ChunkingService
+
+    monkeypatch.setenv("RAG_CHUNKER_OFFLINE", "1")
+    monkeypatch.setattr("rag_chunker.use_cases.chunking._DEFAULT_SERVICE", ChunkingService())
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    doc = data_dir / "DocM.pdf-13131313-1111-1111-1111-111111111111"
+    doc.mkdir()
+    text = "# ART. 1 Meals\n" + " ".join(f"Canteen vouchers cover meal M{idx}." for idx in range(120)) + "\n"
+    (doc / "DocM.md").write_text(text, encoding="utf-8")
+    tokenizer, tokenizer_file = bpe_tokenizer([text], 300)
+    output_dir = tmp_path / "artifacts"
+
+    first = run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=output_dir, tokenizer_name="regex"))
+    assert first["tokenizer"] == "regex"
+    switched = run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=output_dir, tokenizer_name=f"hf:{tokenizer_file}"))
+    assert switched["tokenizer"].startswith("hf:")
+    assert switched["incremental"]["reused_documents"] == 0
+    assert switched["stage_cache"]["segments_hits"] == 0
+    again = run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=output_dir, tokenizer_name=f"hf:{tokenizer_file}"))
+    assert again["incremental"]["reused_documents"] == 1
+
+
+def test_pipeline_profiles_share_one_parse_and_match_single_runs(tmp_path, monkeypatch, capsys, bpe_tokenizer):
+    from rag_chunker import ChunkProfile
+    from rag_chunker.use_cases.services.chunking_service import ChunkingService
+
+    monkeypatch.setenv("RAG_CHUNKER_OFFLINE", "1")
+    monkeypatch.setattr("rag_chunker.use_cases.chunking._DEFAULT_SERVICE", ChunkingService())
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    texts = []
+    for idx, name in enumerate(("DocN", "DocO")):
+        doc = data_dir / f"{name}.pdf-{idx}bbbbbbb-1111-1111-1111-111111111111"
+        doc.mkdir()
+        text = (
+            f"# ART. 1 {name} transport\n"
+            + " ".join(f"{name} students get bus pass P{n} for the year." for n in range(100))
+            + "\n"
+        )
+        (doc / f"{name}.md").write_text(text, encoding="utf-8")
+        texts.append(text)
+    _, tokenizer_file = bpe_tokenizer(texts, 300)
+
+    prepare_calls = []
+    original_prepare = pipeline_module._prepare_document
+
+    def counting_prepare(choice, fallback_name, clean_cache=None):
+        prepare_calls.append(fallback_name)
+        return original_prepare(choice, fallback_name, clean_cache)
+
+    monkeypatch.setattr(pipeline_module, "_prepare_document", counting_prepare)
+    base = PipelineConfig(input_dir=data_dir, output_dir=tmp_path / "profiles", overlap_tokens=20, tokenizer_name="regex")
+    profiles = [
+        ChunkProfile(name="small", target_tokens=100, max_tokens=140),
+        ChunkProfile(name="bpe", tokenizer_name=f"hf:{tokenizer_file}", target_tokens=200, max_tokens=260),
+    ]
+    summary = run_pipeline(base, profiles=profiles)
+    assert len(prepare_calls) == 2
+    assert summary["prepared_documents"] == 2
+    assert summary["profiles"]["small"]["tokenizer"] == "regex"
+    assert summary["profiles"]["bpe"]["tokenizer"].startswith("hf:")
+    assert all(manifest["stage_cache"]["enabled"] is False for manifest in summary["profiles"].values())
+    for manifest in summary["profiles"].values():
+        assert manifest["clean_cache"]["enabled"] is True
+        assert manifest["clean_cache"]["misses"] > 0 and manifest["clean_cache"]["entries"] > 0
+        assert manifest["token_count_cache"]["hits"] + manifest["token_count_cache"]["misses"] > 0
+    single_keys = set(run_pipeline(PipelineConfig(input_dir=data_dir, output_dir=tmp_path / "keys", tokenizer_name="regex")))
+    assert single_keys - set(summary["profiles"]["small"]) == set()
+
+    for profile in profiles:
+        single_dir = tmp_path / f"single-{profile.name}"
+        run_pipeline(
+            PipelineConfig(
+                input_dir=data_dir,
+                output_dir=single_dir,
+                overlap_tokens=20,
+                tokenizer_name=profile.tokenizer_name or "regex",
+                target_tokens=profile.target_tokens,
+                max_tokens=profile.max_tokens,
+                incremental=False,
+            )
+        )
+        profile_dir = tmp_path / "profiles" / profile.name
+        assert (profile_dir / "chunks.jsonl").read_bytes() == (single_dir / "chunks.jsonl").read_bytes()
+
+    prepare_calls.clear()
+    capsys.readouterr()
+    rerun = run_pipeline(replace(base, workers=2), profiles=profiles)
+    assert "ignoring --workers" in capsys.readouterr().err
+    assert prepare_calls == []
+    assert all(manifest["incremental"]["reused_documents"] == 2 for manifest in rerun["profiles"].values())
@@ -0,0 +1,41 @@
+import tracemalloc
+
+from rag_chunker.infrastructure.instrumentation import StageRecorder, document_scope, recording, stage
+
+
+def test_stage_is_a_noop_without_an_active_recorder():
+    assert stage("load") is stage("clean")
+    with stage("load"), document_scope("doc"):
+        pass
+
+
+def test_recorder_attributes_nested_peaks_and_documents():
+    recorder = StageRecorder(track_memory=True)
+    with recording(recorder):
+        assert tracemalloc.is_tracing()
+        with document_scope("a"), stage("outer"):
+            with stage("inner"):
+                blob = bytearray(2 * 1024 * 1024)
+                del blob
+            with stage("inner"):
+                pass
+        with document_scope("b"), stage("outer"):
+            pass
+        with stage("finalize"):
+            pass
+    assert not tracemalloc.is_tracing()
+
+    outer, inner = recorder.documents["a"]["outer"], recorder.documents["a"]["inner"]
+    assert inner["calls"] == 2
+    assert inner["peak_kib"] >= 2048
+    # The inner allocation also counts towards the enclosing span even though the peak was reset in between.
+    assert outer["peak_kib"] >= inner["peak_kib"]
+    assert outer["wall_s"] >= inner["wall_s"]
+
+    recorder.add_document("c", {"outer": {"calls": 1, "wall_s": 5.0, "cpu_s": 0.1, "peak_kib": 1.0}})
+    summary = recorder.summary(slowest=2)
+    assert summary["stages"]["outer"]["documents"] == 3
+    assert summary["stages"]["outer"]["wall_s"]["max"] == 5.0
+    assert set(summary["stages"]["outer"]["peak_kib"]) == {"p50", "p95", "max"}
+    assert summary["run"]["finalize"]["calls"] == 1
+    assert [row["doc_id"] for row in summary["slowest_documents"]] == ["c", "a"]
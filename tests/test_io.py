@@ -0,0 +1,48 @@
+import json
+import math
+
+import pytest
+
+from rag_chunker.infrastructure import io
+
+
+def test_json_codecs_read_back_what_stdlib_reads(tmp_path, monkeypatch):
+    rows = [
+        {"chunk_id": "a", "text": "Università – “quoted” \\ text", "token_count": 12, "score": 0.1 + 0.2},
+        {"chunk_id": "b", "big": 2**70, "nested": {"1": [None, True, -1.5e-7]}},
+    ]
+    path = tmp_path / "chunks.jsonl"
+    path.write_text("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows) + "\n", encoding="utf-8")
+    stdlib_only = tmp_path / "stdlib_only.jsonl"
+    stdlib_only.write_text(json.dumps({"ratio": math.inf, "score": math.nan}) + "\n", encoding="utf-8")
+    names = []
+    for name in ("json", "orjson", "msgspec"):
+        try:
+            codec = io.get_json_codec(name)
+        except ValueError:
+            continue
+        names.append(codec.name)
+        monkeypatch.setenv(io.JSON_CODEC_ENV, name)
+        io.get_json_codec.cache_clear()
+        assert io.read_jsonl(path) == rows
+        (decoded,) = io.read_jsonl(stdlib_only)
+        assert decoded["ratio"] == math.inf and math.isnan(decoded["score"])
+        io.write_jsonl(tmp_path / f"{name}.jsonl", rows)
+        assert io.read_jsonl(tmp_path / f"{name}.jsonl") == rows
+        io.write_json(tmp_path / f"{name}.json", {"rows": rows})
+        assert json.loads((tmp_path / f"{name}.json").read_text(encoding="utf-8")) == {"rows": rows}
+    assert "json" in names
+    assert io.read_jsonl(tmp_path / "missing.jsonl") == []
+
+    monkeypatch.setenv(io.JSON_CODEC_ENV, "json")
+    io.get_json_codec.cache_clear()
+    io.write_jsonl(tmp_path / "stdlib.jsonl", rows)
+    expected = path.read_text(encoding="utf-8").rstrip("\n") + "\n"
+    assert (tmp_path / "stdlib.jsonl").read_text(encoding="utf-8") == expected
+
+    monkeypatch.setenv(io.JSON_CODEC_ENV, "yaml")
+    io.get_json_codec.cache_clear()
+    with pytest.raises(ValueError, match="Unknown JSON codec"):
+        io.read_jsonl(path)
+    monkeypatch.delenv(io.JSON_CODEC_ENV)
+    io.get_json_codec.cache_clear()
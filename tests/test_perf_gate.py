@@ -0,0 +1,136 @@
+import json
+
+import pytest
+
+from rag_chunker import PerfGateConfig, run_perf_gate
+from rag_chunker.interfaces import perf_gate_cli
+
+
+def _results(commit, **scenarios):
+    return {
+        "commit": commit,
+        "tokenizer": "regex",
+        "corpus": {"documents": 40, "seed": 13},
+        "input_dir": None,
+        "scenarios": {
+            name: {"docs_per_sec": docs, "chunks_per_sec": docs * 40, "peak_rss_mib": rss}
+            for name, (docs, rss) in scenarios.items()
+        },
+    }
+
+
+def _write_inputs(tmp_path, results, baseline):
+    (tmp_path / "results.json").write_text(json.dumps(results), encoding="utf-8")
+    (tmp_path / "baseline.json").write_text(json.dumps(baseline), encoding="utf-8")
+
+
+def _gate(tmp_path, results, baseline, **overrides):
+    _write_inputs(tmp_path, results, baseline)
+    return run_perf_gate(
+        PerfGateConfig(
+            results_path=tmp_path / "results.json",
+            baseline_path=tmp_path / "baseline.json",
+            output_json=tmp_path / "perf_gate_report.json",
+            **overrides,
+        )
+    )
+
+
+def test_perf_gate_passes_within_tolerances(tmp_path):
+    baseline = _results("aaa", clean_text=(500.0, 28.0), evaluation=(560.0, 37.0))
+    results = _results("bbb", clean_text=(400.0, 30.0), evaluation=(600.0, 36.0))
+    report = _gate(tmp_path, results, baseline)
+
+    assert report["summary"]["gates_passed"] is True
+    assert report["summary"]["baseline_commit"] == "aaa"
+    names = [check["name"] for check in report["checks"]]
+    assert names[0] == "corpus_mismatched_fields"
+    assert "clean_text.docs_per_sec" in names and "evaluation.peak_rss_mib" in names
+    for check in report["checks"]:
+        assert set(check) >= {"name", "actual", "expected", "comparison", "passed"}
+        assert isinstance(check["expected"], float) and check["comparison"] in {">=", "<="}
+    assert json.loads((tmp_path / "perf_gate_report.json").read_text(encoding="utf-8")) == report
+
+
+def test_perf_gate_fails_on_slowdown_memory_growth_and_missing_scenarios(tmp_path):
+    baseline = _results(
+        "aaa",
+        clean_text=(500.0, 28.0),
+        process_document_folder=(150.0, 29.0),
+        evaluation=(560.0, 37.0),
+    )
+    results = _results("bbb", clean_text=(160.0, 28.0), process_document_folder=(150.0, 45.0))
+    report = _gate(tmp_path, results, baseline)
+
+    failed = {check["name"] for check in report["checks"] if not check["passed"]}
+    assert report["summary"]["gates_passed"] is False
+    assert failed == {
+        "clean_text.docs_per_sec",
+        "clean_text.chunks_per_sec",
+        "process_document_folder.peak_rss_mib",
+        "evaluation.present",
+    }
+    slowdown = next(check for check in report["checks"] if check["name"] == "clean_text.docs_per_sec")
+    assert (slowdown["comparison"], slowdown["expected"]) == (">=", 350.0)
+    assert slowdown["change_pct"] == -68.0
+
+    relaxed = _gate(
+        tmp_path,
+        results,
+        {**baseline, "scenarios": {"clean_text": baseline["scenarios"]["clean_text"]}},
+        scenario_tolerances={"clean_text": 70.0},
+    )
+    assert relaxed["summary"]["gates_passed"] is True
+    with pytest.raises(ValueError, match="evaluation_x"):
+        _gate(tmp_path, results, baseline, scenario_tolerances={"evaluation_x": 1.0})
+
+
+def test_perf_gate_fails_when_a_gated_metric_is_missing_from_the_results(tmp_path):
+    baseline = _results("aaa", clean_text=(500.0, 28.0))
+    results = _results("bbb", clean_text=(500.0, 28.0))
+    del results["scenarios"]["clean_text"]["peak_rss_mib"]
+    results["scenarios"]["clean_text"]["chunks_per_sec"] = None
+    report = _gate(tmp_path, results, baseline)
+
+    failed = [check for check in report["checks"] if not check["passed"]]
+    assert report["summary"]["gates_passed"] is False
+    assert [check["name"] for check in failed] == ["clean_text.chunks_per_sec.present", "clean_text.peak_rss_mib.present"]
+    assert failed[0] == {
+        "name": "clean_text.chunks_per_sec.present",
+        "actual": 0.0,
+        "expected": 1.0,
+        "comparison": ">=",
+        "passed": False,
+    }
+    assert "clean_text.peak_rss_mib" not in {check["name"] for check in report["checks"]}
+
+
+def test_perf_gate_rejects_results_from_a_different_corpus(tmp_path):
+    baseline = _results("aaa", clean_text=(500.0, 28.0))
+    results = {**_results("bbb", clean_text=(500.0, 28.0)), "corpus": {"documents": 10, "seed": 13}}
+    report = _gate(tmp_path, results, baseline)
+    assert report["checks"][0] == {
+        "name": "corpus_mismatched_fields",
+        "actual": 1.0,
+        "expected": 0.0,
+        "comparison": "<=",
+        "passed": False,
+        "fields": ["corpus"],
+    }
+    assert _gate(tmp_path, results, baseline, require_matching_corpus=False)["summary"]["gates_passed"] is True
+
+
+def test_perf_gate_cli_exits_2_on_regression_and_on_missing_baseline(tmp_path, capsys):
+    _write_inputs(tmp_path, _results("bbb", clean_text=(100.0, 28.0)), _results("aaa", clean_text=(500.0, 28.0)))
+    common = ["--results", str(tmp_path / "results.json"), "--output-json", str(tmp_path / "report.json")]
+
+    with pytest.raises(SystemExit) as exc_info:
+        perf_gate_cli.main([*common, "--baseline", str(tmp_path / "baseline.json"), "--fail-on-threshold"])
+    assert exc_info.value.code == 2
+    assert "FAILED clean_text.docs_per_sec: 100.0 (expected >= 350.0)" in capsys.readouterr().out
+
+    with pytest.raises(SystemExit) as exc_info:
+        perf_gate_cli.main([*common, "--baseline", str(tmp_path / "missing.json")])
+    assert exc_info.value.code == 2
+    assert "baseline file not found" in capsys.readouterr().err
+    assert not (tmp_path / "missing.json").exists()
@@ -384,3 +384,38 @@ def test_merge_small_segments_compatible_with_same_article_different_subarticle(
     assert len(merged) == 1
     assert "11.1 Total forfeiture" in merged[0].text
     assert "11.2 Partial forfeiture details" in merged[0].text
+
+
+def test_tiny_chunk_merge_augments_from_the_merged_row_metadata(tmp_path):
+    from rag_chunker.domain.models import SourceChoice
+    from rag_chunker.pipeline import PipelineConfig, _assemble_document, _DocumentSource, _PreparedDocument
+    from rag_chunker.use_cases.chunk_reader import compact_chunk_row, expand_chunk_row
+
+    source = _DocumentSource(
+        folder=tmp_path,
+        choice=SourceChoice(mode="md", folder=tmp_path),
+        source_folder=str(tmp_path),
+        md_path=None,
+        source_file="doc.md",
+        doc_id="doc",
+    )
+    prepared = _PreparedDocument(
+        source_mode_used="md",
+        cleaned_blocks=[],
+        name="Grants notice",
+        year="2025",
+        brief_description="Housing grants.",
+        language_hint="en",
+    )
+    body = " ".join(f"Students renting a room receive housing grant H{idx} each month." for idx in range(20))
+    segments = [
+        Segment(text=body, page_refs=[PageRef(0)], section="ART. 3 Housing grants", article="3", subarticle=None, heading_path=["ART. 3 Housing grants"]),
+        Segment(text="Grants are paid monthly.", page_refs=[PageRef(1)], section="Payment schedule", article="3", subarticle=None, heading_path=["Payment schedule"]),
+    ]
+    config = PipelineConfig(input_dir=tmp_path, output_dir=tmp_path, tokenizer_name="regex")
+    document_row, chunk_rows, _ = _assemble_document(source, prepared, segments, config)
+
+    assert len(chunk_rows) == 1 and chunk_rows[0]["text"].endswith("Grants are paid monthly.")
+    assert "section=ART. 3 Housing grants" in chunk_rows[0]["augmented_text"]
+    expanded = expand_chunk_row(compact_chunk_row(chunk_rows[0]), document_row, augmented_text=True)
+    assert expanded["augmented_text"] == chunk_rows[0]["augmented_text"]
@@ -0,0 +1,33 @@
+from rag_chunker.infrastructure.profiling import collapsed_stacks, profile_document
+
+ROOT = ("pipeline.py", 10, "run")
+LEFT = ("pipeline.py", 20, "left")
+RIGHT = ("pipeline.py", 30, "right")
+SHARED = ("cleaning.py", 40, "clean_text")
+
+
+def test_profile_document_is_a_noop_without_an_active_profiler():
+    assert profile_document("a", "DocA") is profile_document("b", "DocB")
+
+
+def test_collapsed_stacks_split_shared_callee_time_by_call_edge():
+    # (primitive calls, calls, own time, cumulative time, {caller: edge stats})
+    stats = {
+        ROOT: (1, 1, 0.001, 0.010, {}),
+        LEFT: (1, 1, 0.001, 0.007, {ROOT: (1, 1, 0.001, 0.007)}),
+        RIGHT: (1, 1, 0.0, 0.002, {ROOT: (1, 1, 0.0, 0.002)}),
+        SHARED: (
+            4,
+            4,
+            0.008,
+            0.008,
+            {LEFT: (3, 3, 0.006, 0.006), RIGHT: (1, 1, 0.002, 0.002)},
+        ),
+    }
+    lines = dict(collapsed_stacks(stats))
+    assert lines == {
+        "pipeline.py:10(run)": 1000,
+        "pipeline.py:10(run);pipeline.py:20(left)": 1000,
+        "pipeline.py:10(run);pipeline.py:20(left);cleaning.py:40(clean_text)": 6000,
+        "pipeline.py:10(run);pipeline.py:30(right);cleaning.py:40(clean_text)": 2000,
+    }